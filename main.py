@@ -5,14 +5,22 @@ This module serves as the application entry point and initializes
 the necessary components for the verification assistant.
 """
 
+import sys
+from pathlib import Path
+
 from loguru import logger
 
-from src.core.settings import settings
-from src.utils.logger import setup_logger
+# src on path first so "core" and "utils" resolve when run as script
+sys.path.insert(0, str(Path(__file__).resolve().parent / "src"))
+
+from core.settings import get_settings
+from utils.logger import setup_logger
 
 
 def main() -> None:
     """Main application entry point."""
+    settings = get_settings()
+
     # Setup logging
     setup_logger()
 
@@ -0,0 +1,461 @@
+"""End-to-end benchmark suite.
+
+Runs every benchmark against the in-process stub LLM server (no network, no cost) and
+reports throughput and p50/p95/p99 latency. Results are written as JSON so runs from
+different commits can be compared with ``--compare``.
+
+Usage:
+    python scripts/bench/run_benchmarks.py
+    python scripts/bench/run_benchmarks.py --output bench_results/main.json
+    python scripts/bench/run_benchmarks.py --compare bench_results/main.json --threshold 0.2
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+from unittest import mock
+
+# Project root, src and src/chatbot on path first so all modules resolve when run as script
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT / "src" / "chatbot"))
+
+from scripts.stub.llm_stub_server import StubConfig, start_in_thread
+from scripts.utils.reporting import git_revision, percentile
+
+DEFAULT_OUTPUT = ROOT / "bench_results" / "latest.json"
+BENCHMARKS: dict[str, Callable[[int], dict[str, Any]]] = {}
+
+
+def benchmark(name: str):
+    """Registers a benchmark function taking a scale factor and returning its measurement."""
+
+    def register(fn: Callable[[int], dict[str, Any]]):
+        BENCHMARKS[name] = fn
+        return fn
+
+    return register
+
+
+def measure(
+    fn: Callable[[], Any], iterations: int, items_per_call: int = 1, warmup: int = 1
+) -> dict[str, Any]:
+    """Times ``fn`` and summarises its latency distribution and throughput."""
+    for _ in range(warmup):
+        fn()
+    durations: list[float] = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+    durations.sort()
+    total = sum(durations)
+    return {
+        "iterations": iterations,
+        "items_per_call": items_per_call,
+        "total_s": round(total, 6),
+        "throughput_per_s": round(iterations * items_per_call / total, 3) if total else None,
+        "p50_ms": round(percentile(durations, 0.50) * 1000, 4),
+        "p95_ms": round(percentile(durations, 0.95) * 1000, 4),
+        "p99_ms": round(percentile(durations, 0.99) * 1000, 4),
+    }
+
+
+def _load_document(tool: str = "CollabCraft_Pro", doc: str = "terms_of_service"):
+    import re
+
+    from rag.ingestion import resolve_data_dir
+
+    folder = resolve_data_dir() / tool
+    toc = json.loads((folder / f"toc_{doc}.json").read_text(encoding="utf-8"))
+    tool_info = json.loads((folder / "tool_info.json").read_text(encoding="utf-8"))
+    html = (folder / f"{doc}.html").read_text(encoding="utf-8")
+    body = html.split("</h1>", 1)[1].rsplit("</body>", 1)[0]
+    sections = [s.strip() for s in re.split(r"(?=<h[2-6][ >])", body) if s.strip()]
+    return toc, tool_info, sections
+
+
+@benchmark("toc_flatten")
+def bench_toc_flatten(scale: int) -> dict[str, Any]:
+    from rag.ingestion import resolve_data_dir
+    from scripts.utils.section_generator import _flatten_toc_depth_first
+
+    tocs = [
+        json.loads(path.read_text(encoding="utf-8"))
+        for path in sorted(resolve_data_dir().glob("*/toc_*.json"))
+    ]
+
+    def run():
+        for toc in tocs:
+            _flatten_toc_depth_first(toc["sections"])
+
+    return measure(run, iterations=200 * scale, items_per_call=len(tocs))
+
+
+@benchmark("section_prompt_build")
+def bench_section_prompt_build(scale: int) -> dict[str, Any]:
+    from scripts.utils.generation_config import get_pipeline_config
+    from scripts.utils.section_context import SectionContextBuilder
+    from scripts.utils.section_generator import _flatten_toc_depth_first, build_section_messages
+
+    toc, tool_info, sections = _load_document()
+    flattened = _flatten_toc_depth_first(toc["sections"])
+
+    def run():
+        context = SectionContextBuilder(
+            get_pipeline_config()["section_context"],
+            outline=[(section["title"], depth) for section, depth in flattened],
+        )
+        for index, ((section, depth), html) in enumerate(zip(flattened, sections, strict=False)):
+            build_section_messages(
+                tool_info=tool_info["description"],
+                document_type="terms_of_service",
+                previous_html=context.build(index),
+                section_title=section["title"],
+                heading_tag=f"h{min(2 + depth, 6)}",
+            )
+            context.add(section["title"], html)
+
+    return measure(run, iterations=20 * scale, items_per_call=len(flattened))
+
+
+@benchmark("html_assemble_validate")
+def bench_html_assemble_validate(scale: int) -> dict[str, Any]:
+    from scripts.utils.section_generator import assemble_html_document, validate_html
+
+    toc, _, sections = _load_document()
+
+    def run():
+        document = assemble_html_document(toc["title"], sections)
+        if not validate_html(document):
+            raise RuntimeError("Benchmark document failed validation")
+
+    return measure(run, iterations=50 * scale)
+
+
+@benchmark("section_stream_validate")
+def bench_section_stream_validate(scale: int) -> dict[str, Any]:
+    from scripts.utils.document_writer import DocumentWriter, section_html_error
+
+    toc, _, sections = _load_document()
+    path = Path(tempfile.mkdtemp()) / "document.html"
+
+    def run():
+        with DocumentWriter(path, toc["title"]) as writer:
+            for index, section_html in enumerate(sections):
+                error = section_html_error(section_html)
+                if error is not None:
+                    raise RuntimeError(f"Benchmark section failed validation: {error}")
+                writer.write(index, section_html)
+            writer.commit(len(sections))
+
+    return measure(run, iterations=50 * scale, items_per_call=len(sections))
+
+
+@benchmark("section_schedule")
+def bench_section_schedule(scale: int) -> dict[str, Any]:
+    """One document generated with parallel_siblings; sequential p50 and round trips alongside.
+
+    The gap grows with the stub latency (``--latency-ms``), as it does with a real API.
+    """
+    from scripts.utils.document_writer import DocumentWriter
+    from scripts.utils.generation_cache import DocumentManifest
+    from scripts.utils.generation_config import get_pipeline_config, setup_rate_limits
+    from scripts.utils.section_context import SectionContextBuilder
+    from scripts.utils.section_generator import (
+        _flatten_toc_depth_first,
+        generate_sections_parallel,
+        get_section_config,
+        traverse_toc_and_generate,
+    )
+    from utils.rate_limiter import configure_rate_limits, get_rate_limits, set_rate_limit
+
+    toc, tool_info, _ = _load_document()
+    flattened = _flatten_toc_depth_first(toc["sections"])
+    outline = [(section["title"], depth) for section, depth in flattened]
+    pipeline_config = get_pipeline_config()
+    tmp_dir = Path(tempfile.mkdtemp())
+    manifest = DocumentManifest.load(tmp_dir, "bench", "terms_of_service")
+    manifest.start("bench", [section["title"] for section, _ in flattened], {})
+    # Every call must reach the stub: no section cache, no client-side quotas. The limits
+    # generation.yaml installs are rolled back afterwards so later benchmarks are unaffected.
+    previous_limits = get_rate_limits()
+    setup_rate_limits()
+    set_rate_limit(get_section_config()["model_name"], None, None)
+
+    def run_sequential():
+        context = SectionContextBuilder(pipeline_config["section_context"], outline)
+        section_index = [0]
+        with DocumentWriter(tmp_dir / "sequential.html", toc["title"]) as writer:
+            for section in toc["sections"]:
+                traverse_toc_and_generate(
+                    toc=section,
+                    tool_info=tool_info["description"],
+                    document_type="terms_of_service",
+                    writer=writer,
+                    section_index=section_index,
+                    issue_sections={},
+                    context=context,
+                    prompt_tokens=[],
+                    manifest=manifest,
+                )
+            writer.commit(len(flattened))
+
+    def run_parallel():
+        with DocumentWriter(tmp_dir / "parallel_siblings.html", toc["title"]) as writer:
+            generate_sections_parallel(
+                toc_sections=toc["sections"],
+                flattened=flattened,
+                tool_info=tool_info["description"],
+                document_type="terms_of_service",
+                issue_sections={},
+                context=SectionContextBuilder(pipeline_config["section_context"], outline),
+                writer=writer,
+                prompt_tokens=[],
+                manifest=manifest,
+                max_workers=pipeline_config["section_schedule"]["sibling_workers"],
+            )
+            writer.commit(len(flattened))
+
+    # Patched rather than toggled in the shared pipeline config, so it is undone on errors too.
+    try:
+        with (
+            mock.patch("scripts.utils.section_generator.get_section_cache", return_value=None),
+            contextlib.redirect_stdout(io.StringIO()),
+        ):
+            result = measure(run_parallel, iterations=3 * scale, items_per_call=len(flattened))
+            sequential = measure(run_sequential, iterations=3 * scale)
+    finally:
+        configure_rate_limits(previous_limits, replace=True)
+    result["sequential_p50_ms"] = sequential["p50_ms"]
+    result["round_trips"] = {
+        "sequential": len(flattened),
+        "parallel_siblings": max(depth for _, depth in flattened) + 1,
+    }
+    return result
+
+
+@benchmark("toc_batch")
+def bench_toc_batch(scale: int) -> dict[str, Any]:
+    from jsonschema import validate
+
+    from rag.ingestion import resolve_data_dir
+    from scripts.utils.batch_client import message_content, run_chat_batch
+    from scripts.utils.constants import TOC_RESPONSE_FORMAT, TOC_SCHEMA
+    from scripts.utils.toc_generator import build_toc_messages
+    from scripts.utils.typings import BatchConfig
+
+    requests = {}
+    for path in sorted(resolve_data_dir().glob("*/tool_info.json")):
+        tool_info = json.loads(path.read_text(encoding="utf-8"))
+        for doc in tool_info["document_types"]:
+            requests[f"{path.parent.name}/{doc}"] = {
+                "model": "stub",
+                "messages": build_toc_messages(tool_info, doc),
+                "response_format": TOC_RESPONSE_FORMAT,
+            }
+    config = BatchConfig(
+        enabled=True,
+        completion_window="24h",
+        poll_interval_seconds=0.02,
+        max_attempts=1,
+        dir=tempfile.mkdtemp(),
+    )
+
+    def run():
+        outcome = run_chat_batch("bench_tocs", requests, config)
+        if outcome.errors:
+            raise RuntimeError(f"Batch requests failed: {outcome.errors}")
+        for completion in outcome.results.values():
+            validate(instance=json.loads(message_content(completion)), schema=TOC_SCHEMA)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        return measure(run, iterations=3 * scale, items_per_call=len(requests))
+
+
+@benchmark("corpus_chunking")
+def bench_corpus_chunking(scale: int) -> dict[str, Any]:
+    from rag.ingestion import iter_corpus_chunks
+
+    chunk_count = sum(1 for _ in iter_corpus_chunks())
+    result = measure(lambda: sum(1 for _ in iter_corpus_chunks()), iterations=5 * scale)
+    result["chunks"] = chunk_count
+    result["chunks_per_s"] = round(chunk_count * result["iterations"] / result["total_s"], 1)
+    return result
+
+
+@benchmark("corpus_load")
+def bench_corpus_load(scale: int) -> dict[str, Any]:
+    from rag.corpus import open_corpus
+    from rag.ingestion import iter_corpus_documents, iter_document_sections
+
+    start = time.perf_counter()
+    sections = sum(1 for f, d in iter_corpus_documents() for _ in iter_document_sections(f, d))
+    html_parse_ms = (time.perf_counter() - start) * 1000
+
+    def run() -> None:
+        with open_corpus() as corpus:
+            for _ in corpus.iter_sections():
+                pass
+
+    # The warm-up call compiles the corpus file if it is missing or stale.
+    result = measure(run, iterations=20 * scale, items_per_call=sections)
+    result["sections"] = sections
+    result["html_parse_ms"] = round(html_parse_ms, 3)
+    return result
+
+
+@benchmark("embedding_batching")
+def bench_embedding_batching(scale: int) -> dict[str, Any]:
+    from rag.embeddings import EmbeddingService
+    from rag.ingestion import iter_corpus_chunks
+    from utils.openai_client import get_openai_client
+
+    texts = [chunk.text for chunk in iter_corpus_chunks()]
+    service = EmbeddingService(client=get_openai_client())
+
+    result = measure(lambda: service.embed(texts), iterations=2 * scale, items_per_call=len(texts))
+    result["api_calls_per_run"] = service.api_calls // (result["iterations"] + 1)
+    return result
+
+
+@benchmark("vector_search")
+def bench_vector_search(scale: int) -> dict[str, Any]:
+    from rag.embeddings import EmbeddingService
+    from rag.ingestion import iter_corpus_chunks
+    from rag.numpy_store import NumpyVectorStore
+    from utils.openai_client import get_openai_client
+
+    chunks = list(iter_corpus_chunks())
+    service = EmbeddingService(client=get_openai_client())
+    embeddings = service.embed([chunk.text for chunk in chunks])
+    query = service.embed_query("Where is user data stored?")
+
+    with tempfile.TemporaryDirectory() as store_dir:
+        writer = NumpyVectorStore(store_dir)
+        writer.upsert(
+            ids=[chunk.chunk_id for chunk in chunks],
+            embeddings=embeddings,
+            metadatas=[chunk.metadata() for chunk in chunks],
+        )
+        writer.persist()
+
+        start = time.perf_counter()
+        store = NumpyVectorStore(store_dir)
+        open_ms = (time.perf_counter() - start) * 1000
+
+        result = measure(lambda: store.query(query, 10), iterations=500 * scale)
+        result["vectors"] = store.count()
+        result["open_ms"] = round(open_ms, 3)
+        return result
+
+
+@benchmark("chat_turn")
+def bench_chat_turn(scale: int) -> dict[str, Any]:
+    import cli
+
+    from chatbot.config import load_prompts
+
+    system_prompt = load_prompts()["system"]
+    # Measure the full completion path rather than answer cache hits.
+    cli.get_options().answer_cache_enabled = False
+
+    def run():
+        conversation = cli.Conversation(system_prompt=system_prompt)
+        cli.chat_turn(conversation, "What is the date 30 days from today?")
+
+    return measure(run, iterations=20 * scale)
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[str]:
+    """Returns a line per benchmark whose p50 latency regressed by more than ``threshold``."""
+    regressions = []
+    for name, result in current["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if not before or "p50_ms" not in result or not before.get("p50_ms"):
+            continue
+        change = (result["p50_ms"] - before["p50_ms"]) / before["p50_ms"]
+        marker = "REGRESSION" if change > threshold else "ok"
+        print(
+            f"  {name:<24} p50 {before['p50_ms']:>10.3f} -> {result['p50_ms']:>10.3f} ms ({change:+.1%}) {marker}"
+        )
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the benchmark suite against a stub LLM")
+
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="JSON results path")
+    parser.add_argument(
+        "--only", default="", help=f"Comma-separated subset of: {', '.join(BENCHMARKS)}"
+    )
+    parser.add_argument("--scale", type=int, default=1, help="Multiply iteration counts")
+    parser.add_argument("--compare", type=Path, help="Baseline JSON to compare p50 latency against")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="Allowed p50 slowdown before failing"
+    )
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Stub server latency")
+
+    args = parser.parse_args()
+
+    server, base_url = start_in_thread(StubConfig(latency_ms=args.latency_ms))
+    os.environ["OPENAI_BASE_URL"] = base_url
+    os.environ.setdefault("OPENAI_API_KEY", "bench")
+    # Keep caches from previous real runs out of the measurements.
+    os.environ["EMBEDDING_CACHE_PATH"] = str(Path(tempfile.mkdtemp()) / "embeddings.sqlite")
+
+    selected = [name.strip() for name in args.only.split(",") if name.strip()] or list(BENCHMARKS)
+    results: dict[str, Any] = {}
+    for name in selected:
+        if name not in BENCHMARKS:
+            parser.error(f"Unknown benchmark '{name}'")
+        print(f"Running {name}...", flush=True)
+        try:
+            results[name] = BENCHMARKS[name](args.scale)
+        except Exception as e:
+            results[name] = {"error": f"{type(e).__name__}: {e}"}
+            print(f"  ✗ {name}: {e}")
+            continue
+        r = results[name]
+        print(
+            f"  ✓ {name}: p50 {r['p50_ms']} ms, p95 {r['p95_ms']} ms, p99 {r['p99_ms']} ms, "
+            f"{r['throughput_per_s']} items/s"
+        )
+    server.shutdown()
+
+    report = {
+        "revision": git_revision(),
+        "timestamp": datetime.now(UTC).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scale": args.scale,
+        "results": results,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"Saved results: {args.output}")
+
+    if args.compare:
+        print(f"Comparing against {args.compare}:")
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"Regressions above {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
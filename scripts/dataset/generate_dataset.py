@@ -6,10 +6,6 @@ from pathlib import Path
 ROOT = Path(__file__).resolve().parents[2]
 sys.path.insert(0, str(ROOT))
 
-from scripts.utils.section_generator import generate_all_sections
-from scripts.utils.toc_generator import generate_all_tocs
-from scripts.utils.tool_generator import generate_tools
-
 
 def main():
     parser = argparse.ArgumentParser(description="Dataset Generation Console App")
@@ -26,22 +22,51 @@ def main():
         "--sections", action="store_true", help="Generate HTML files for all sections in TOCs"
     )
 
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Run --tools and --tocs through the Batch API (default: pipeline.batch.enabled)",
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Documents generated concurrently by --sections (default: pipeline.max_workers)",
+    )
+
+    parser.add_argument(
+        "--schedule",
+        choices=["sequential", "parallel_siblings"],
+        default=None,
+        help="Section order inside a document (default: pipeline.section_schedule.mode)",
+    )
+
     args = parser.parse_args()
+    batch = True if args.batch else None
+
+    # Generators load configs and the OpenAI SDK; import only the stages that run.
+    if args.all or args.tools:
+        from scripts.utils.tool_generator import generate_tools
+    if args.all or args.tocs:
+        from scripts.utils.toc_generator import generate_all_tocs
+    if args.all or args.sections:
+        from scripts.utils.section_generator import generate_all_sections
 
     if args.all:
         print("Generating complete dataset...")
-        generate_tools()
-        generate_all_tocs()
-        generate_all_sections()
+        generate_tools(batch=batch)
+        generate_all_tocs(batch=batch)
+        generate_all_sections(max_workers=args.workers, schedule=args.schedule)
     else:
         if args.tools:
-            generate_tools()
+            generate_tools(batch=batch)
         if args.tocs:
-            generate_all_tocs()
+            generate_all_tocs(batch=batch)
         if args.sections:
-            generate_all_sections()
+            generate_all_sections(max_workers=args.workers, schedule=args.schedule)
 
-    if not any(vars(args).values()):
+    if not (args.all or args.tools or args.tocs or args.sections):
         parser.print_help()
 
 
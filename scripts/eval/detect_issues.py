@@ -0,0 +1,223 @@
+"""Detects planted data-quality issues in the corpus and scores the detector.
+
+Ground truth comes from the ``issues_<document_type>.json`` manifests the generator
+writes next to each document. Corpora generated before manifests existed can be
+scored with ``--synthetic``, which plants typos and terminology variants into a copy
+of the sections (the two issue types that can be planted mechanically).
+
+The report gives precision and recall (overall and per issue type), the share of
+sections escalated to the LLM, its token usage and cost per document, and the time of
+each stage. ``--llm-all`` sends every section to the LLM, the baseline the heuristics
+are meant to replace.
+
+Usage:
+    python scripts/eval/detect_issues.py
+    python scripts/eval/detect_issues.py --synthetic --heuristics-only
+    python scripts/eval/detect_issues.py --synthetic --llm-all --output eval_results/issues_llm_all.json
+    python scripts/eval/detect_issues.py --synthetic --stub   # offline smoke run
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+# Project root, src and src/chatbot on path first so all modules resolve when run as script
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT / "src" / "chatbot"))
+
+from scripts.eval.issue_detector import (
+    ISSUE_TYPES,
+    Finding,
+    HeuristicScanner,
+    LLMVerifier,
+    load_corpus_sections,
+    load_issue_manifests,
+    plant_synthetic_issues,
+    select_escalated,
+    verify_findings,
+)
+from scripts.eval.run_eval import PROMPTS_PATH, load_eval_config
+from scripts.utils.reporting import git_revision
+
+DEFAULT_OUTPUT = ROOT / "eval_results" / "issues.json"
+
+
+def _ratio(numerator: int, denominator: int) -> float | None:
+    return round(numerator / denominator, 4) if denominator else None
+
+
+def score(reported: list[Finding], truth: dict[tuple[str, str, str], str]) -> dict[str, Any]:
+    """Section-level precision / recall; a hit counts regardless of the predicted type."""
+    predicted = {f.section.key: f.issue_type for f in reported}
+    hits = predicted.keys() & truth.keys()
+    metrics: dict[str, Any] = {
+        "planted": len(truth),
+        "reported": len(predicted),
+        "true_positives": len(hits),
+        "precision": _ratio(len(hits), len(predicted)),
+        "recall": _ratio(len(hits), len(truth)),
+        "type_accuracy": _ratio(sum(predicted[k] == truth[k] for k in hits), len(hits)),
+        "per_type": {},
+    }
+    for issue_type in ISSUE_TYPES:
+        planted = {k for k, t in truth.items() if t == issue_type}
+        flagged = {k for k, t in predicted.items() if t == issue_type}
+        if planted or flagged:
+            metrics["per_type"][issue_type] = {
+                "planted": len(planted),
+                "recall": _ratio(len(planted & predicted.keys()), len(planted)),
+                "precision": _ratio(len(flagged & truth.keys()), len(flagged)),
+            }
+    return metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Detect and score planted data-quality issues")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="JSON report path")
+    parser.add_argument(
+        "--synthetic",
+        action="store_true",
+        help="Plant typos / terminology variants as ground truth",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed for --synthetic")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--heuristics-only", action="store_true", help="Report heuristic findings")
+    mode.add_argument(
+        "--llm-all", action="store_true", help="Baseline: send every section to the LLM"
+    )
+    parser.add_argument("--threshold", type=float, help="Escalation score (default from eval.yaml)")
+    parser.add_argument("--workers", type=int, help="Concurrent LLM calls (default from eval.yaml)")
+    parser.add_argument(
+        "--stub", action="store_true", help="Run against the local stub LLM (smoke test)"
+    )
+    args = parser.parse_args()
+
+    config = load_eval_config()
+    detection_cfg = config["issue_detection"]
+    pricing = config["pricing"]
+    server = None
+    if args.stub:
+        from scripts.stub.llm_stub_server import StubConfig, start_in_thread
+
+        server, base_url = start_in_thread(StubConfig())
+        os.environ["OPENAI_BASE_URL"] = base_url
+        os.environ.setdefault("OPENAI_API_KEY", "eval")
+
+    start = time.perf_counter()
+    sections = load_corpus_sections()
+    if args.synthetic:
+        sections, truth = plant_synthetic_issues(sections, seed=args.seed)
+    else:
+        truth = load_issue_manifests()
+        if not truth:
+            parser.error(
+                "No issues_*.json manifests found; regenerate documents or use --synthetic"
+            )
+        # Only documents with a manifest have a known ground truth.
+        documents = {key[:2] for key in truth}
+        sections = [s for s in sections if s.document in documents]
+    load_s = time.perf_counter() - start
+    documents = {s.document for s in sections}
+    print(f"Scanning {len(sections)} sections of {len(documents)} documents...", flush=True)
+
+    start = time.perf_counter()
+    findings = HeuristicScanner(sections).scan()
+    escalated = select_escalated(
+        findings, args.threshold or detection_cfg["threshold"], escalate_all=args.llm_all
+    )
+    scan_s = time.perf_counter() - start
+
+    verifier = None
+    if not args.heuristics_only:
+        with open(PROMPTS_PATH, encoding="utf-8") as f:
+            prompts = yaml.safe_load(f)["issue_detection"]
+        verifier = LLMVerifier(
+            prompts, model=detection_cfg["model"], temperature=detection_cfg.get("temperature", 0)
+        )
+    start = time.perf_counter()
+    checked = verify_findings(
+        escalated, sections, verifier, args.workers or detection_cfg.get("workers", 8)
+    )
+    llm_s = time.perf_counter() - start
+    if server is not None:
+        server.shutdown()
+
+    reported = [f for f in checked if f.confirmed]
+    failed = [f for f in checked if f.confirmed is None]
+    usage: Counter[str] = Counter()
+    for finding in checked:
+        usage.update(finding.usage)
+    cost = (
+        usage["prompt_tokens"] * pricing["input_per_million"]
+        + usage["completion_tokens"] * pricing["output_per_million"]
+    ) / 1_000_000
+    summary = {
+        "mode": (
+            "heuristics" if args.heuristics_only else "llm_all" if args.llm_all else "escalated"
+        ),
+        "ground_truth": "synthetic" if args.synthetic else "manifests",
+        "documents": len(documents),
+        "sections": len(sections),
+        "escalated": len(escalated),
+        "escalation_rate": _ratio(len(escalated), len(sections)),
+        "llm_requests": len(checked) if verifier else 0,
+        "llm_errors": len(failed),
+        "prompt_tokens": usage["prompt_tokens"],
+        "completion_tokens": usage["completion_tokens"],
+        "cost_usd": round(cost, 6),
+        "cost_per_document_usd": round(cost / len(documents), 6) if documents else 0.0,
+        "load_s": round(load_s, 3),
+        "scan_s": round(scan_s, 3),
+        "llm_s": round(llm_s, 3),
+        **score(reported, truth),
+    }
+
+    for metric, value in summary.items():
+        if metric != "per_type":
+            print(f"  {metric:<22} {value}")
+    for issue_type, metrics in summary["per_type"].items():
+        line = ", ".join(f"{name} {value}" for name, value in metrics.items())
+        print(f"  {issue_type:<22} {line}")
+
+    report = {
+        "revision": git_revision(),
+        "timestamp": datetime.now(UTC).isoformat(timespec="seconds"),
+        "config": detection_cfg,
+        "summary": summary,
+        "findings": [
+            {
+                "tool": f.section.tool,
+                "doc_type": f.section.doc_type,
+                "section_id": f.section.section_id,
+                "score": f.score,
+                "signals": [f"{t}: {d}" for t, d in f.signals],
+                "confirmed": f.confirmed,
+                "issue_type": f.issue_type,
+                "evidence": f.evidence,
+                "planted": truth.get(f.section.key),
+            }
+            for f in checked
+        ],
+        "missed": [
+            {"tool": k[0], "doc_type": k[1], "section_id": k[2], "issue_type": t}
+            for k, t in sorted(truth.items())
+            if k not in {f.section.key for f in reported}
+        ],
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"Saved results: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
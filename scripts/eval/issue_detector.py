@@ -0,0 +1,522 @@
+"""Batch detector for data quality issues in the generated corpus.
+
+Every section is first scored with cheap corpus-wide heuristics:
+
+- typos: rare words one edit away from a frequent word (a deletion-neighbourhood
+  dictionary built from the corpus itself, so no external word list is needed);
+- inconsistent terminology: a term whose hyphenation, spacing or (for two-word terms)
+  capitalisation in one section differs from the form the rest of the document uses;
+- contradictions: a number (percentage, period) stated for the same topic with a
+  different value than elsewhere in the document;
+- ambiguity: vague phrasing that the rest of the document does not use.
+
+Only sections whose score reaches the escalation threshold are sent to the LLM, which
+confirms or rejects the issue, so the model reads a small fraction of the corpus.
+"""
+
+import json
+import random
+import re
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from utils.openai_client import get_openai_client
+
+ISSUE_TYPES = ("contradiction", "ambiguity", "typo", "inconsistent_terminology")
+
+# Heuristic weights; a section is escalated once its total reaches the threshold.
+SIGNAL_WEIGHTS = {
+    "typo": 1.0,
+    "inconsistent_terminology": 1.0,
+    "contradiction": 1.0,
+    "ambiguity": 0.5,
+}
+DEFAULT_ESCALATION_THRESHOLD = 1.0
+
+# Words seen at least this often in the corpus count as correctly spelled.
+FREQUENT_WORD_MIN_COUNT = 3
+MIN_TYPO_WORD_LENGTH = 5
+# How much more often the suggested spelling must occur than the suspected typo (seen once).
+TYPO_MIN_FREQUENCY_RATIO = 5
+# A spelling of a term is only "the" spelling once this many sections of a document use it.
+MIN_TERM_MAJORITY_SECTIONS = 3
+
+# Topic words that make two numbers in one document comparable.
+FACT_TOPICS = (
+    "uptime",
+    "availability",
+    "notice",
+    "notify",
+    "notification",
+    "retain",
+    "retention",
+    "response",
+    "respond",
+    "acknowledg",
+    "terminat",
+    "breach",
+    "credit",
+    "refund",
+    "renew",
+    "backup",
+)
+_FACT_RE = re.compile(
+    r"(\d+(?:\.\d+)?)\s*(?:\(\d+\)\s*)?(%|percent|business days?|days?|hours?|months?|years?)",
+    re.IGNORECASE,
+)
+_WORDED_NUMBER_RE = re.compile(r"\b[a-z-]+ \((\d+)\)", re.IGNORECASE)
+
+AMBIGUITY_CUES = (
+    "as soon as possible",
+    "as appropriate",
+    "as needed",
+    "from time to time",
+    "in a timely manner",
+    "and/or",
+    "approximately",
+    "or similar",
+    "etc.",
+    "may or may not",
+    "at some point",
+    "where possible",
+    "some cases",
+)
+
+_WORD_RE = re.compile(r"[A-Za-z]+(?:-[A-Za-z]+)*")
+_SENTENCE_START_RE = re.compile(r"(?:^|[.!?:;]\s+)$")
+
+DETECTION_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "issue_check",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "has_issue": {"type": "boolean"},
+                "issue_type": {"type": "string", "enum": [*ISSUE_TYPES, "none"]},
+                "evidence": {"type": "string"},
+            },
+            "required": ["has_issue", "issue_type", "evidence"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+
+@dataclass
+class Section:
+    tool: str
+    doc_type: str
+    section_id: str
+    title: str
+    text: str
+
+    @property
+    def document(self) -> tuple[str, str]:
+        return self.tool, self.doc_type
+
+    @property
+    def key(self) -> tuple[str, str, str]:
+        return self.tool, self.doc_type, self.section_id
+
+
+@dataclass
+class Finding:
+    """Heuristic signals of one section and, once checked, the LLM verdict."""
+
+    section: Section
+    signals: list[tuple[str, str]] = field(default_factory=list)
+    score: float = 0.0
+    confirmed: bool | None = None
+    issue_type: str | None = None
+    evidence: str = ""
+    usage: dict[str, int] = field(default_factory=dict)
+
+    def add(self, issue_type: str, detail: str, weight: float | None = None) -> None:
+        self.signals.append((issue_type, detail))
+        self.score += SIGNAL_WEIGHTS[issue_type] if weight is None else weight
+
+    @property
+    def likely_type(self) -> str:
+        weights: Counter[str] = Counter()
+        for issue_type, _ in self.signals:
+            weights[issue_type] += SIGNAL_WEIGHTS[issue_type]
+        return weights.most_common(1)[0][0]
+
+
+def load_corpus_sections(data_dir: str | Path | None = None) -> list[Section]:
+    """Returns every section of every document in the corpus."""
+    from rag.corpus import open_corpus
+
+    with open_corpus(data_dir) as corpus:
+        return [
+            Section(tool, doc_type, entry.id, entry.title, text)
+            for tool, doc_type, entry, text in corpus.iter_sections()
+        ]
+
+
+def load_issue_manifests(data_dir: str | Path | None = None) -> dict[tuple[str, str, str], str]:
+    """Returns the planted issues recorded by the generator: ``(tool, doc, section) -> type``."""
+    from rag.ingestion import resolve_data_dir
+
+    truth: dict[tuple[str, str, str], str] = {}
+    for path in sorted(resolve_data_dir(data_dir).glob("*/issues_*.json")):
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+        for issue in manifest["issues"]:
+            key = (manifest["tool"], manifest["document_type"], issue["section_id"])
+            truth[key] = issue["issue_type"]
+    return truth
+
+
+def _deletes(word: str) -> set[str]:
+    return {word[:i] + word[i + 1 :] for i in range(len(word))}
+
+
+def _typo_edit(word: str, candidate: str) -> bool:
+    """True if ``word`` is ``candidate`` with one dropped, doubled, swapped or replaced letter.
+
+    Edits to the first letter or the last two (inflections such as -s, -ed, -es) are
+    ignored: they turn one real word into another far more often than they are typos.
+    """
+    if abs(len(word) - len(candidate)) > 1:
+        return False
+    short, long_ = sorted((word, candidate), key=len)
+    if len(short) == len(long_):
+        diffs = [i for i, (a, b) in enumerate(zip(word, candidate, strict=True)) if a != b]
+        if len(diffs) == 2 and diffs[1] == diffs[0] + 1:
+            swapped = (
+                word[diffs[1]] == candidate[diffs[0]] and word[diffs[0]] == candidate[diffs[1]]
+            )
+            position = diffs[0] if swapped else -1
+        else:
+            position = diffs[0] if len(diffs) == 1 else -1
+    else:
+        position = next((i for i in range(len(short)) if short[i] != long_[i]), len(short))
+        if short != long_[:position] + long_[position + 1 :]:
+            position = -1
+    return 0 < position < len(long_) - 2
+
+
+class TypoIndex:
+    """Corpus vocabulary with a deletion index for edit-distance-1 lookups."""
+
+    def __init__(self, texts: Iterable[str]):
+        self.counts: Counter[str] = Counter()
+        for text in texts:
+            self.counts.update(w.lower() for w in _WORD_RE.findall(text))
+        self._by_delete: dict[str, set[str]] = defaultdict(set)
+        for word, count in self.counts.items():
+            if count >= FREQUENT_WORD_MIN_COUNT and len(word) >= MIN_TYPO_WORD_LENGTH - 1:
+                self._by_delete[word].add(word)
+                for variant in _deletes(word):
+                    self._by_delete[variant].add(word)
+
+    def suggestion(self, word: str) -> str | None:
+        """Returns a frequent word one edit away when ``word`` looks like a misspelling."""
+        word = word.lower()
+        if len(word) < MIN_TYPO_WORD_LENGTH or self.counts[word] > 1:
+            return None
+        candidates: set[str] = set(self._by_delete.get(word, ()))
+        for variant in _deletes(word):
+            candidates |= self._by_delete.get(variant, set())
+        candidates = {c for c in candidates if _typo_edit(word, c)}
+        if not candidates:
+            return None
+        best = max(candidates, key=self.counts.__getitem__)
+        # A one-off next to a word the corpus uses constantly; rarer pairs are real words.
+        return best if self.counts[best] >= TYPO_MIN_FREQUENCY_RATIO else None
+
+
+def _term_forms(text: str) -> Iterable[tuple[str, str]]:
+    """Yields ``(normalised_key, surface_form)`` for words and word pairs outside sentence starts."""
+    matches = list(_WORD_RE.finditer(text))
+    for i, match in enumerate(matches):
+        if _SENTENCE_START_RE.search(text[max(0, match.start() - 3) : match.start()]):
+            continue
+        word = match.group()
+        yield word.replace("-", "").lower(), word
+        if i + 1 < len(matches) and text[match.end() : matches[i + 1].start()] == " ":
+            pair = f"{word} {matches[i + 1].group()}"
+            yield pair.replace("-", "").replace(" ", "").lower(), pair
+
+
+def _is_variant(form: str, majority_form: str) -> bool:
+    """Hyphenation or spacing variants ("sub-processor" / "subprocessor") always count;
+    capitalisation only for two-word terms ("Service Provider" / "service provider")."""
+    if form.replace("-", "").replace(" ", "") != majority_form.replace("-", "").replace(" ", ""):
+        return " " in form and form.istitle() != majority_form.istitle()
+    return form != majority_form
+
+
+def _facts(text: str) -> Iterable[tuple[tuple[str, str], str, str]]:
+    """Yields ``((topic, unit), value, snippet)`` for numbers stated about a known topic."""
+    for match in _FACT_RE.finditer(text):
+        unit = match.group(2).lower().rstrip("s")
+        unit = "%" if unit == "percent" else unit
+        window = text[max(0, match.start() - 80) : match.start()].lower()
+        topics = [topic for topic in FACT_TOPICS if topic in window]
+        if topics:
+            snippet = text[max(0, match.start() - 80) : match.end()].strip()
+            yield (topics[-1], unit), match.group(1), snippet
+
+
+class HeuristicScanner:
+    """Scores every section of the corpus with the local heuristics."""
+
+    def __init__(self, sections: list[Section]):
+        self.sections = sections
+        self.typos = TypoIndex(s.text for s in sections)
+
+    def scan(self) -> dict[tuple[str, str, str], Finding]:
+        findings = {s.key: Finding(s) for s in self.sections}
+        by_document: dict[tuple[str, str], list[Section]] = defaultdict(list)
+        for section in self.sections:
+            by_document[section.document].append(section)
+
+        for section in self.sections:
+            for word in set(_WORD_RE.findall(section.text)):
+                suggestion = self.typos.suggestion(word)
+                if suggestion:
+                    findings[section.key].add("typo", f"'{word}' (did you mean '{suggestion}'?)")
+
+        for document_sections in by_document.values():
+            self._scan_terminology(document_sections, findings)
+            self._scan_facts(document_sections, findings)
+            self._scan_ambiguity(document_sections, findings)
+        return findings
+
+    def _scan_terminology(
+        self, sections: list[Section], findings: dict[tuple[str, str, str], Finding]
+    ) -> None:
+        # key -> form -> sections using it
+        usage: dict[str, dict[str, set[str]]] = defaultdict(lambda: defaultdict(set))
+        for section in sections:
+            for key, form in _term_forms(section.text):
+                usage[key][form].add(section.section_id)
+        by_id = {s.section_id: s for s in sections}
+        for forms in usage.values():
+            if len(forms) < 2:
+                continue
+            ranked = sorted(forms.items(), key=lambda item: len(item[1]), reverse=True)
+            majority_form, majority_sections = ranked[0]
+            if len(majority_sections) < MIN_TERM_MAJORITY_SECTIONS:
+                continue
+            for form, section_ids in ranked[1:]:
+                # A form used in several sections is a style the document uses, not a slip.
+                if len(section_ids) > 1 or not _is_variant(form, majority_form):
+                    continue
+                # Capitalisation alone is weak evidence: LLM-written text drifts in and out of
+                # Title Case for defined terms; it only escalates together with another signal.
+                case_only = form.lower() == majority_form.lower()
+                for section_id in section_ids:
+                    findings[by_id[section_id].key].add(
+                        "inconsistent_terminology",
+                        f"'{form}' vs '{majority_form}' elsewhere",
+                        weight=(
+                            SIGNAL_WEIGHTS["inconsistent_terminology"] / 2 if case_only else None
+                        ),
+                    )
+
+    def _scan_facts(
+        self, sections: list[Section], findings: dict[tuple[str, str, str], Finding]
+    ) -> None:
+        values: dict[tuple[str, str], dict[str, list[tuple[Section, str]]]] = defaultdict(
+            lambda: defaultdict(list)
+        )
+        for section in sections:
+            text = _WORDED_NUMBER_RE.sub(r"\1", section.text)
+            for fact_key, value, snippet in _facts(text):
+                values[fact_key][value].append((section, snippet))
+        for (topic, unit), by_value in values.items():
+            if len(by_value) < 2:
+                continue
+            ranked = sorted(by_value.items(), key=lambda item: len(item[1]), reverse=True)
+            majority_value, majority = ranked[0]
+            majority_ids = {section.section_id for section, _ in majority}
+            if len(majority_ids) < 2:
+                continue
+            for value, occurrences in ranked[1:]:
+                section_ids = {section.section_id for section, _ in occurrences}
+                # Tiers listed together ("1 hour for critical, 4 hours for high") are not conflicts.
+                if len(section_ids) > 1 or section_ids & majority_ids:
+                    continue
+                for section, snippet in occurrences:
+                    findings[section.key].add(
+                        "contradiction",
+                        f"{topic}: {value}{unit} here vs {majority_value}{unit} elsewhere "
+                        f"(…{snippet[-60:]})",
+                    )
+
+    def _scan_ambiguity(
+        self, sections: list[Section], findings: dict[tuple[str, str, str], Finding]
+    ) -> None:
+        for cue in AMBIGUITY_CUES:
+            using = [s for s in sections if cue in s.text.lower()]
+            # Boilerplate vagueness repeated across the document is style, not a planted issue.
+            if len(using) == 1:
+                findings[using[0].key].add("ambiguity", f"vague phrase '{cue}'")
+
+
+class LLMVerifier:
+    """Confirms or rejects the escalated sections with one structured-output call each."""
+
+    def __init__(self, prompts: dict[str, str], model: str, temperature: float = 0.0):
+        self.prompts = prompts
+        self.model = model
+        self.temperature = temperature
+
+    def verify(self, finding: Finding, context: str = "") -> Finding:
+        section = finding.section
+        signals = "\n".join(f"- {t}: {d}" for t, d in finding.signals) or "- none"
+        messages = [
+            {"role": "system", "content": self.prompts["system"]},
+            {
+                "role": "user",
+                "content": self.prompts["user_template"].format(
+                    document=f"{section.tool} / {section.doc_type}",
+                    section_title=section.title,
+                    section_text=section.text,
+                    signals=signals,
+                    context=context or "(none)",
+                ),
+            },
+        ]
+        response = get_openai_client().chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=self.temperature,
+            response_format=DETECTION_RESPONSE_FORMAT,
+        )
+        result = json.loads(response.choices[0].message.content or "{}")
+        finding.confirmed = bool(result.get("has_issue")) and result.get("issue_type") != "none"
+        finding.issue_type = result.get("issue_type") if finding.confirmed else None
+        finding.evidence = result.get("evidence", "")
+        usage = response.usage
+        finding.usage = {
+            "prompt_tokens": usage.prompt_tokens if usage else 0,
+            "completion_tokens": usage.completion_tokens if usage else 0,
+        }
+        return finding
+
+
+def document_outline(sections: list[Section], max_chars: int = 160) -> dict[tuple[str, str], str]:
+    """A short per-document digest (first sentence of every section) given to the LLM as context."""
+    outlines: dict[tuple[str, str], list[str]] = defaultdict(list)
+    for section in sections:
+        outlines[section.document].append(f"{section.title}: {section.text[:max_chars]}")
+    return {document: "\n".join(lines) for document, lines in outlines.items()}
+
+
+def select_escalated(
+    findings: dict[tuple[str, str, str], Finding],
+    threshold: float = DEFAULT_ESCALATION_THRESHOLD,
+    escalate_all: bool = False,
+) -> list[Finding]:
+    """Findings to send to the LLM: score at or above ``threshold``, or all of them."""
+    return [f for f in findings.values() if escalate_all or f.score >= threshold]
+
+
+def verify_findings(
+    escalated: list[Finding],
+    sections: list[Section],
+    verifier: LLMVerifier | None = None,
+    workers: int = 8,
+) -> list[Finding]:
+    """Sets ``confirmed`` and ``issue_type`` on the escalated findings.
+
+    Without a verifier every escalated finding is reported with its most likely type.
+    A failed LLM call leaves ``confirmed`` as None and records the error as evidence.
+    """
+    if verifier is None:
+        for finding in escalated:
+            finding.issue_type = finding.likely_type
+            finding.confirmed = True
+        return escalated
+
+    outlines = document_outline(sections)
+
+    def verify(finding: Finding) -> Finding:
+        try:
+            return verifier.verify(finding, outlines[finding.section.document])
+        except Exception as e:
+            finding.evidence = f"{type(e).__name__}: {e}"
+            return finding
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(verify, escalated))
+
+
+def detect_issues(
+    sections: list[Section],
+    verifier: LLMVerifier | None = None,
+    threshold: float = DEFAULT_ESCALATION_THRESHOLD,
+    workers: int = 8,
+    escalate_all: bool = False,
+) -> list[Finding]:
+    """Scans sections and returns the escalated findings.
+
+    Args:
+        sections: Sections to scan (normally the whole corpus).
+        verifier: LLM stage; without it every escalated section is reported as is.
+        threshold: Heuristic score from which a section is escalated.
+        workers: Concurrent LLM calls.
+        escalate_all: Send every section to the LLM (the baseline the heuristics replace).
+
+    Returns:
+        list[Finding]: Escalated findings; ``confirmed`` holds the verdict.
+    """
+    findings = HeuristicScanner(sections).scan()
+    escalated = select_escalated(findings, threshold, escalate_all)
+    return verify_findings(escalated, sections, verifier, workers)
+
+
+def _misspell(word: str, rng: random.Random) -> str:
+    i = rng.randrange(1, len(word) - 2)
+    return word[:i] + word[i + 1] + word[i] + word[i + 2 :]
+
+
+def plant_synthetic_issues(
+    sections: list[Section], per_document: int = 2, seed: int = 0
+) -> tuple[list[Section], dict[tuple[str, str, str], str]]:
+    """Copies the sections with typos and terminology variants planted into a few per document.
+
+    Gives a reproducible ground truth for the two issue types that can be planted
+    mechanically, for corpora generated before issue manifests were written.
+    """
+    rng = random.Random(seed)
+    planted = [Section(**vars(s)) for s in sections]
+    truth: dict[tuple[str, str, str], str] = {}
+    by_document: dict[tuple[str, str], list[Section]] = defaultdict(list)
+    for section in planted:
+        by_document[section.document].append(section)
+
+    for document_sections in by_document.values():
+        candidates = [s for s in document_sections if len(s.text) > 200]
+        for section in rng.sample(candidates, min(per_document, len(candidates))):
+            words = [
+                m
+                for m in _WORD_RE.finditer(section.text)
+                if len(m.group()) >= 7 and "-" not in m.group()
+            ]
+            hyphenable = [
+                m
+                for m in words
+                if any(m.group().lower().startswith(p) for p in ("sub", "non", "re", "co"))
+            ]
+            if hyphenable and rng.random() < 0.5:
+                match, issue_type = rng.choice(hyphenable), "inconsistent_terminology"
+                word = match.group()
+                split = 3 if word.lower().startswith(("sub", "non")) else 2
+                replacement = f"{word[:split]}-{word[split:]}"
+            elif words:
+                match, issue_type = rng.choice(words), "typo"
+                replacement = _misspell(match.group(), rng)
+            else:
+                continue
+            section.text = section.text[: match.start()] + replacement + section.text[match.end() :]
+            truth[section.key] = issue_type
+    return planted, truth
@@ -0,0 +1,131 @@
+"""LLM judge for evaluation answers with a persistent judgment cache.
+
+A judgment is stored under the hash of the judge model, the judge prompt, the question,
+the reference answer and the candidate answer. Re-running the evaluation therefore only
+calls the judge for answers that actually changed.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any
+
+from utils.openai_client import get_openai_client
+
+VERDICT_SCORES = {"correct": 1.0, "partially_correct": 0.5, "incorrect": 0.0}
+
+JUDGE_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "answer_judgment",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "verdict": {"type": "string", "enum": list(VERDICT_SCORES)},
+                "reason": {"type": "string"},
+            },
+            "required": ["verdict", "reason"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+
+def judgment_key(
+    model: str, prompts: dict[str, str], question: str, expected: str, answer: str
+) -> str:
+    payload = json.dumps([model, prompts, question, expected, answer], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class JudgmentCache:
+    """Persistent ``key -> judgment`` store backed by SQLite."""
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS judgments (key TEXT PRIMARY KEY, judgment TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT judgment FROM judgments WHERE key = ?", (key,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, key: str, judgment: dict[str, Any]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO judgments (key, judgment) VALUES (?, ?)",
+                (key, json.dumps(judgment)),
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class AnswerJudge:
+    """Grades answers against reference answers, reusing cached judgments."""
+
+    def __init__(
+        self, prompts: dict[str, str], model: str, temperature: float, cache: JudgmentCache
+    ):
+        self.prompts = prompts
+        self.model = model
+        self.temperature = temperature
+        self.cache = cache
+
+    def judge(self, question: str, expected: str, answer: str) -> dict[str, Any]:
+        """Returns ``{verdict, reason, score, cached, usage}`` for one answer.
+
+        Raises:
+            ValueError: If the judge returns no content or an unknown verdict.
+        """
+        key = judgment_key(self.model, self.prompts, question, expected, answer)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return {**cached, "cached": True, "usage": {}}
+
+        messages = [
+            {"role": "system", "content": self.prompts["system"]},
+            {
+                "role": "user",
+                "content": self.prompts["user_template"].format(
+                    question=question, expected_answer=expected, answer=answer
+                ),
+            },
+        ]
+        response = get_openai_client().chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=self.temperature,
+            response_format=JUDGE_RESPONSE_FORMAT,
+        )
+        content = response.choices[0].message.content
+        if not content:
+            raise ValueError("Empty judge output")
+        judgment = json.loads(content)
+        if judgment.get("verdict") not in VERDICT_SCORES:
+            raise ValueError(f"Unknown judge verdict: {judgment.get('verdict')}")
+        judgment["score"] = VERDICT_SCORES[judgment["verdict"]]
+        self.cache.put(key, judgment)
+
+        usage = response.usage
+        return {
+            **judgment,
+            "cached": False,
+            "usage": {
+                "prompt_tokens": usage.prompt_tokens if usage else 0,
+                "completion_tokens": usage.completion_tokens if usage else 0,
+            },
+        }
@@ -0,0 +1,335 @@
+"""Offline evaluation of retrieval and chatbot answers.
+
+Reads the question set of every tool (``data/<Tool>/eval_questions.json``) and, for each
+case, measures retrieval recall@k and reciprocal rank against the expected TOC sections,
+then asks the chatbot, records latency and token cost, and grades the answer with an
+LLM judge. Cases run concurrently on a thread pool and judgments are cached by answer
+hash, so a rerun only pays for answers that changed. ``--compare`` fails when quality,
+latency or cost regress against a saved report.
+
+Usage:
+    python scripts/eval/run_eval.py
+    python scripts/eval/run_eval.py --output eval_results/baseline.json
+    python scripts/eval/run_eval.py --compare eval_results/baseline.json
+    python scripts/eval/run_eval.py --retrieval-only --tools CollabVision
+    python scripts/eval/run_eval.py --stub --limit 2   # offline smoke run
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import yaml
+
+# Project root, src and src/chatbot on path first so all modules resolve when run as script
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT / "src" / "chatbot"))
+
+from scripts.utils.reporting import git_revision, percentile
+
+EVAL_CONFIG_PATH = ROOT / "config" / "eval.yaml"
+PROMPTS_PATH = ROOT / "config" / "prompts.yaml"
+DEFAULT_OUTPUT = ROOT / "eval_results" / "latest.json"
+
+
+def load_eval_config() -> dict[str, Any]:
+    with open(EVAL_CONFIG_PATH, encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+
+def load_cases(questions_file: str, tools: list[str], limit: int | None) -> list[dict[str, Any]]:
+    """Returns the evaluation cases of the selected tools (all tools when empty)."""
+    from rag.ingestion import resolve_data_dir
+
+    cases = []
+    for tool_folder in sorted(resolve_data_dir().iterdir()):
+        path = tool_folder / questions_file
+        if not path.exists() or (tools and tool_folder.name not in tools):
+            continue
+        questions = json.loads(path.read_text(encoding="utf-8"))
+        cases.extend({"tool": tool_folder.name, **q} for q in questions[:limit])
+    return cases
+
+
+class UsageTracker:
+    """OpenAI client wrapper summing the token usage of one case's chat completions."""
+
+    def __init__(self, client: Any):
+        self._client = client
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.requests = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **request: Any) -> Any:
+        response = self._client.chat.completions.create(**request)
+        self.requests += 1
+        if response.usage:
+            self.prompt_tokens += response.usage.prompt_tokens
+            self.completion_tokens += response.usage.completion_tokens
+        return response
+
+
+def retrieval_metrics(
+    ranked_sections: list[str], relevant: list[str], k_values: list[int]
+) -> dict[str, Any]:
+    """recall@k over the expected sections and the reciprocal rank of the first hit."""
+    first_rank = {}
+    for rank, section in enumerate(ranked_sections, start=1):
+        first_rank.setdefault(section, rank)
+    hits = [first_rank[s] for s in relevant if s in first_rank]
+    metrics: dict[str, Any] = {
+        f"recall@{k}": sum(rank <= k for rank in hits) / len(relevant) for k in k_values
+    }
+    metrics["reciprocal_rank"] = 1.0 / min(hits) if hits else 0.0
+    return metrics
+
+
+def evaluate_case(case: dict[str, Any], context: SimpleNamespace) -> dict[str, Any]:
+    """Runs retrieval, the chatbot and the judge for one case."""
+    import cli
+
+    from utils.openai_client import get_openai_client
+
+    result: dict[str, Any] = {"id": case["id"], "tool": case["tool"]}
+    k_values = context.config["retrieval"]["k_values"]
+
+    start = time.perf_counter()
+    hits = context.retriever.search(
+        case["question"],
+        k=max(k_values),
+        tools=[case["tool"]],
+        mode=context.config["retrieval"].get("mode", "hybrid"),
+    )
+    result["retrieval_ms"] = (time.perf_counter() - start) * 1000
+    ranked = [f"{hit.metadata['doc_type']}#{hit.metadata['section_id']}" for hit in hits]
+    result.update(retrieval_metrics(ranked, case["relevant_sections"], k_values))
+    if context.retrieval_only:
+        return result
+
+    tracker = UsageTracker(get_openai_client())
+    conversation = cli.Conversation(system_prompt=context.system_prompt)
+    start = time.perf_counter()
+    answer = cli.chat_turn(conversation, case["question"], chat_client=tracker) or ""
+    result["answer_ms"] = (time.perf_counter() - start) * 1000
+    pricing = context.config["pricing"]
+    result.update(
+        answer=answer,
+        prompt_tokens=tracker.prompt_tokens,
+        completion_tokens=tracker.completion_tokens,
+        completions=tracker.requests,
+        cost_usd=(
+            tracker.prompt_tokens * pricing["input_per_million"]
+            + tracker.completion_tokens * pricing["output_per_million"]
+        )
+        / 1_000_000,
+    )
+
+    if context.judge is not None:
+        judgment = context.judge.judge(case["question"], case["expected_answer"], answer)
+        result.update(
+            judge_score=judgment["score"],
+            judge_verdict=judgment["verdict"],
+            judge_reason=judgment["reason"],
+            judge_cached=judgment["cached"],
+            judge_tokens=sum(judgment["usage"].values()),
+        )
+    return result
+
+
+def _mean(values: list[float]) -> float | None:
+    return sum(values) / len(values) if values else None
+
+
+def summarize(cases: list[dict[str, Any]], k_values: list[int]) -> dict[str, Any]:
+    """Aggregates per-case results (errored cases are only counted)."""
+    ok = [c for c in cases if "error" not in c]
+    summary: dict[str, Any] = {"cases": len(cases), "errors": len(cases) - len(ok)}
+    for k in k_values:
+        summary[f"recall@{k}"] = _mean([c[f"recall@{k}"] for c in ok])
+    summary["mrr"] = _mean([c["reciprocal_rank"] for c in ok])
+    summary["retrieval_p50_ms"] = percentile(sorted(c["retrieval_ms"] for c in ok), 0.50)
+
+    answered = [c for c in ok if "answer_ms" in c]
+    if answered:
+        latencies = sorted(c["answer_ms"] for c in answered)
+        summary["answer_p50_ms"] = percentile(latencies, 0.50)
+        summary["answer_p95_ms"] = percentile(latencies, 0.95)
+        summary["prompt_tokens"] = sum(c["prompt_tokens"] for c in answered)
+        summary["completion_tokens"] = sum(c["completion_tokens"] for c in answered)
+        summary["cost_usd"] = sum(c["cost_usd"] for c in answered)
+        summary["cost_per_case_usd"] = summary["cost_usd"] / len(answered)
+    judged = [c for c in answered if "judge_score" in c]
+    if judged:
+        summary["judge_score"] = _mean([c["judge_score"] for c in judged])
+        summary["judge_cache_hits"] = sum(c["judge_cached"] for c in judged)
+        summary["judge_tokens"] = sum(c["judge_tokens"] for c in judged)
+    return summary
+
+
+def compare(
+    current: dict[str, Any], baseline: dict[str, Any], limits: dict[str, float]
+) -> list[str]:
+    """Prints the overall metrics next to the baseline and returns the ones that regressed."""
+    now, before = current["summary"]["overall"], baseline["summary"]["overall"]
+    quality = [m for m in now if m.startswith("recall@")] + ["mrr", "judge_score"]
+    relative = {
+        "answer_p50_ms": limits["max_latency_increase"],
+        "cost_per_case_usd": limits["max_cost_increase"],
+    }
+    regressions = []
+    for metric in quality + list(relative):
+        old, new = before.get(metric), now.get(metric)
+        if old is None or new is None:
+            continue
+        if metric in relative:
+            change = (new - old) / old if old else 0.0
+            regressed = change > relative[metric]
+            shown = f"{change:+.1%}"
+        else:
+            change = new - old
+            regressed = -change > limits["max_metric_drop"]
+            shown = f"{change:+.3f}"
+        marker = "REGRESSION" if regressed else "ok"
+        print(f"  {metric:<20} {old:>12.4f} -> {new:>12.4f} ({shown}) {marker}")
+        if regressed:
+            regressions.append(metric)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate retrieval and chatbot answers")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="JSON report path")
+    parser.add_argument("--tools", default="", help="Comma-separated tools (default: all)")
+    parser.add_argument("--limit", type=int, help="Questions per tool")
+    parser.add_argument("--workers", type=int, help="Concurrent cases (default from eval.yaml)")
+    parser.add_argument(
+        "--retrieval-only", action="store_true", help="Skip answers, cost and judging"
+    )
+    parser.add_argument("--no-judge", action="store_true", help="Skip LLM judging")
+    parser.add_argument("--compare", type=Path, help="Baseline report to check for regressions")
+    parser.add_argument(
+        "--stub", action="store_true", help="Run against the local stub LLM (smoke test)"
+    )
+    args = parser.parse_args()
+
+    config = load_eval_config()
+    server = None
+    if args.stub:
+        from scripts.stub.llm_stub_server import StubConfig, start_in_thread
+
+        server, base_url = start_in_thread(StubConfig())
+        os.environ["OPENAI_BASE_URL"] = base_url
+        os.environ.setdefault("OPENAI_API_KEY", "eval")
+        os.environ["EMBEDDING_CACHE_PATH"] = str(Path(tempfile.mkdtemp()) / "embeddings.sqlite")
+        # Stub embeddings do not match a real index; keep the smoke run self-contained.
+        os.environ["CHROMA_PERSIST_DIRECTORY"] = tempfile.mkdtemp()
+        os.environ["VECTOR_STORE"] = "numpy"
+
+        from rag.indexer import build_index
+
+        build_index()
+
+    import cli
+
+    from chatbot.config import load_prompts
+    from rag.retrieval import get_retriever
+
+    # Every case is answered by the model: no answer-cache hits, usage from plain responses.
+    options = cli.get_options()
+    options.answer_cache_enabled = False
+    options.stream_enabled = False
+
+    judge = None
+    judge_cfg = config["judge"]
+    if judge_cfg.get("enabled", True) and not (args.no_judge or args.retrieval_only):
+        from scripts.eval.judge import AnswerJudge, JudgmentCache
+
+        with open(PROMPTS_PATH, encoding="utf-8") as f:
+            judge_prompts = yaml.safe_load(f)["eval_judge"]
+        cache_path = Path(judge_cfg["cache_path"])
+        if args.stub:
+            cache_path = Path(tempfile.mkdtemp()) / "judgments.sqlite"
+        judge = AnswerJudge(
+            judge_prompts,
+            model=judge_cfg["model"],
+            temperature=judge_cfg.get("temperature", 0),
+            cache=JudgmentCache(cache_path if cache_path.is_absolute() else ROOT / cache_path),
+        )
+
+    tools = [t.strip() for t in args.tools.split(",") if t.strip()]
+    cases = load_cases(config["questions_file"], tools, args.limit)
+    if not cases:
+        parser.error("No evaluation questions found")
+    context = SimpleNamespace(
+        config=config,
+        retriever=get_retriever(),
+        system_prompt=load_prompts()["system"],
+        judge=judge,
+        retrieval_only=args.retrieval_only,
+    )
+
+    def run(case: dict[str, Any]) -> dict[str, Any]:
+        try:
+            return evaluate_case(case, context)
+        except Exception as e:
+            return {"id": case["id"], "tool": case["tool"], "error": f"{type(e).__name__}: {e}"}
+
+    workers = args.workers or config.get("workers", 8)
+    print(f"Evaluating {len(cases)} cases with {workers} workers...", flush=True)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(run, cases))
+    elapsed = time.perf_counter() - start
+    if server is not None:
+        server.shutdown()
+
+    k_values = config["retrieval"]["k_values"]
+    summary = {"overall": summarize(results, k_values)}
+    for tool in sorted({c["tool"] for c in results}):
+        summary[tool] = summarize([c for c in results if c["tool"] == tool], k_values)
+
+    for name, metrics in summary.items():
+        line = ", ".join(
+            f"{metric} {value:.4g}" if isinstance(value, float) else f"{metric} {value}"
+            for metric, value in metrics.items()
+        )
+        print(f"  {name}: {line}")
+    for case in results:
+        if "error" in case:
+            print(f"  ✗ {case['id']}: {case['error']}")
+    print(f"Finished in {elapsed:.1f} s")
+
+    report = {
+        "revision": git_revision(),
+        "timestamp": datetime.now(UTC).isoformat(timespec="seconds"),
+        "elapsed_s": round(elapsed, 3),
+        "config": config,
+        "summary": summary,
+        "cases": results,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"Saved results: {args.output}")
+
+    if args.compare:
+        print(f"Comparing against {args.compare}:")
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        regressions = compare(report, baseline, config["regression"])
+        if regressions:
+            print(f"Regressions: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+import argparse
+import sys
+from pathlib import Path
+
+# Project root and src on path first so "src" modules and their imports resolve when run as script
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src"))
+
+from rag.indexer import build_index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index data/ documents into the vector store")
+
+    parser.add_argument(
+        "--rebuild", action="store_true", help="Drop the existing index and re-embed everything"
+    )
+
+    args = parser.parse_args()
+
+    stats = build_index(rebuild=args.rebuild)
+    print(
+        f"Scanned {stats.files_scanned} documents ({stats.files_changed} changed, "
+        f"{stats.files_removed} removed): {stats.chunks_upserted} chunks upserted, "
+        f"{stats.chunks_deleted} deleted, {stats.chunks_unchanged} unchanged"
+    )
+    if stats.keyword_index_rebuilt:
+        print("Rebuilt BM25 keyword index")
+
+
+if __name__ == "__main__":
+    main()
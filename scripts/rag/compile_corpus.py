@@ -0,0 +1,36 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Project root and src on path first so "src" modules and their imports resolve when run as script
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src"))
+
+from rag.corpus import compile_corpus, corpus_path, open_corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compile data/ into the memory-mapped corpus file (data/.corpus.bin)"
+    )
+
+    parser.add_argument(
+        "--force", action="store_true", help="Recompile even if no source file changed"
+    )
+
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.force:
+        compile_corpus()
+    with open_corpus() as corpus:
+        print(
+            f"{corpus.path}: {len(corpus.documents)} documents, {len(corpus)} sections, "
+            f"{corpus_path().stat().st_size / 1024:.0f} KiB ({time.perf_counter() - start:.2f} s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
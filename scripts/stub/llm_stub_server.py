@@ -0,0 +1,689 @@
+"""Local, deterministic OpenAI-compatible stub server for offline benchmarking.
+
+Serves the subset of the API used by this project:
+
+- ``POST /chat/completions``: plain text, ``json_schema`` structured outputs (any schema,
+  including ``TOC_SCHEMA`` and ``TOOL_INFO_RESPONSE_FORMAT``), tool calls and SSE streaming.
+- ``POST /embeddings``: hashed bag-of-words vectors, so texts sharing words are similar.
+- ``POST /files``, ``GET /files/{id}`` and ``GET /files/{id}/content``: in-memory uploads.
+- ``POST /batches``, ``GET /batches/{id}`` and ``POST /batches/{id}/cancel``: batches of
+  chat completions from an uploaded JSONL file, completed after ``batch_delay_ms``.
+- ``GET /models``.
+
+Responses are derived from a hash of the request, so the same request always gets the same
+answer. Latency, output token throughput and 429 injection are configurable, which makes
+the generators and the chatbot reproducible to profile without network access or cost.
+
+Usage:
+    python scripts/stub/llm_stub_server.py --port 8089 --latency-ms 200 --rate-limit-rate 0.05
+    OPENAI_BASE_URL=http://127.0.0.1:8089 OPENAI_API_KEY=stub python scripts/dataset/generate_dataset.py --all
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import date
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+WORDS = (
+    "agreement provider customer data processing personal security controls compliance "
+    "service availability confidentiality retention deletion encryption access audit "
+    "incident notification subprocessor obligations liability termination region storage "
+    "privacy policy training model consent rights request breach certification framework "
+    "monitoring backup recovery uptime credit support transfer safeguards lawful basis"
+).split()
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+_TITLE_RE = re.compile(r'titled:\s*"([^"]+)"')
+_HEADING_RE = re.compile(r'"(h[1-6])"')
+
+# Recursive schemas (TOC subsections) are expanded at most this deep.
+MAX_SCHEMA_DEPTH = 3
+
+
+@dataclass
+class StubConfig:
+    """Behaviour knobs of the stub server."""
+
+    latency_ms: float = 50.0
+    jitter_ms: float = 0.0
+    tokens_per_second: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after_seconds: float = 1.0
+    embedding_dim: int = 256
+    completion_tokens: int = 200
+    batch_delay_ms: float = 200.0
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / 4) if text else 0
+
+
+def request_rng(payload: Any) -> random.Random:
+    digest = hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+    return random.Random(int(digest[:16], 16))
+
+
+def slugify(text: str) -> str:
+    return _SLUG_RE.sub("-", text.lower()).strip("-")
+
+
+def fake_sentence(rng: random.Random, words: int = 12) -> str:
+    sentence = " ".join(rng.choice(WORDS) for _ in range(words))
+    return sentence[0].upper() + sentence[1:] + "."
+
+
+def fake_text(rng: random.Random, tokens: int) -> str:
+    # ~1.3 tokens per word in English prose.
+    parts: list[str] = []
+    remaining_words = max(1, int(tokens / 1.3))
+    while remaining_words > 0:
+        n = min(remaining_words, rng.randint(8, 18))
+        parts.append(fake_sentence(rng, n))
+        remaining_words -= n
+    return " ".join(parts)
+
+
+def _resolve_ref(ref: str, root: dict[str, Any]) -> dict[str, Any]:
+    node: Any = root
+    for part in ref.lstrip("#/").split("/"):
+        node = node[part]
+    return node
+
+
+def generate_from_schema(
+    schema: dict[str, Any], rng: random.Random, root: dict[str, Any], depth: int = 0, key: str = ""
+) -> Any:
+    """Builds a value that validates against a (strict-mode) JSON schema."""
+    if "$ref" in schema:
+        return generate_from_schema(_resolve_ref(schema["$ref"], root), rng, root, depth, key)
+    if "enum" in schema:
+        return rng.choice(schema["enum"])
+    if "anyOf" in schema:
+        return generate_from_schema(schema["anyOf"][0], rng, root, depth, key)
+
+    schema_type = schema.get("type")
+    if isinstance(schema_type, list):
+        schema_type = next((t for t in schema_type if t != "null"), "null")
+
+    if schema_type == "object":
+        obj: dict[str, Any] = {}
+        for name, prop in schema.get("properties", {}).items():
+            obj[name] = generate_from_schema(prop, rng, root, depth, name)
+        # Keep ids consistent with titles, like the real TOC output.
+        if "id" in obj and isinstance(obj.get("title"), str):
+            obj["id"] = slugify(obj["title"])
+        return obj
+    if schema_type == "array":
+        items = schema.get("items", {})
+        is_recursive = "$ref" in items and depth > 0
+        if depth >= MAX_SCHEMA_DEPTH or (is_recursive and rng.random() < 0.5):
+            count = 0
+        else:
+            low, high = (4, 8) if depth == 0 else (1, 3)
+            count = rng.randint(low, high)
+        return [generate_from_schema(items, rng, root, depth + 1, key) for _ in range(count)]
+    if schema_type == "integer":
+        return rng.randint(1, 30)
+    if schema_type == "number":
+        return round(rng.uniform(0, 100), 2)
+    if schema_type == "boolean":
+        return rng.random() < 0.5
+    if schema_type == "null":
+        return None
+
+    if "date" in key:
+        return date.today().isoformat()
+    if key in ("name", "title"):
+        return " ".join(w.capitalize() for w in rng.sample(WORDS, rng.randint(2, 3)))
+    return fake_sentence(rng, rng.randint(6, 14))
+
+
+def _last_user_content(messages: list[dict[str, Any]]) -> str:
+    for message in reversed(messages):
+        if message.get("role") == "user":
+            content = message.get("content") or ""
+            return content if isinstance(content, str) else json.dumps(content)
+    return ""
+
+
+def _usage(prompt_tokens: int, completion_tokens: int) -> dict[str, int]:
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+def build_chat_message(body: dict[str, Any], config: StubConfig) -> dict[str, Any]:
+    """Returns the assistant message (content or tool_calls) for a chat completion request."""
+    rng = request_rng(body)
+    messages = body.get("messages", [])
+    tools = body.get("tools") or []
+    response_format = body.get("response_format") or {}
+
+    wants_tool = (
+        tools
+        and body.get("tool_choice", "auto") != "none"
+        and messages
+        and messages[-1].get("role") == "user"
+    )
+    if wants_tool:
+        function = rng.choice(tools)["function"]
+        parameters = function.get("parameters") or {"type": "object", "properties": {}}
+        arguments = generate_from_schema(parameters, rng, parameters)
+        return {
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [
+                {
+                    "id": f"call_{rng.getrandbits(48):012x}",
+                    "type": "function",
+                    "function": {"name": function["name"], "arguments": json.dumps(arguments)},
+                }
+            ],
+        }
+
+    if response_format.get("type") == "json_schema":
+        schema = response_format["json_schema"]["schema"]
+        return {
+            "role": "assistant",
+            "content": json.dumps(generate_from_schema(schema, rng, schema)),
+        }
+    if response_format.get("type") == "json_object":
+        return {"role": "assistant", "content": json.dumps({"result": fake_sentence(rng)})}
+
+    max_tokens = body.get("max_tokens") or body.get("max_completion_tokens")
+    tokens = min(config.completion_tokens, max_tokens or config.completion_tokens)
+    prompt = _last_user_content(messages)
+    title_match = _TITLE_RE.search(prompt)
+    if title_match:
+        # Section generator prompt: answer with a well-formed HTML section.
+        heading_match = _HEADING_RE.search(prompt)
+        tag = heading_match.group(1) if heading_match else "h2"
+        paragraphs = [f"<p>{fake_text(rng, tokens // 2)}</p>" for _ in range(2)]
+        content = f"<{tag}>{title_match.group(1)}</{tag}>\n" + "\n".join(paragraphs)
+    else:
+        content = fake_text(rng, tokens)
+    return {"role": "assistant", "content": content}
+
+
+def build_chat_completion(body: dict[str, Any], config: StubConfig) -> dict[str, Any]:
+    """Returns a full (non-streamed) chat completion response for a request body."""
+    message = build_chat_message(body, config)
+    prompt_tokens = sum(
+        estimate_tokens(str(m.get("content") or "")) + 4 for m in body.get("messages", [])
+    )
+    output = message.get("content") or json.dumps(message.get("tool_calls"))
+    completion_tokens = estimate_tokens(output)
+    return {
+        "id": f"chatcmpl-{hashlib.sha1(output.encode('utf-8')).hexdigest()[:24]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "stub"),
+        "choices": [
+            {
+                "index": 0,
+                "message": {**message, "refusal": None},
+                "finish_reason": "tool_calls" if message.get("tool_calls") else "stop",
+            }
+        ],
+        "usage": _usage(prompt_tokens, completion_tokens),
+    }
+
+
+def parse_multipart(content_type: str, data: bytes) -> dict[str, tuple[str | None, bytes]]:
+    """Returns ``name -> (filename, payload)`` for the parts of a multipart/form-data body."""
+    message = BytesParser(policy=HTTP).parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode() + data
+    )
+    return {
+        part.get_param("name", header="content-disposition"): (
+            part.get_filename(),
+            part.get_payload(decode=True) or b"",
+        )
+        for part in message.iter_parts()
+    }
+
+
+def run_batch_lines(
+    lines: list[str], config: StubConfig, endpoint: str
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """Answers the requests of a batch input file; returns (output lines, error lines).
+
+    ``rate_limit_rate`` applies per request: those requests land in the error file with a
+    429 response, like requests the real service gives up on.
+    """
+    outputs: list[dict[str, Any]] = []
+    errors: list[dict[str, Any]] = []
+    for line in lines:
+        request = json.loads(line)
+        result = {
+            "id": f"batch_req_{uuid.uuid4().hex[:24]}",
+            "custom_id": request.get("custom_id"),
+            "error": None,
+        }
+        if request.get("url") != endpoint:
+            status, body = 400, {"error": {"message": f"Wrong url {request.get('url')}"}}
+        elif config.rate_limit_rate > 0 and random.random() < config.rate_limit_rate:
+            status, body = 429, {"error": {"message": "Rate limit exceeded (stub)"}}
+        else:
+            status, body = 200, build_chat_completion(request.get("body") or {}, config)
+        result["response"] = {"status_code": status, "request_id": result["id"], "body": body}
+        (outputs if status == 200 else errors).append(result)
+    return outputs, errors
+
+
+def hashed_embedding(text: str, dim: int) -> list[float]:
+    """Deterministic bag-of-words embedding: shared words produce similar vectors."""
+    vector = [0.0] * dim
+    for token in _TOKEN_RE.findall(text.lower()):
+        digest = hashlib.md5(token.encode("utf-8")).digest()
+        index = int.from_bytes(digest[:4], "little") % dim
+        vector[index] += 1.0 if digest[4] & 1 else -1.0
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Request handler; ``server.config`` holds the StubConfig."""
+
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def config(self) -> StubConfig:
+        return self.server.config  # type: ignore[attr-defined]
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        if self.server.verbose:  # type: ignore[attr-defined]
+            super().log_message(format, *args)
+
+    def _send_json(self, status: int, payload: Any, headers: dict[str, str] | None = None) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_json(self) -> dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _route(self) -> str:
+        path = self.path.split("?", 1)[0].rstrip("/")
+        return path[3:] if path.startswith("/v1/") else path
+
+    def _simulate_latency(self) -> None:
+        delay = self.config.latency_ms + random.uniform(0, self.config.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+
+    def _maybe_rate_limit(self) -> bool:
+        if self.config.rate_limit_rate > 0 and random.random() < self.config.rate_limit_rate:
+            self._send_json(
+                429,
+                {
+                    "error": {
+                        "message": "Rate limit exceeded (stub)",
+                        "type": "rate_limit_error",
+                        "code": "rate_limit_exceeded",
+                    }
+                },
+                headers={"Retry-After": f"{self.config.retry_after_seconds:g}"},
+            )
+            return True
+        return False
+
+    def _throughput_delay(self, completion_tokens: int) -> float:
+        if self.config.tokens_per_second <= 0:
+            return 0.0
+        return completion_tokens / self.config.tokens_per_second
+
+    def _not_found(self) -> None:
+        self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+
+    def do_GET(self) -> None:  # noqa: N802
+        route = self._route()
+        parts = route.strip("/").split("/")
+        if route == "/models":
+            self._send_json(200, {"object": "list", "data": [{"id": "stub", "object": "model"}]})
+        elif parts[0] == "files" and len(parts) in (2, 3):
+            stored = self.server.files.get(parts[1])  # type: ignore[attr-defined]
+            if stored is None:
+                self._not_found()
+            elif len(parts) == 2:
+                self._send_json(200, stored["object"])
+            elif parts[2] == "content":
+                self.send_response(200)
+                self.send_header("Content-Type", "application/octet-stream")
+                self.send_header("Content-Length", str(len(stored["data"])))
+                self.end_headers()
+                self.wfile.write(stored["data"])
+            else:
+                self._not_found()
+        elif parts[0] == "batches" and len(parts) == 2:
+            batch = self.server.batches.get(parts[1])  # type: ignore[attr-defined]
+            if batch is None:
+                self._not_found()
+            else:
+                self._send_json(200, batch)
+        else:
+            self._not_found()
+
+    def do_POST(self) -> None:  # noqa: N802
+        route = self._route()
+        if route == "/files":
+            self._upload_file()
+            return
+        try:
+            body = self._read_json()
+        except json.JSONDecodeError:
+            self._send_json(400, {"error": {"message": "Invalid JSON body"}})
+            return
+
+        parts = route.strip("/").split("/")
+        if route == "/batches":
+            self._create_batch(body)
+        elif parts[0] == "batches" and len(parts) == 3 and parts[2] == "cancel":
+            self._cancel_batch(parts[1])
+        elif route == "/chat/completions":
+            self._simulate_latency()
+            if not self._maybe_rate_limit():
+                self._chat_completion(body)
+        elif route == "/embeddings":
+            self._simulate_latency()
+            if not self._maybe_rate_limit():
+                self._embeddings(body)
+        else:
+            self._not_found()
+
+    def _chat_completion(self, body: dict[str, Any]) -> None:
+        completion = build_chat_completion(body, self.config)
+        completion_tokens = completion["usage"]["completion_tokens"]
+        if body.get("stream"):
+            choice = completion["choices"][0]
+            message = {k: v for k, v in choice["message"].items() if k != "refusal"}
+            self._stream_chat(
+                completion["id"],
+                completion["model"],
+                message,
+                choice["finish_reason"],
+                completion_tokens,
+            )
+            return
+
+        time.sleep(self._throughput_delay(completion_tokens))
+        self._send_json(200, completion)
+
+    def _upload_file(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        fields = parse_multipart(self.headers.get("Content-Type", ""), self.rfile.read(length))
+        if "file" not in fields:
+            self._send_json(400, {"error": {"message": "Missing file part"}})
+            return
+        filename, data = fields["file"]
+        purpose = fields.get("purpose", (None, b"batch"))[1].decode()
+        file_object = self.server.store_file(filename or "upload.jsonl", purpose, data)  # type: ignore[attr-defined]
+        self._send_json(200, file_object)
+
+    def _create_batch(self, body: dict[str, Any]) -> None:
+        stored = self.server.files.get(body.get("input_file_id"))  # type: ignore[attr-defined]
+        if stored is None:
+            self._send_json(400, {"error": {"message": "Unknown input_file_id"}})
+            return
+        now = int(time.time())
+        batch = {
+            "id": f"batch_{uuid.uuid4().hex[:24]}",
+            "object": "batch",
+            "endpoint": body.get("endpoint", "/v1/chat/completions"),
+            "completion_window": body.get("completion_window", "24h"),
+            "input_file_id": body["input_file_id"],
+            "status": "validating",
+            "created_at": now,
+            "expires_at": now + 86400,
+            "output_file_id": None,
+            "error_file_id": None,
+            "request_counts": {"total": 0, "completed": 0, "failed": 0},
+            "metadata": body.get("metadata"),
+        }
+        self.server.batches[batch["id"]] = batch  # type: ignore[attr-defined]
+        threading.Thread(
+            target=self.server.process_batch, args=(batch, stored["data"]), daemon=True  # type: ignore[attr-defined]
+        ).start()
+        self._send_json(200, batch)
+
+    def _cancel_batch(self, batch_id: str) -> None:
+        batch = self.server.batches.get(batch_id)  # type: ignore[attr-defined]
+        if batch is None:
+            self._not_found()
+            return
+        if batch["status"] in ("validating", "in_progress"):
+            batch["status"] = "cancelled"
+            batch["cancelled_at"] = int(time.time())
+        self._send_json(200, batch)
+
+    def _stream_chat(
+        self,
+        completion_id: str,
+        model: str,
+        message: dict[str, Any],
+        finish_reason: str,
+        completion_tokens: int,
+    ) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        def send(delta: dict[str, Any], finish: str | None = None) -> None:
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            self.wfile.flush()
+
+        send({"role": "assistant", "content": ""})
+        pieces: list[dict[str, Any]] = []
+        if message.get("tool_calls"):
+            for index, tool_call in enumerate(message["tool_calls"]):
+                arguments = tool_call["function"]["arguments"]
+                pieces.append(
+                    {
+                        "tool_calls": [
+                            {
+                                "index": index,
+                                "id": tool_call["id"],
+                                "type": "function",
+                                "function": {
+                                    "name": tool_call["function"]["name"],
+                                    "arguments": "",
+                                },
+                            }
+                        ]
+                    }
+                )
+                for start in range(0, len(arguments), 8):
+                    pieces.append(
+                        {
+                            "tool_calls": [
+                                {
+                                    "index": index,
+                                    "function": {"arguments": arguments[start : start + 8]},
+                                }
+                            ]
+                        }
+                    )
+        else:
+            words = re.findall(r"\S+\s*", message["content"] or "")
+            pieces = [{"content": word} for word in words]
+
+        per_piece_delay = self._throughput_delay(completion_tokens) / max(1, len(pieces))
+        for piece in pieces:
+            if per_piece_delay:
+                time.sleep(per_piece_delay)
+            send(piece)
+        send({}, finish_reason)
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+    def _embeddings(self, body: dict[str, Any]) -> None:
+        inputs = body.get("input", [])
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        dim = int(body.get("dimensions") or self.config.embedding_dim)
+        prompt_tokens = sum(estimate_tokens(str(text)) for text in inputs)
+        self._send_json(
+            200,
+            {
+                "object": "list",
+                "model": body.get("model", "stub"),
+                "data": [
+                    {"object": "embedding", "index": i, "embedding": hashed_embedding(str(t), dim)}
+                    for i, t in enumerate(inputs)
+                ],
+                "usage": {"prompt_tokens": prompt_tokens, "total_tokens": prompt_tokens},
+            },
+        )
+
+
+class StubServer(ThreadingHTTPServer):
+    """HTTP server holding the stub configuration and the uploaded files and batches."""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], config: StubConfig, verbose: bool = False):
+        super().__init__(address, StubHandler)
+        self.config = config
+        self.verbose = verbose
+        self.files: dict[str, dict[str, Any]] = {}
+        self.batches: dict[str, dict[str, Any]] = {}
+
+    def store_file(self, filename: str, purpose: str, data: bytes) -> dict[str, Any]:
+        file_object = {
+            "id": f"file-{uuid.uuid4().hex[:24]}",
+            "object": "file",
+            "bytes": len(data),
+            "created_at": int(time.time()),
+            "filename": filename,
+            "purpose": purpose,
+            "status": "processed",
+        }
+        self.files[file_object["id"]] = {"object": file_object, "data": data}
+        return file_object
+
+    def process_batch(self, batch: dict[str, Any], data: bytes) -> None:
+        """Runs a batch in the background: validating -> in_progress -> completed."""
+        lines = [line for line in data.decode("utf-8").splitlines() if line.strip()]
+        batch["request_counts"]["total"] = len(lines)
+        time.sleep(self.config.batch_delay_ms / 2000.0)
+        if batch["status"] == "cancelled":
+            return
+        batch.update(status="in_progress", in_progress_at=int(time.time()))
+        outputs, errors = run_batch_lines(lines, self.config, batch["endpoint"])
+        time.sleep(self.config.batch_delay_ms / 2000.0)
+        if batch["status"] == "cancelled":
+            return
+
+        def jsonl(results: list[dict[str, Any]]) -> bytes:
+            return "".join(json.dumps(r) + "\n" for r in results).encode("utf-8")
+
+        if outputs:
+            batch["output_file_id"] = self.store_file(
+                "output.jsonl", "batch_output", jsonl(outputs)
+            )["id"]
+        if errors:
+            batch["error_file_id"] = self.store_file("errors.jsonl", "batch_output", jsonl(errors))[
+                "id"
+            ]
+        batch["request_counts"].update(completed=len(outputs), failed=len(errors))
+        batch.update(status="completed", completed_at=int(time.time()))
+
+
+def create_server(
+    host: str = "127.0.0.1", port: int = 8089, config: StubConfig | None = None, verbose=False
+) -> StubServer:
+    """Creates (but does not start) a stub server; ``port=0`` picks a free port."""
+    return StubServer((host, port), config or StubConfig(), verbose=verbose)
+
+
+def start_in_thread(config: StubConfig | None = None) -> tuple[StubServer, str]:
+    """Starts a stub server on a free port in a daemon thread and returns it with its base URL."""
+    server = create_server(port=0, config=config)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible stub LLM server")
+
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=8089, help="Port to listen on")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Base latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Random extra latency")
+    parser.add_argument(
+        "--tokens-per-second",
+        type=float,
+        default=0.0,
+        help="Simulated output throughput (0 = instant)",
+    )
+    parser.add_argument(
+        "--rate-limit-rate", type=float, default=0.0, help="Fraction of requests answered with 429"
+    )
+    parser.add_argument(
+        "--retry-after", type=float, default=1.0, help="Retry-After seconds sent with 429s"
+    )
+    parser.add_argument("--embedding-dim", type=int, default=256, help="Embedding dimension")
+    parser.add_argument(
+        "--completion-tokens", type=int, default=200, help="Length of plain text completions"
+    )
+    parser.add_argument(
+        "--batch-delay-ms", type=float, default=200.0, help="Time until a batch completes"
+    )
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+
+    args = parser.parse_args()
+
+    config = StubConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        tokens_per_second=args.tokens_per_second,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after_seconds=args.retry_after,
+        embedding_dim=args.embedding_dim,
+        completion_tokens=args.completion_tokens,
+        batch_delay_ms=args.batch_delay_ms,
+    )
+    server = create_server(args.host, args.port, config, verbose=args.verbose)
+    print(f"Stub LLM server listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Chat completions through the OpenAI Batch API (JSONL upload, poll, download).
+
+A stage's requests are written to one JSONL file, uploaded with ``purpose="batch"``
+and submitted as a single batch. The batch id is recorded under ``pipeline.batch.dir``
+before polling starts, so an interrupted run resumes the same batch instead of paying
+for it twice. Requests that fail inside the batch are resubmitted in a follow-up batch
+up to ``max_attempts`` times.
+"""
+
+import hashlib
+import json
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+# Project root and src on path first so "scripts", "utils" and "core" resolve when run as script
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src"))
+
+from scripts.utils.generation_cache import atomic_write_text
+from scripts.utils.typings import BatchConfig
+from utils.openai_client import get_openai_client
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+@dataclass
+class BatchOutcome:
+    """Chat completion bodies by ``custom_id``, and the error of every request that failed."""
+
+    results: dict[str, dict[str, Any]] = field(default_factory=dict)
+    errors: dict[str, str] = field(default_factory=dict)
+
+
+def message_content(completion: dict[str, Any]) -> str:
+    """Returns the assistant content of a chat completion body from a batch output line.
+
+    Raises:
+        ValueError: If the model refused or the content is empty.
+    """
+    message = completion["choices"][0]["message"]
+    if message.get("refusal"):
+        raise ValueError(f"Model refused: {message['refusal']}")
+    content = (message.get("content") or "").strip()
+    if not content:
+        raise ValueError("Empty content in model output")
+    return content
+
+
+def _requests_hash(requests: dict[str, dict[str, Any]]) -> str:
+    payload = json.dumps(requests, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _submit(stage: str, requests: dict[str, dict[str, Any]], completion_window: str) -> str:
+    lines = "".join(
+        json.dumps(
+            {"custom_id": custom_id, "method": "POST", "url": BATCH_ENDPOINT, "body": body},
+            ensure_ascii=False,
+        )
+        + "\n"
+        for custom_id, body in requests.items()
+    )
+    client = get_openai_client()
+    input_file = client.files.create(
+        file=(f"{stage}.jsonl", lines.encode("utf-8")), purpose="batch"
+    )
+    batch = client.batches.create(
+        input_file_id=input_file.id,
+        endpoint=BATCH_ENDPOINT,
+        completion_window=completion_window,
+        metadata={"stage": stage},
+    )
+    print(f"  Submitted batch {batch.id} ({len(requests)} requests)")
+    return batch.id
+
+
+def _wait(batch_id: str, poll_interval: float) -> Any:
+    client = get_openai_client()
+    last_progress = None
+    while True:
+        batch = client.batches.retrieve(batch_id)
+        counts = batch.request_counts
+        progress = (batch.status, counts.completed if counts else 0, counts.failed if counts else 0)
+        if progress != last_progress:
+            total = counts.total if counts else "?"
+            print(
+                f"  Batch {batch_id}: {progress[0]} ({progress[1]}/{total} done, {progress[2]} failed)"
+            )
+            last_progress = progress
+        if batch.status in TERMINAL_STATUSES:
+            return batch
+        time.sleep(poll_interval)
+
+
+def _read_lines(file_id: str | None) -> list[dict[str, Any]]:
+    if not file_id:
+        return []
+    text = get_openai_client().files.content(file_id).text
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def _collect(batch: Any, custom_ids: set[str], outcome: BatchOutcome) -> None:
+    for line in _read_lines(batch.output_file_id) + _read_lines(batch.error_file_id):
+        custom_id = line.get("custom_id")
+        response = line.get("response") or {}
+        if response.get("status_code") == 200:
+            outcome.results[custom_id] = response["body"]
+            outcome.errors.pop(custom_id, None)
+        else:
+            error = line.get("error") or (response.get("body") or {}).get("error") or {}
+            outcome.errors[custom_id] = (
+                f"HTTP {response.get('status_code')}: {error.get('message', 'unknown error')}"
+            )
+    for custom_id in custom_ids - outcome.results.keys() - outcome.errors.keys():
+        outcome.errors[custom_id] = f"No result (batch {batch.status})"
+
+
+def run_chat_batch(
+    stage: str, requests: dict[str, dict[str, Any]], config: BatchConfig
+) -> BatchOutcome:
+    """Runs chat completion requests as batches and returns their results.
+
+    Args:
+        stage: Name of the generation stage (names the state file and the upload).
+        requests: Chat completion request bodies by ``custom_id``.
+        config: Completion window, poll interval, attempts and state directory.
+
+    Returns:
+        BatchOutcome: Completion bodies of the successful requests and errors of the rest.
+    """
+    outcome = BatchOutcome()
+    state_path = Path(config["dir"]) / f"{stage}.json"
+    pending = dict(requests)
+    for attempt in range(1, config["max_attempts"] + 1):
+        request_hash = _requests_hash(pending)
+        state = json.loads(state_path.read_text(encoding="utf-8")) if state_path.exists() else {}
+        batch_id = state.get("batch_id") if state.get("requests_hash") == request_hash else None
+        if batch_id is not None:
+            print(f"  Resuming batch {batch_id}")
+        else:
+            batch_id = _submit(stage, pending, config["completion_window"])
+            atomic_write_text(
+                state_path, json.dumps({"batch_id": batch_id, "requests_hash": request_hash})
+            )
+
+        batch = _wait(batch_id, config["poll_interval_seconds"])
+        _collect(batch, set(pending), outcome)
+        # Results are in memory now; failed requests go into a new batch, never this one.
+        state_path.unlink(missing_ok=True)
+        pending = {cid: body for cid, body in pending.items() if cid in outcome.errors}
+        if not pending:
+            break
+        if attempt < config["max_attempts"]:
+            print(f"  {len(pending)} requests failed; resubmitting (attempt {attempt + 1})")
+    return outcome
@@ -0,0 +1,136 @@
+"""Streaming HTML document writer with per-section validation.
+
+Sections are checked one at a time as the model returns them (``section_html_error``)
+and either regenerated or repaired (``repair_section_html``) before they reach the
+document. ``DocumentWriter`` appends each accepted section to a temp file next to the
+target, in TOC order even when sections finish out of order, and renames it over the
+target only once every section is written. A failed run never leaves a partial
+document behind. The writer holds only sections that finished ahead of an earlier one;
+how much of the document stays in memory otherwise depends on the section context
+strategy (see SectionContextBuilder).
+"""
+
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+DOCUMENT_HEAD = """<!DOCTYPE html>
+                <html lang="en">
+                <head>
+                    <meta charset="UTF-8">
+                    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+                    <title>{title}</title>
+                </head>
+                <body>
+                    <h1>{title}</h1>
+                    """
+DOCUMENT_TAIL = """
+                </body>
+                </html>"""
+SECTION_SEPARATOR = "\n\n"
+
+
+def section_html_error(section_html: str | None) -> str | None:
+    """Returns why a section fragment is malformed, or None if it is well-formed.
+
+    The fragment is parsed inside a wrapper element with lxml's strict HTML parser
+    (recover=False), the same check ``validate_html`` applies to a whole document.
+    """
+    from lxml import etree
+
+    if not section_html or not section_html.strip():
+        return "empty section"
+    try:
+        parser = etree.HTMLParser(recover=False)
+        etree.fromstring(f"<div>{section_html}</div>".encode(), parser=parser)
+    except (etree.LxmlError, etree.XMLSyntaxError) as e:
+        return str(e)
+    return None
+
+
+def repair_section_html(section_html: str) -> str:
+    """Re-serialises a malformed fragment through lxml's recovering parser.
+
+    Raises:
+        ValueError: If the fragment is empty or still malformed after the repair.
+    """
+    from lxml import html
+
+    if not section_html or not section_html.strip():
+        raise ValueError("Cannot repair an empty section")
+    repaired = "".join(
+        part if isinstance(part, str) else html.tostring(part, encoding="unicode")
+        for part in html.fragments_fromstring(section_html)
+    )
+    error = section_html_error(repaired)
+    if error is not None:
+        raise ValueError(f"Section is still malformed after repair: {error}")
+    return repaired
+
+
+class DocumentWriter:
+    """Streams sections of one HTML document to a temp file and renames it on commit.
+
+    Use as a context manager; leaving the block without ``commit`` deletes the temp file.
+    ``write`` is thread-safe.
+    """
+
+    def __init__(self, path: Path, title: str):
+        self.path = path
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        self._tmp_path = Path(tmp_name)
+        self._file = os.fdopen(fd, "w", encoding="utf-8")
+        self._file.write(DOCUMENT_HEAD.format(title=title))
+        self._pending: dict[int, str] = {}
+        self._next_index = 0
+        self._lock = threading.Lock()
+        self._committed = False
+
+    def __enter__(self) -> "DocumentWriter":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        if not self._committed:
+            self.abort()
+
+    def write(self, index: int, section_html: str) -> list[tuple[int, str]]:
+        """Adds section ``index`` (depth-first TOC order); it is written once all earlier ones are.
+
+        Returns:
+            list[tuple[int, str]]: (index, html) of the sections flushed by this call, in order.
+        """
+        written: list[tuple[int, str]] = []
+        with self._lock:
+            self._pending[index] = section_html
+            while self._next_index in self._pending:
+                section_html = self._pending.pop(self._next_index)
+                if self._next_index > 0:
+                    self._file.write(SECTION_SEPARATOR)
+                self._file.write(section_html)
+                written.append((self._next_index, section_html))
+                self._next_index += 1
+        return written
+
+    def commit(self, section_count: int) -> Path:
+        """Finishes the document and atomically replaces ``path`` with it.
+
+        Raises:
+            ValueError: If fewer than ``section_count`` consecutive sections were written.
+        """
+        with self._lock:
+            if self._next_index != section_count or self._pending:
+                raise ValueError(
+                    f"Document {self.path.name} is incomplete: "
+                    f"{self._next_index}/{section_count} sections written"
+                )
+            self._file.write(DOCUMENT_TAIL)
+            self._file.close()
+            os.replace(self._tmp_path, self.path)
+            self._committed = True
+        return self.path
+
+    def abort(self) -> None:
+        """Discards the temp file; the target is left untouched."""
+        self._file.close()
+        self._tmp_path.unlink(missing_ok=True)
@@ -0,0 +1,141 @@
+"""On-disk section cache and per-document manifests for resumable HTML generation.
+
+Every generated section is stored under a key derived from the exact prompt, model and
+temperature, so a rerun that rebuilds the same prompt gets the section back without an
+API call. A manifest per document records the issue sections chosen for it and the
+status of every section, which keeps prompts reproducible across runs and lets finished
+documents be skipped entirely.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+STATUS_PENDING = "pending"
+STATUS_IN_PROGRESS = "in_progress"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+
+def atomic_write_text(path: Path, content: str) -> None:
+    """Writes a file via a temp file + rename so readers never see a partial write."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def _now() -> str:
+    return datetime.now(UTC).isoformat(timespec="seconds")
+
+
+def hash_json(obj: Any) -> str:
+    """Stable SHA-256 of a JSON-serialisable object."""
+    payload = json.dumps(obj, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+class SectionCache:
+    """Content-addressed store of generated section HTML."""
+
+    def __init__(self, cache_dir: Path):
+        self.root = cache_dir / "sections"
+
+    @staticmethod
+    def key(messages: list[dict], model: str, temperature: float | None) -> str:
+        """Cache key for one section request."""
+        return hash_json({"messages": messages, "model": model, "temperature": temperature})
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.html"
+
+    def get(self, key: str) -> str | None:
+        path = self._path(key)
+        if not path.exists():
+            return None
+        return path.read_text(encoding="utf-8")
+
+    def put(self, key: str, section_html: str) -> None:
+        atomic_write_text(self._path(key), section_html)
+
+
+class DocumentManifest:
+    """Generation status of one document and each of its sections, persisted as JSON."""
+
+    def __init__(self, path: Path, data: dict[str, Any]):
+        self.path = path
+        self.data = data
+
+    @classmethod
+    def load(cls, cache_dir: Path, tool_name: str, document_type: str) -> "DocumentManifest":
+        path = cache_dir / "manifests" / tool_name / f"{document_type}.json"
+        if path.exists():
+            data = json.loads(path.read_text(encoding="utf-8"))
+        else:
+            data = {
+                "tool": tool_name,
+                "document_type": document_type,
+                "status": STATUS_PENDING,
+                "source_hash": None,
+                "issue_sections": None,
+                "sections": [],
+            }
+        return cls(path, data)
+
+    @property
+    def status(self) -> str:
+        return self.data["status"]
+
+    def is_complete(self, source_hash: str) -> bool:
+        """True if the document was fully generated from these exact inputs."""
+        return self.data["status"] == STATUS_DONE and self.data["source_hash"] == source_hash
+
+    def start(
+        self, source_hash: str, section_ids: list[str], issue_sections: dict[int, str]
+    ) -> dict[int, str]:
+        """Marks the document in progress and returns the issue sections (index -> type) to use.
+
+        Issues chosen by an earlier run for the same inputs are kept so the prompts, and
+        therefore the cache keys, are identical on resume.
+        """
+        if self.data["source_hash"] == source_hash and self.data.get("issue_sections"):
+            issue_sections = {int(i): t for i, t in self.data["issue_sections"].items()}
+            sections = self.data["sections"]
+        else:
+            sections = [{"id": section_id, "status": STATUS_PENDING} for section_id in section_ids]
+        self.data.update(
+            {
+                "status": STATUS_IN_PROGRESS,
+                "source_hash": source_hash,
+                "issue_sections": {str(i): t for i, t in sorted(issue_sections.items())},
+                "sections": sections,
+                "started_at": _now(),
+                "error": None,
+            }
+        )
+        self.save()
+        return issue_sections
+
+    def mark_section(self, index: int, status: str) -> None:
+        self.data["sections"][index]["status"] = status
+        self.save()
+
+    def finish(self, output_path: Path) -> None:
+        self.data.update({"status": STATUS_DONE, "output": str(output_path), "finished_at": _now()})
+        self.save()
+
+    def fail(self, error: Exception) -> None:
+        self.data.update({"status": STATUS_FAILED, "error": str(error), "finished_at": _now()})
+        self.save()
+
+    def save(self) -> None:
+        atomic_write_text(self.path, json.dumps(self.data, ensure_ascii=False, indent=2))
@@ -1,6 +1,7 @@
 """Configuration loading utilities for prompts, models, and path constants."""
 
 import sys
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -12,8 +13,19 @@ SRC_DIR = ROOT / "src"
 sys.path.insert(0, str(ROOT))
 sys.path.insert(0, str(SRC_DIR))
 
-from scripts.utils.typings import DatasetConfig, GeneratorConfig
-from src.core.settings import settings
+from core.settings import get_settings
+from scripts.utils.typings import (
+    BatchConfig,
+    CacheConfig,
+    DatasetConfig,
+    GeneratorConfig,
+    PipelineConfig,
+    RateLimitConfig,
+    RetryConfig,
+    SectionContextConfig,
+    SectionScheduleConfig,
+)
+from utils.rate_limiter import RetryPolicy, configure_rate_limits
 
 DATA_DIR = ROOT / "data"
 CONFIG_DIR = ROOT / "config"
@@ -51,6 +63,71 @@ def load_dataset_config() -> DatasetConfig:
     )
 
 
+def load_pipeline_config() -> PipelineConfig:
+    """Loads pipeline execution settings (concurrency, section context and schedule, cache, batch) from generation.yaml"""
+    generation = load_generation()
+    pipeline = generation.get("pipeline", {})
+    section_context = pipeline.get("section_context", {})
+    section_schedule = pipeline.get("section_schedule", {})
+    cache = pipeline.get("cache", {})
+    batch = pipeline.get("batch", {})
+
+    return PipelineConfig(
+        max_workers=max(1, int(pipeline.get("max_workers", 1))),
+        section_context=SectionContextConfig(
+            strategy=section_context.get("strategy", "full"),
+            last_n=int(section_context.get("last_n", 2)),
+            token_budget=int(section_context.get("token_budget", 3000)),
+            digest_chars=int(section_context.get("digest_chars", 240)),
+        ),
+        section_schedule=SectionScheduleConfig(
+            mode=section_schedule.get("mode", "sequential"),
+            sibling_workers=max(1, int(section_schedule.get("sibling_workers", 8))),
+        ),
+        cache=CacheConfig(
+            enabled=bool(cache.get("enabled", True)),
+            dir=str(ROOT / cache.get("dir", ".generation_cache")),
+        ),
+        batch=BatchConfig(
+            enabled=bool(batch.get("enabled", False)),
+            completion_window=str(batch.get("completion_window", "24h")),
+            poll_interval_seconds=float(batch.get("poll_interval_seconds", 30)),
+            max_attempts=max(1, int(batch.get("max_attempts", 3))),
+            dir=str(ROOT / batch.get("dir", ".generation_cache/batches")),
+        ),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_pipeline_config() -> PipelineConfig:
+    """Returns the pipeline settings, loading them from generation.yaml on first use."""
+    return load_pipeline_config()
+
+
+def load_rate_limit_config() -> RateLimitConfig:
+    """Loads per-model rate limits and the retry policy from generation.yaml"""
+    generation = load_generation()
+    rate_limits = generation.get("rate_limits", {})
+    retry = rate_limits.get("retry", {})
+
+    return RateLimitConfig(
+        models=rate_limits.get("models", {}),
+        retry=RetryConfig(
+            max_retries=int(retry.get("max_retries", 6)),
+            base_delay_seconds=float(retry.get("base_delay_seconds", 1.0)),
+            max_delay_seconds=float(retry.get("max_delay_seconds", 60.0)),
+        ),
+    )
+
+
+@lru_cache(maxsize=1)
+def setup_rate_limits() -> RetryPolicy:
+    """Configures the shared per-model rate limiters once and returns the retry policy."""
+    rate_limit_config = load_rate_limit_config()
+    configure_rate_limits(dict(rate_limit_config["models"]))
+    return RetryPolicy(**rate_limit_config["retry"])
+
+
 def load_generator_config(prompt_key: str, model_key: str | None = None) -> GeneratorConfig:
     """Loads configuration for a generator script (prompts and models)."""
     prompts = load_prompts()
@@ -74,6 +151,6 @@ def load_generator_config(prompt_key: str, model_key: str | None = None) -> Gene
         if "temperature" in model_config:
             config["temperature"] = model_config["temperature"]
     else:
-        config["model_name"] = settings.default_model
+        config["model_name"] = get_settings().default_model
 
     return config
@@ -0,0 +1,166 @@
+"""Bounded context for section prompts.
+
+Each section prompt used to carry every previously generated section, so prompt size grew
+with document length. SectionContextBuilder keeps the generated sections and renders a
+bounded view of them according to a strategy:
+
+Only what the strategy can still render is kept: every section for ``full``, the last N
+for ``last_n``, the most recent sections within the budget for ``token_budget``, and for
+``outline_digest`` the titles and digests plus the last N sections.
+
+- ``full``: every previous section (original behaviour, unbounded).
+- ``last_n``: only the last N sections.
+- ``token_budget``: the most recent sections that fit in a token budget.
+- ``outline_digest``: the TOC outline, a one-line digest of each older section and the
+  full HTML of the last N sections.
+
+The ``parallel_siblings`` section schedule generates siblings concurrently, so earlier
+sections are not known yet; ``build_from_parent`` renders the outline and the parent
+section instead.
+"""
+
+import html
+import re
+from collections import deque
+
+from scripts.utils.typings import SectionContextConfig
+from utils.tokens import CHARS_PER_TOKEN, estimate_tokens
+
+CONTEXT_STRATEGIES = ("full", "last_n", "token_budget", "outline_digest")
+
+NO_PREVIOUS_SECTIONS = "(No previous sections)"
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_WHITESPACE_RE = re.compile(r"\s+")
+_HEADING_RE = re.compile(r"<h[1-6][^>]*>.*?</h[1-6]>", re.IGNORECASE | re.DOTALL)
+
+
+def html_to_digest(section_html: str, max_chars: int) -> str:
+    """Returns the leading plain text of a section (heading removed), cut at a word boundary."""
+    text = _HEADING_RE.sub(" ", section_html, count=1)
+    text = html.unescape(_TAG_RE.sub(" ", text))
+    text = _WHITESPACE_RE.sub(" ", text).strip()
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars].rsplit(" ", 1)[0]
+    return f"{cut}…"
+
+
+class SectionContextBuilder:
+    """Collects generated sections of one document and renders the prompt context for the next one."""
+
+    def __init__(self, config: SectionContextConfig, outline: list[tuple[str, int]]):
+        """
+        Args:
+            config: Strategy and limits (see ``pipeline.section_context`` in generation.yaml).
+            outline: (section_title, depth) for every section in depth-first TOC order.
+        """
+        strategy = config["strategy"]
+        if strategy not in CONTEXT_STRATEGIES:
+            raise ValueError(
+                f"Unknown section context strategy '{strategy}'; expected one of {CONTEXT_STRATEGIES}"
+            )
+        self.strategy = strategy
+        self.last_n = max(0, config["last_n"])
+        self.token_budget = max(0, config["token_budget"])
+        self.digest_chars = max(0, config["digest_chars"])
+        self.outline = outline
+        self.count = 0
+        self.sections: deque[str] = deque(
+            maxlen=None if strategy in ("full", "token_budget") else self.last_n
+        )
+        self._section_tokens: deque[int] = deque()
+        self._retained_tokens = 0
+        self.titles: list[str] = []
+        self.digests: list[str] = []
+
+    def add(self, title: str, section_html: str) -> None:
+        """Records a generated section; its digest is computed once here."""
+        self.count += 1
+        self.sections.append(section_html)
+        if self.strategy == "token_budget":
+            self._trim_to_budget(estimate_tokens(section_html))
+        if self.strategy == "outline_digest":
+            self.titles.append(title)
+            self.digests.append(html_to_digest(section_html, self.digest_chars))
+
+    def _trim_to_budget(self, cost: int) -> None:
+        """Drops the oldest sections _within_budget can no longer select (the latest always stays)."""
+        self._section_tokens.append(cost)
+        self._retained_tokens += cost
+        while len(self.sections) > 1 and self._retained_tokens > self.token_budget:
+            self.sections.popleft()
+            self._retained_tokens -= self._section_tokens.popleft()
+
+    def build(self, current_index: int | None = None) -> str:
+        """Renders the context for the section at ``current_index`` (defaults to the next one)."""
+        if current_index is None:
+            current_index = self.count
+
+        if self.strategy == "outline_digest":
+            return self._outline_digest(current_index)
+        if not self.sections:
+            return NO_PREVIOUS_SECTIONS
+        if self.strategy == "last_n":
+            return "\n\n".join(self.sections)
+        if self.strategy == "token_budget":
+            return self._within_budget(self.sections, self.token_budget) or NO_PREVIOUS_SECTIONS
+        return "\n\n".join(self.sections)
+
+    @staticmethod
+    def _within_budget(sections: deque[str], budget: int) -> str:
+        """Joins the most recent sections that fit in ``budget`` tokens.
+
+        If even the latest section is larger than the budget, its tail is kept instead.
+        """
+        selected: list[str] = []
+        used = 0
+        for section_html in reversed(sections):
+            cost = estimate_tokens(section_html)
+            if used + cost > budget:
+                if not selected and budget > 0:
+                    selected.append(section_html[-budget * CHARS_PER_TOKEN :])
+                break
+            selected.append(section_html)
+            used += cost
+        return "\n\n".join(reversed(selected))
+
+    def build_from_parent(self, current_index: int, parent: tuple[str, str] | None = None) -> str:
+        """Renders the outline and the parent section's HTML, independent of the strategy.
+
+        Args:
+            current_index: Depth-first index of the section being generated.
+            parent: (title, html) of the enclosing section; None for top-level sections.
+        """
+        lines = self._outline_lines(current_index)
+        lines.append("")
+        if parent is None:
+            lines.append(f"Parent section (HTML): {NO_PREVIOUS_SECTIONS}")
+        else:
+            lines.append(f"Parent section '{parent[0]}' (HTML):")
+            lines.append(parent[1])
+        return "\n".join(lines)
+
+    def _outline_lines(self, current_index: int) -> list[str]:
+        lines = ["Document outline:"]
+        for i, (title, depth) in enumerate(self.outline):
+            marker = "  <- current section" if i == current_index else ""
+            lines.append(f"{'  ' * depth}- {title}{marker}")
+        return lines
+
+    def _outline_digest(self, current_index: int) -> str:
+        lines = self._outline_lines(current_index)
+
+        recent_start = max(0, self.count - self.last_n)
+        if recent_start > 0:
+            lines.append("")
+            lines.append("Earlier sections (digests):")
+            for title, digest in zip(
+                self.titles[:recent_start], self.digests[:recent_start], strict=True
+            ):
+                lines.append(f"- {title}: {digest}")
+
+        lines.append("")
+        lines.append("Most recent sections (HTML):")
+        lines.append("\n\n".join(self.sections) if self.sections else NO_PREVIOUS_SECTIONS)
+        return "\n".join(lines)
@@ -1,35 +1,75 @@
 import json
 import random
 import sys
-import time
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
-from lxml import etree
-
-# Project root on path first so "scripts" and "src" resolve when run as script
+# Project root and src on path first so "scripts", "utils" and "core" resolve when run as script
 ROOT = Path(__file__).resolve().parents[2]
 sys.path.insert(0, str(ROOT))
-
-from scripts.utils.generation_config import DATA_DIR, load_generator_config
-from src.utils.openai_client import get_openai_client
-
-client = get_openai_client()
-
-config = load_generator_config("section_generation", "section_model")
-SECTION_SYSTEM = config["system"]
-SECTION_USER_TEMPLATE = config["user_template"]
-MODEL_NAME = config["model_name"]
-TEMPERATURE = config["temperature"]
+sys.path.insert(0, str(ROOT / "src"))
+
+from scripts.utils.document_writer import (
+    DOCUMENT_HEAD,
+    DOCUMENT_TAIL,
+    SECTION_SEPARATOR,
+    DocumentWriter,
+    repair_section_html,
+    section_html_error,
+)
+from scripts.utils.generation_cache import (
+    STATUS_DONE,
+    DocumentManifest,
+    SectionCache,
+    atomic_write_text,
+    hash_json,
+)
+from scripts.utils.generation_config import (
+    DATA_DIR,
+    get_pipeline_config,
+    load_generator_config,
+    setup_rate_limits,
+)
+from scripts.utils.section_context import SectionContextBuilder
+from scripts.utils.typings import GeneratorConfig
+from utils.openai_client import get_rate_limited_openai_client
+from utils.rate_limiter import call_with_rate_limit
+from utils.tokens import estimate_message_tokens
 
 # Number of data quality issues to place per document (2-3 total, one per chosen section).
 ISSUES_MIN_PER_DOCUMENT = 2
 ISSUES_MAX_PER_DOCUMENT = 3
 
-# Rate limit: retry 429 after this many seconds; delay between section calls to avoid bursting.
-RATE_LIMIT_WAIT_SECONDS = 90
-DELAY_BETWEEN_SECTIONS_SECONDS = 2
-MAX_RETRIES_ON_RATE_LIMIT = 5
+# Planted issue types and the instruction given to the model for each.
+ISSUE_TYPES = {
+    "contradiction": "a statement that contradicts another statement in the document",
+    "ambiguity": "a statement that can reasonably be read in two different ways",
+    "typo": "a minor spelling mistake",
+    "inconsistent_terminology": "a defined term written differently from the rest of the document",
+}
+
+MAX_SECTION_TOKENS = 1500
+# New requests for a section whose HTML is malformed before it is repaired instead.
+MAX_SECTION_REGENERATIONS = 1
+
+# Values of pipeline.section_schedule.mode (see generation.yaml).
+SECTION_SCHEDULES = ("sequential", "parallel_siblings")
+
+
+@lru_cache(maxsize=1)
+def get_section_config() -> GeneratorConfig:
+    """Section prompts and model settings, loaded on first use."""
+    return load_generator_config("section_generation", "section_model")
+
+
+@lru_cache(maxsize=1)
+def get_section_cache() -> SectionCache | None:
+    """Section response cache, or None when caching is disabled in generation.yaml."""
+    cache = get_pipeline_config()["cache"]
+    return SectionCache(Path(cache["dir"])) if cache["enabled"] else None
 
 
 def _flatten_toc_depth_first(sections: list[dict], depth: int = 0) -> list[tuple[dict, int]]:
@@ -53,93 +93,208 @@ def _pick_issue_section_indices(total_sections: int) -> set[int]:
     return set(random.sample(range(total_sections), target))
 
 
-def call_section_model(
+def _pick_issue_types(section_indices: set[int]) -> dict[int, str]:
+    """Assigns an issue type (a key of ISSUE_TYPES) to every chosen section index."""
+    return {index: random.choice(list(ISSUE_TYPES)) for index in sorted(section_indices)}
+
+
+def issue_manifest_path(tool_folder: Path, document_type: str) -> Path:
+    """Ground-truth manifest of the planted issues, stored next to ``<document_type>.html``."""
+    return tool_folder / f"issues_{document_type}.json"
+
+
+def write_issue_manifest(
+    tool_folder: Path,
+    document_type: str,
+    flattened: list[tuple[dict, int]],
+    issue_sections: dict[int, str],
+) -> Path:
+    """Records which sections received which planted issue (document, section id, issue type)."""
+    issues = [
+        {
+            "section_index": index,
+            "section_id": flattened[index][0].get("id", flattened[index][0]["title"]),
+            "section_title": flattened[index][0]["title"],
+            "issue_type": issue_type,
+        }
+        for index, issue_type in sorted(issue_sections.items())
+    ]
+    path = issue_manifest_path(tool_folder, document_type)
+    manifest = {"tool": tool_folder.name, "document_type": document_type, "issues": issues}
+    atomic_write_text(path, json.dumps(manifest, ensure_ascii=False, indent=2))
+    return path
+
+
+def build_section_messages(
     tool_info: dict,
     document_type: str,
-    previous_html: list[str],
+    previous_html: str,
     section_title: str,
     heading_tag: str = "h2",
-    include_issue_in_this_section: bool = False,
-) -> str | None:
-    """Calls the LLM API to generate HTML for a single section.
+    issue_type: str | None = None,
+) -> list[dict[str, str]]:
+    """Builds the chat messages (system + user prompt) for a single section request.
 
     Args:
         tool_info: Dictionary containing tool metadata
         document_type: Type of document being generated
-        previous_html: List of previously generated HTML sections (for context)
+        previous_html: Context rendered from previously generated sections
         section_title: Title of the section to generate
         heading_tag: HTML heading tag to use (h2, h3, h4, etc.)
-        include_issue_in_this_section: If True, this section must include exactly one data quality issue.
+        issue_type: If set (a key of ISSUE_TYPES), this section must include exactly one issue of that type.
 
     Returns:
-        str: Raw HTML content for the section
+        list[dict[str, str]]: Messages for the chat completion request
     """
-    previous_html_str = "\n\n".join(previous_html) if previous_html else "(No previous sections)"
     data_quality_instruction = (
-        "Include exactly one data quality issue in this section (one of: contradiction, ambiguity, minor typo, or inconsistent terminology). Make it subtle."
-        if include_issue_in_this_section
+        f"Include exactly one data quality issue in this section: {ISSUE_TYPES[issue_type]}. Make it subtle."
+        if issue_type
         else "Do not include any data quality issues in this section; the document's 2-3 issues are placed in other sections."
     )
 
-    user_prompt = SECTION_USER_TEMPLATE.format(
+    config = get_section_config()
+    user_prompt = config["user_template"].format(
         tool_info_json=json.dumps(tool_info, ensure_ascii=False, indent=2),
         document_type=document_type,
-        previous_html=previous_html_str,
+        previous_html=previous_html,
         section_title=section_title,
         heading_tag=heading_tag,
         data_quality_instruction=data_quality_instruction,
     )
 
-    print(f"  Generating section: {section_title}...", end=" ", flush=True)
-    last_error: Exception | None = None
-    for attempt in range(MAX_RETRIES_ON_RATE_LIMIT):
+    return [
+        {"role": "system", "content": config["system"]},
+        {"role": "user", "content": user_prompt},
+    ]
+
+
+def call_section_model(
+    tool_info: dict,
+    document_type: str,
+    previous_html: str,
+    section_title: str,
+    heading_tag: str = "h2",
+    issue_type: str | None = None,
+    prompt_tokens: list[int] | None = None,
+) -> str:
+    """Calls the LLM API to generate HTML for a single section.
+
+    Every response is validated on arrival (section_html_error). Malformed HTML is
+    requested again up to MAX_SECTION_REGENERATIONS times, then repaired with lxml.
+    Accepted sections are stored in the section cache; an identical request (same
+    prompt, model and temperature) is answered from the cache without an API call.
+
+    Args:
+        tool_info: Dictionary containing tool metadata
+        document_type: Type of document being generated
+        previous_html: Context rendered from previously generated sections (see SectionContextBuilder)
+        section_title: Title of the section to generate
+        heading_tag: HTML heading tag to use (h2, h3, h4, etc.)
+        issue_type: If set, the data quality issue type this section must include.
+        prompt_tokens: If given, the prompt token count of this call is appended to it.
+
+    Returns:
+        str: Well-formed HTML content for the section
+
+    Raises:
+        ValueError: If the section is empty or cannot be repaired.
+    """
+    messages = build_section_messages(
+        tool_info=tool_info,
+        document_type=document_type,
+        previous_html=previous_html,
+        section_title=section_title,
+        heading_tag=heading_tag,
+        issue_type=issue_type,
+    )
+    # One line per event: documents may be generated concurrently, so partial lines would interleave.
+    label = f"{tool_info.get('name', '?')} / {document_type}"
+    config = get_section_config()
+    retry_policy = setup_rate_limits()
+    section_cache = get_section_cache()
+
+    def on_retry(attempt: int, delay: float, error: Exception) -> None:
+        print(
+            f"  [{label}] Retrying {section_title} in {delay:.1f}s ({attempt}/{retry_policy.max_retries}): {error}",
+            flush=True,
+        )
+
+    cache_key = None
+    if section_cache is not None:
+        cache_key = SectionCache.key(messages, config["model_name"], config["temperature"])
+        cached_html = section_cache.get(cache_key)
+        # Entries written before sections were validated may be malformed; treat as a miss.
+        if cached_html is not None and section_html_error(cached_html) is None:
+            print(f"  [{label}] ✓ {section_title} (cached)", flush=True)
+            return cached_html
+
+    for attempt in range(MAX_SECTION_REGENERATIONS + 1):
         try:
-            response = client.chat.completions.create(
-                model=MODEL_NAME,
-                messages=[
-                    {"role": "system", "content": SECTION_SYSTEM},
-                    {"role": "user", "content": user_prompt},
-                ],
-                temperature=TEMPERATURE,
-                max_tokens=1500,
-                timeout=120.0,
+            response = call_with_rate_limit(
+                lambda: get_rate_limited_openai_client().chat.completions.create(
+                    model=config["model_name"],
+                    messages=messages,
+                    temperature=config["temperature"],
+                    max_tokens=MAX_SECTION_TOKENS,
+                    timeout=120.0,
+                ),
+                model=config["model_name"],
+                estimated_tokens=estimate_message_tokens(messages) + MAX_SECTION_TOKENS,
+                policy=retry_policy,
+                on_retry=on_retry,
             )
-            print("✓")
-            return response.choices[0].message.content
         except Exception as e:
-            last_error = e
-            err_str = str(e).lower()
-            is_rate_limit = "429" in str(e) or "rate limit" in err_str
-            if is_rate_limit and attempt < MAX_RETRIES_ON_RATE_LIMIT - 1:
-                print(
-                    f"\n  Rate limited, waiting {RATE_LIMIT_WAIT_SECONDS}s before retry ({attempt + 1}/{MAX_RETRIES_ON_RATE_LIMIT})...",
-                    flush=True,
-                )
-                time.sleep(RATE_LIMIT_WAIT_SECONDS)
-            else:
-                print(f"✗ Error: {e}")
-                raise
-    if last_error is not None:
-        raise last_error
+            print(f"  [{label}] ✗ {section_title}: {e}", flush=True)
+            raise
+        usage = getattr(response, "usage", None)
+        used_prompt_tokens = getattr(usage, "prompt_tokens", None)
+        if not isinstance(used_prompt_tokens, int):
+            used_prompt_tokens = estimate_message_tokens(messages)
+        if prompt_tokens is not None:
+            prompt_tokens.append(used_prompt_tokens)
+        content = response.choices[0].message.content
+        error = section_html_error(content)
+        if error is None:
+            print(
+                f"  [{label}] ✓ {section_title} (prompt: {used_prompt_tokens} tokens)", flush=True
+            )
+            break
+        if attempt < MAX_SECTION_REGENERATIONS:
+            print(
+                f"  [{label}] ↻ {section_title}: malformed HTML ({error}), regenerating", flush=True
+            )
+    else:
+        try:
+            content = repair_section_html(content)
+        except ValueError as e:
+            print(f"  [{label}] ✗ {section_title}: {e}", flush=True)
+            raise
+        print(f"  [{label}] ✓ {section_title} (repaired malformed HTML: {error})", flush=True)
+
+    if cache_key is not None:
+        section_cache.put(cache_key, content)
+    return content
 
 
 def generate_section_html(
     tool_info: dict,
     document_type: str,
-    previous_html: list[str],
+    previous_html: str,
     section_title: str,
     depth: int = 0,
-    include_issue_in_this_section: bool = False,
+    issue_type: str | None = None,
+    prompt_tokens: list[int] | None = None,
 ) -> str:
     """Generates HTML for a single section using LLM.
 
     Args:
         tool_info: Dictionary containing tool metadata
         document_type: Type of document being generated
-        previous_html: List of previously generated HTML sections
+        previous_html: Context rendered from previously generated sections
         section_title: Title of the section to generate
         depth: Nesting depth (0 = top-level, 1 = subsection, etc.)
-        include_issue_in_this_section: If True, this section must include exactly one data quality issue.
+        issue_type: If set, the data quality issue type this section must include.
+        prompt_tokens: If given, the prompt token count of this call is appended to it.
 
     Returns:
         str: HTML content for the section
@@ -152,7 +307,8 @@ def generate_section_html(
         previous_html=previous_html,
         section_title=section_title,
         heading_tag=heading_tag,
-        include_issue_in_this_section=include_issue_in_this_section,
+        issue_type=issue_type,
+        prompt_tokens=prompt_tokens,
     )
 
 
@@ -160,30 +316,36 @@ def traverse_toc_and_generate(
     toc: dict[str, Any],
     tool_info: dict,
     document_type: str,
-    accumulated_html: list[str],
+    writer: DocumentWriter,
     section_index: list[int],
-    issue_section_indices: set[int],
+    issue_sections: dict[int, str],
+    context: SectionContextBuilder,
+    prompt_tokens: list[int],
+    manifest: DocumentManifest,
     depth: int = 0,
 ) -> None:
     """Recursively traverses TOC structure and generates HTML for all sections.
-    Modifies accumulated_html in place. section_index is [current 0-based index];
-    issue_section_indices are the indices that must each include one data quality issue (2-3 per document).
+    Each section is passed to writer as soon as it is generated. section_index is [current 0-based index];
+    issue_sections maps the indices that must each include one data quality issue (2-3 per document) to its type.
+    context renders the bounded view of earlier sections passed to each prompt,
+    prompt_tokens collects the prompt size of every call and manifest records each finished section.
     """
     idx = section_index[0]
-    include_issue = idx in issue_section_indices
     section_index[0] += 1
 
     section_html = generate_section_html(
         tool_info=tool_info,
         document_type=document_type,
-        previous_html=accumulated_html.copy(),
+        previous_html=context.build(idx),
         section_title=toc["title"],
         depth=depth,
-        include_issue_in_this_section=include_issue,
+        issue_type=issue_sections.get(idx),
+        prompt_tokens=prompt_tokens,
     )
 
-    accumulated_html.append(section_html)
-    time.sleep(DELAY_BETWEEN_SECTIONS_SECONDS)
+    writer.write(idx, section_html)
+    context.add(toc["title"], section_html)
+    manifest.mark_section(idx, STATUS_DONE)
 
     if "subsections" in toc and toc["subsections"]:
         for subsection in toc["subsections"]:
@@ -191,16 +353,87 @@ def traverse_toc_and_generate(
                 toc=subsection,
                 tool_info=tool_info,
                 document_type=document_type,
-                accumulated_html=accumulated_html,
+                writer=writer,
                 section_index=section_index,
-                issue_section_indices=issue_section_indices,
+                issue_sections=issue_sections,
+                context=context,
+                prompt_tokens=prompt_tokens,
+                manifest=manifest,
                 depth=depth + 1,
             )
 
 
+def generate_sections_parallel(
+    toc_sections: list[dict],
+    flattened: list[tuple[dict, int]],
+    tool_info: dict,
+    document_type: str,
+    issue_sections: dict[int, str],
+    context: SectionContextBuilder,
+    writer: DocumentWriter,
+    prompt_tokens: list[int],
+    manifest: DocumentManifest,
+    max_workers: int,
+) -> None:
+    """Generates all sections of a document, fanning out siblings once their parent is done.
+
+    Top-level sections start together; every finished section submits its subsections,
+    each prompted with the outline and the parent's HTML (context.build_from_parent).
+    A document therefore needs about as many round trips as its TOC is deep. Sections go
+    to writer as they finish; writer restores TOC order and every section it flushes is
+    added to ``context`` in that order. A section's HTML is only held until it is written
+    and, for a parent, until its subsections have been generated.
+
+    Args:
+        toc_sections: Top-level TOC sections (with nested "subsections").
+        flattened: Output of _flatten_toc_depth_first for the same sections.
+        max_workers: Concurrent section requests for this document.
+        (Other arguments as in traverse_toc_and_generate.)
+    """
+    index_of = {id(section): index for index, (section, _) in enumerate(flattened)}
+    # Serialises writer flushes with context.add (TOC order) and manifest file rewrites.
+    lock = threading.Lock()
+
+    def generate(section: dict, depth: int, parent: tuple[str, str] | None) -> tuple[dict, str]:
+        idx = index_of[id(section)]
+        section_html = generate_section_html(
+            tool_info=tool_info,
+            document_type=document_type,
+            previous_html=context.build_from_parent(idx, parent),
+            section_title=section["title"],
+            depth=depth,
+            issue_type=issue_sections.get(idx),
+            prompt_tokens=prompt_tokens,
+        )
+        with lock:
+            for written_index, written_html in writer.write(idx, section_html):
+                context.add(flattened[written_index][0]["title"], written_html)
+            manifest.mark_section(idx, STATUS_DONE)
+        return section, section_html
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        pending = {executor.submit(generate, section, 0, None): 0 for section in toc_sections}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                depth = pending.pop(future)
+                section, section_html = future.result()
+                for subsection in section.get("subsections") or []:
+                    child = executor.submit(
+                        generate, subsection, depth + 1, (section["title"], section_html)
+                    )
+                    pending[child] = depth + 1
+    finally:
+        # On failure, drop queued sections instead of generating the rest of the document.
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
 def assemble_html_document(title: str, sections_html: list[str]) -> str:
     """Assembles individual section HTML into a complete valid HTML document.
 
+    Produces the same document DocumentWriter streams to disk section by section.
+
     Args:
         title: Document title
         sections_html: List of HTML strings for each section
@@ -208,22 +441,7 @@ def assemble_html_document(title: str, sections_html: list[str]) -> str:
     Returns:
         str: Complete HTML document
     """
-    sections_content = "\n\n".join(sections_html)
-
-    html_doc = f"""<!DOCTYPE html>
-                <html lang="en">
-                <head>
-                    <meta charset="UTF-8">
-                    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-                    <title>{title}</title>
-                </head>
-                <body>
-                    <h1>{title}</h1>
-                    {sections_content}
-                </body>
-                </html>"""
-
-    return html_doc
+    return DOCUMENT_HEAD.format(title=title) + SECTION_SEPARATOR.join(sections_html) + DOCUMENT_TAIL
 
 
 def validate_html(html_content: str) -> bool:
@@ -233,6 +451,8 @@ def validate_html(html_content: str) -> bool:
     (e.g. <div><span></div></span>) or unclosed tags raise and are reported.
     The stdlib HTMLParser is fault-tolerant by design and does not catch these.
     """
+    from lxml import etree
+
     try:
         parser = etree.HTMLParser(recover=False)
         etree.fromstring(html_content.encode("utf-8"), parser=parser)
@@ -241,12 +461,21 @@ def validate_html(html_content: str) -> bool:
         return False
 
 
-def generate_document_html(tool_folder: Path, document_type: str) -> None:
+def generate_document_html(
+    tool_folder: Path, document_type: str, schedule: str | None = None
+) -> None:
     """Generates HTML document for a specific tool and document type.
 
+    Progress is tracked in a per-document manifest: a document already generated from the
+    same inputs is skipped, and a document that failed midway is resumed (finished sections
+    come back from the section cache). Sections are validated as they arrive and streamed
+    to a temp file that replaces ``<document_type>.html`` only when the document is complete.
+
     Args:
         tool_folder: Path to the tool's directory
         document_type: Type of document to generate
+        schedule: "sequential" or "parallel_siblings" (see SECTION_SCHEDULES). Defaults to
+            ``pipeline.section_schedule.mode`` from generation.yaml.
     """
     tool_info_path = tool_folder / "tool_info.json"
     if not tool_info_path.exists():
@@ -262,46 +491,102 @@ def generate_document_html(tool_folder: Path, document_type: str) -> None:
 
     toc = json.loads(toc_path.read_text(encoding="utf-8"))
 
+    html_path = tool_folder / f"{document_type}.html"
+    config = get_section_config()
+    pipeline_config = get_pipeline_config()
+    schedule = schedule or pipeline_config["section_schedule"]["mode"]
+    if schedule not in SECTION_SCHEDULES:
+        raise ValueError(
+            f"Unknown section schedule '{schedule}'; expected one of {SECTION_SCHEDULES}"
+        )
+    source_hash = hash_json(
+        {
+            "toc": toc,
+            "tool_info": tool_info["description"],
+            "model": config["model_name"],
+            "temperature": config["temperature"],
+            "system": config["system"],
+            "user_template": config["user_template"],
+            "section_context": pipeline_config["section_context"],
+            # The schedule changes what each prompt sees, hence the generated sections.
+            "section_schedule": schedule,
+        }
+    )
+    manifest = DocumentManifest.load(
+        Path(pipeline_config["cache"]["dir"]), tool_folder.name, document_type
+    )
+    if manifest.is_complete(source_hash) and html_path.exists():
+        print(f"Skipping {tool_folder.name} / {document_type} (already generated)")
+        return
+
     flattened = _flatten_toc_depth_first(toc["sections"])
     total_sections = len(flattened)
-    issue_section_indices = _pick_issue_section_indices(total_sections)
+    issue_sections = manifest.start(
+        source_hash,
+        section_ids=[section.get("id", section["title"]) for section, _ in flattened],
+        issue_sections=_pick_issue_types(_pick_issue_section_indices(total_sections)),
+    )
 
     print(
-        f"Generating HTML for {tool_folder.name} / {document_type} ... ({total_sections} sections, {len(issue_section_indices)} with data quality issues)"
+        f"Generating HTML for {tool_folder.name} / {document_type} ... ({total_sections} sections, {len(issue_sections)} with data quality issues)"
     )
 
-    sections_html = []
+    context = SectionContextBuilder(
+        pipeline_config["section_context"],
+        outline=[(section["title"], depth) for section, depth in flattened],
+    )
     section_index = [0]
-    for section in toc["sections"]:
-        traverse_toc_and_generate(
-            toc=section,
-            tool_info=tool_info["description"],
-            document_type=document_type,
-            accumulated_html=sections_html,
-            section_index=section_index,
-            issue_section_indices=issue_section_indices,
-            depth=0,
+    prompt_tokens: list[int] = []
+    try:
+        with DocumentWriter(html_path, toc["title"]) as writer:
+            if schedule == "parallel_siblings":
+                generate_sections_parallel(
+                    toc_sections=toc["sections"],
+                    flattened=flattened,
+                    tool_info=tool_info["description"],
+                    document_type=document_type,
+                    issue_sections=issue_sections,
+                    context=context,
+                    writer=writer,
+                    prompt_tokens=prompt_tokens,
+                    manifest=manifest,
+                    max_workers=pipeline_config["section_schedule"]["sibling_workers"],
+                )
+            else:
+                for section in toc["sections"]:
+                    traverse_toc_and_generate(
+                        toc=section,
+                        tool_info=tool_info["description"],
+                        document_type=document_type,
+                        writer=writer,
+                        section_index=section_index,
+                        issue_sections=issue_sections,
+                        context=context,
+                        prompt_tokens=prompt_tokens,
+                        manifest=manifest,
+                        depth=0,
+                    )
+            writer.commit(total_sections)
+    except Exception as e:
+        manifest.fail(e)
+        raise
+
+    if prompt_tokens:
+        print(
+            f"Prompt tokens for {tool_folder.name} / {document_type} "
+            f"({context.strategy if schedule == 'sequential' else schedule} context): "
+            f"total {sum(prompt_tokens)}, mean {sum(prompt_tokens) // len(prompt_tokens)}, "
+            f"max {max(prompt_tokens)}"
         )
 
-    html_document = assemble_html_document(toc["title"], sections_html)
-
-    if not validate_html(html_document):
-        print(f"Warning: Generated HTML for {tool_folder.name} / {document_type} may be malformed")
+    issues_path = write_issue_manifest(tool_folder, document_type, flattened, issue_sections)
+    manifest.finish(html_path)
+    print(f"Saved HTML: {html_path} (planted issues: {issues_path.name})")
 
-    html_path = tool_folder / f"{document_type}.html"
-    html_path.write_text(html_document, encoding="utf-8")
-    print(f"Saved HTML: {html_path}")
-
-
-def generate_all_sections() -> None:
-    """Main function that iterates through all tool folders and generates HTML files for each document type.
 
-    Processes all tool directories in the data folder, reads their tool_info.json files and TOC files,
-    and generates HTML documents section by section. The generated HTML files are validated before
-    being saved.
-
-    Generated HTML files are saved as `{document_type}.html` in each tool's directory.
-    """
+def _collect_document_jobs() -> list[tuple[Path, str]]:
+    """Returns (tool_folder, document_type) pairs for every document listed in tool_info.json files."""
+    jobs: list[tuple[Path, str]] = []
     for tool_folder in sorted(DATA_DIR.iterdir()):
         if not tool_folder.is_dir():
             continue
@@ -317,9 +602,57 @@ def generate_all_sections() -> None:
             print(f"No document_types for {tool_folder.name}, skipping")
             continue
 
-        for doc in docs:
+        jobs.extend((tool_folder, doc) for doc in docs)
+    return jobs
+
+
+def generate_all_sections(max_workers: int | None = None, schedule: str | None = None) -> None:
+    """Main function that iterates through all tool folders and generates HTML files for each document type.
+
+    Processes all tool directories in the data folder, reads their tool_info.json files and TOC files,
+    and generates HTML documents section by section. Each section is validated (and regenerated
+    or repaired) as it arrives, before it is written.
+
+    Documents are independent of each other, so up to ``max_workers`` of them are generated
+    concurrently in a thread pool. Sections inside one document run in order, each prompted with
+    the previously generated HTML, unless the ``parallel_siblings`` schedule is selected.
+
+    Generated HTML files are saved as `{document_type}.html` in each tool's directory.
+
+    Args:
+        max_workers: Number of documents generated in parallel. Defaults to
+            ``pipeline.max_workers`` from generation.yaml; 1 runs sequentially.
+        schedule: Section schedule inside each document (see generate_document_html).
+    """
+    if max_workers is None:
+        max_workers = get_pipeline_config()["max_workers"]
+
+    jobs = _collect_document_jobs()
+    if not jobs:
+        return
+
+    if max_workers <= 1:
+        for tool_folder, doc in jobs:
+            try:
+                generate_document_html(tool_folder, doc, schedule)
+            except Exception as e:
+                print(f"Failed to generate HTML for {tool_folder.name} / {doc}: {e}")
+        return
+
+    workers = min(max_workers, len(jobs))
+    print(f"Generating {len(jobs)} documents with {workers} workers...")
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(generate_document_html, tool_folder, doc, schedule): (
+                tool_folder,
+                doc,
+            )
+            for tool_folder, doc in jobs
+        }
+        for future in as_completed(futures):
+            tool_folder, doc = futures[future]
             try:
-                generate_document_html(tool_folder, doc)
+                future.result()
             except Exception as e:
                 print(f"Failed to generate HTML for {tool_folder.name} / {doc}: {e}")
 
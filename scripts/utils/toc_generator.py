@@ -1,24 +1,48 @@
 import json
 import sys
+from functools import lru_cache
 from pathlib import Path
 
 from jsonschema import ValidationError, validate
 
-# Project root on path first so "scripts" and "src" resolve when run as script
+# Project root and src on path first so "scripts", "utils" and "core" resolve when run as script
 ROOT = Path(__file__).resolve().parents[2]
 sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src"))
 
 from scripts.utils.constants import TOC_RESPONSE_FORMAT, TOC_SCHEMA
-from scripts.utils.generation_config import DATA_DIR, load_generator_config
-from src.utils.openai_client import get_openai_client
-
-client = get_openai_client()
-
-config = load_generator_config("toc_generation", "toc_model")
-TOC_SYSTEM = config["system"]
-TOC_USER_TEMPLATE = config["user_template"]
-MODEL_NAME = config["model_name"]
-TEMPERATURE = config["temperature"]
+from scripts.utils.generation_config import (
+    DATA_DIR,
+    get_pipeline_config,
+    load_generator_config,
+    setup_rate_limits,
+)
+from scripts.utils.typings import GeneratorConfig
+from utils.openai_client import get_rate_limited_openai_client
+from utils.rate_limiter import call_with_rate_limit
+from utils.tokens import estimate_message_tokens
+
+# Typical size of a nested TOC response, reserved from the tokens-per-minute quota.
+EXPECTED_TOC_TOKENS = 800
+
+
+@lru_cache(maxsize=1)
+def get_toc_config() -> GeneratorConfig:
+    """TOC prompts and model settings, loaded on first use."""
+    return load_generator_config("toc_generation", "toc_model")
+
+
+def build_toc_messages(tool_info: dict, document_type: str) -> list[dict[str, str]]:
+    """Builds the chat messages (system + user prompt) for a TOC request."""
+    config = get_toc_config()
+    user_prompt = config["user_template"].format(
+        tool_info_json=json.dumps(tool_info, ensure_ascii=False, indent=2),
+        document_type=document_type,
+    )
+    return [
+        {"role": "system", "content": config["system"]},
+        {"role": "user", "content": user_prompt},
+    ]
 
 
 def call_toc_model(tool_info: dict, document_type: str) -> dict:
@@ -37,18 +61,18 @@ def call_toc_model(tool_info: dict, document_type: str) -> dict:
     Raises:
         ValueError: If the model refused or content is missing.
     """
-    user_prompt = TOC_USER_TEMPLATE.format(
-        tool_info_json=json.dumps(tool_info, ensure_ascii=False, indent=2),
-        document_type=document_type,
-    )
-    response = client.chat.completions.create(
-        model=MODEL_NAME,
-        messages=[
-            {"role": "system", "content": TOC_SYSTEM},
-            {"role": "user", "content": user_prompt},
-        ],
-        temperature=TEMPERATURE,
-        response_format=TOC_RESPONSE_FORMAT,
+    config = get_toc_config()
+    messages = build_toc_messages(tool_info, document_type)
+    response = call_with_rate_limit(
+        lambda: get_rate_limited_openai_client().chat.completions.create(
+            model=config["model_name"],
+            messages=messages,
+            temperature=config["temperature"],
+            response_format=TOC_RESPONSE_FORMAT,
+        ),
+        model=config["model_name"],
+        estimated_tokens=estimate_message_tokens(messages) + EXPECTED_TOC_TOKENS,
+        policy=setup_rate_limits(),
     )
     message = response.choices[0].message
     if getattr(message, "refusal", None):
@@ -81,20 +105,9 @@ def validate_and_save_toc(toc_obj: dict, out_path: Path) -> dict:
     return toc_obj
 
 
-def generate_all_tocs() -> None:
-    """Main function that iterates through all tool folders and generates TOC files for each document type.
-
-    Processes all tool directories in the data folder, reads their tool_info.json files,
-    and generates Table of Contents (TOC) JSON files for each document type specified
-    in the tool's configuration. The generated TOC files are validated against TOC_SCHEMA
-    before being saved.
-
-    The function will skip tool folders that:
-    - Don't contain a tool_info.json file
-    - Don't have any document_types specified
-
-    Generated TOC files are saved as `toc_{document_type}.json` in each tool's directory.
-    """
+def _toc_jobs() -> list[tuple[Path, dict, str]]:
+    """Returns ``(tool_folder, tool_info, document_type)`` for every TOC to generate."""
+    jobs = []
     for tool_folder in sorted(DATA_DIR.iterdir()):
         if not tool_folder.is_dir():
             continue
@@ -108,15 +121,70 @@ def generate_all_tocs() -> None:
             print(f"No document_types for {tool_folder}, skipping")
             continue
 
-        for doc in docs:
-            out_file = tool_folder / f"toc_{doc}.json"
-            print(f"Generating TOC for {tool_folder.name} / {doc} ...")
-            try:
-                toc_obj = call_toc_model(tool_info, doc)
-                validate_and_save_toc(toc_obj, out_file)
-                print(f"Saved TOC: {out_file}")
-            except (ValueError, json.JSONDecodeError) as e:
-                print(f"Failed to generate or save TOC for {tool_folder.name} / {doc}: {e}")
+        jobs.extend((tool_folder, tool_info, doc) for doc in docs)
+    return jobs
+
+
+def generate_all_tocs_batch(jobs: list[tuple[Path, dict, str]]) -> None:
+    """Generates the TOCs with one Batch API request per document (see batch_client)."""
+    from scripts.utils.batch_client import message_content, run_chat_batch
+
+    config = get_toc_config()
+    requests = {
+        f"{tool_folder.name}/{doc}": {
+            "model": config["model_name"],
+            "messages": build_toc_messages(tool_info, doc),
+            "temperature": config["temperature"],
+            "response_format": TOC_RESPONSE_FORMAT,
+        }
+        for tool_folder, tool_info, doc in jobs
+    }
+    print(f"Generating {len(requests)} TOCs in batch mode...")
+    outcome = run_chat_batch("tocs", requests, get_pipeline_config()["batch"])
+    for tool_folder, _, doc in jobs:
+        custom_id = f"{tool_folder.name}/{doc}"
+        out_file = tool_folder / f"toc_{doc}.json"
+        try:
+            if custom_id in outcome.errors:
+                raise ValueError(outcome.errors[custom_id])
+            toc_obj = json.loads(message_content(outcome.results[custom_id]))
+            validate_and_save_toc(toc_obj, out_file)
+            print(f"Saved TOC: {out_file}")
+        except (ValueError, json.JSONDecodeError) as e:
+            print(f"Failed to generate or save TOC for {custom_id}: {e}")
+
+
+def generate_all_tocs(batch: bool | None = None) -> None:
+    """Main function that iterates through all tool folders and generates TOC files for each document type.
+
+    Processes all tool directories in the data folder, reads their tool_info.json files,
+    and generates Table of Contents (TOC) JSON files for each document type specified
+    in the tool's configuration. The generated TOC files are validated against TOC_SCHEMA
+    before being saved.
+
+    The function will skip tool folders that:
+    - Don't contain a tool_info.json file
+    - Don't have any document_types specified
+
+    Generated TOC files are saved as `toc_{document_type}.json` in each tool's directory.
+
+    Args:
+        batch: Submit all requests as one batch (default: ``pipeline.batch.enabled``).
+    """
+    jobs = _toc_jobs()
+    if batch if batch is not None else get_pipeline_config()["batch"]["enabled"]:
+        generate_all_tocs_batch(jobs)
+        return
+
+    for tool_folder, tool_info, doc in jobs:
+        out_file = tool_folder / f"toc_{doc}.json"
+        print(f"Generating TOC for {tool_folder.name} / {doc} ...")
+        try:
+            toc_obj = call_toc_model(tool_info, doc)
+            validate_and_save_toc(toc_obj, out_file)
+            print(f"Saved TOC: {out_file}")
+        except (ValueError, json.JSONDecodeError) as e:
+            print(f"Failed to generate or save TOC for {tool_folder.name} / {doc}: {e}")
 
 
 if __name__ == "__main__":
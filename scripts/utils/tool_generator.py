@@ -1,31 +1,44 @@
 import json
 import random
 import sys
+from functools import lru_cache
 from pathlib import Path
 
-# Project root on path first so "scripts" and "src" resolve when run as script
+from jsonschema import ValidationError, validate
+
+# Project root and src on path first so "scripts", "utils" and "core" resolve when run as script
 ROOT = Path(__file__).resolve().parents[2]
 sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src"))
 
 from scripts.utils.constants import TOOL_INFO_RESPONSE_FORMAT
-from scripts.utils.generation_config import DATA_DIR, load_dataset_config, load_generator_config
-from src.utils.openai_client import get_openai_client
+from scripts.utils.generation_cache import atomic_write_text
+from scripts.utils.generation_config import (
+    DATA_DIR,
+    get_pipeline_config,
+    load_dataset_config,
+    load_generator_config,
+    setup_rate_limits,
+)
+from scripts.utils.typings import DatasetConfig, GeneratorConfig
+from utils.openai_client import get_rate_limited_openai_client
+from utils.rate_limiter import call_with_rate_limit
+from utils.tokens import estimate_message_tokens
+
+# Typical size of a tool_info response, reserved from the tokens-per-minute quota.
+EXPECTED_TOOL_INFO_TOKENS = 150
+
 
-client = get_openai_client()
+@lru_cache(maxsize=1)
+def get_dataset_config() -> DatasetConfig:
+    """Dataset settings (categories, user bases, document types), loaded on first use."""
+    return load_dataset_config()
 
-# Load dataset config
-dataset_config = load_dataset_config()
-CATEGORIES = dataset_config["categories"]
-USER_BASES = dataset_config["user_bases"]
-DOCUMENT_TYPES = dataset_config["document_types"]
-NUMBER_OF_TOOLS = dataset_config["number_of_tools"]
-DOCS_PER_TOOL = dataset_config["docs_per_tool"]
 
-config = load_generator_config("tool_info_generation", "ideation_model")
-SYSTEM = config["system"]
-USER_TEMPLATE = config["user_template"]
-MODEL_NAME = config["model_name"]
-TEMPERATURE = config["temperature"]
+@lru_cache(maxsize=1)
+def get_tool_info_config() -> GeneratorConfig:
+    """Tool info prompts and model settings, loaded on first use."""
+    return load_generator_config("tool_info_generation", "ideation_model")
 
 
 def sanitize_folder_name(tool_name: str) -> str:
@@ -42,6 +55,34 @@ def sanitize_folder_name(tool_name: str) -> str:
     return sanitized
 
 
+def build_tool_info_messages(category: str, user_base: str) -> list[dict[str, str]]:
+    """Builds the chat messages (system + user prompt) for a tool info request."""
+    config = get_tool_info_config()
+    user_prompt = config["user_template"].format(
+        name="<generate_creative_name>", category=category, user_base=user_base
+    )
+    return [
+        {"role": "system", "content": config["system"]},
+        {"role": "user", "content": user_prompt},
+    ]
+
+
+def parse_tool_info(content: str) -> dict:
+    """Parses a tool info response and validates it against TOOL_INFO_RESPONSE_FORMAT.
+
+    Raises:
+        ValueError: If the content is not valid JSON or does not match the schema.
+    """
+    try:
+        description = json.loads(content)
+        validate(instance=description, schema=TOOL_INFO_RESPONSE_FORMAT["json_schema"]["schema"])
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Tool info is not valid JSON: {e}") from e
+    except ValidationError as e:
+        raise ValueError(f"Tool info failed schema validation: {e.message}") from e
+    return description
+
+
 def generate_tool_info_with_name(category: str, user_base: str) -> dict:
     """Calls the LLM API to generate tool info (including creative name) using structured outputs.
 
@@ -58,15 +99,18 @@ def generate_tool_info_with_name(category: str, user_base: str) -> dict:
     Raises:
         ValueError: If the model refused or content is missing/invalid.
     """
-    user_prompt = USER_TEMPLATE.format(
-        name="<generate_creative_name>", category=category, user_base=user_base
-    )
-
-    response = client.chat.completions.create(
-        model=MODEL_NAME,
-        messages=[{"role": "system", "content": SYSTEM}, {"role": "user", "content": user_prompt}],
-        response_format=TOOL_INFO_RESPONSE_FORMAT,
-        temperature=TEMPERATURE,
+    config = get_tool_info_config()
+    messages = build_tool_info_messages(category, user_base)
+    response = call_with_rate_limit(
+        lambda: get_rate_limited_openai_client().chat.completions.create(
+            model=config["model_name"],
+            messages=messages,
+            response_format=TOOL_INFO_RESPONSE_FORMAT,
+            temperature=config["temperature"],
+        ),
+        model=config["model_name"],
+        estimated_tokens=estimate_message_tokens(messages) + EXPECTED_TOOL_INFO_TOKENS,
+        policy=setup_rate_limits(),
     )
 
     message = response.choices[0].message
@@ -75,24 +119,23 @@ def generate_tool_info_with_name(category: str, user_base: str) -> dict:
     content = (message.content or "").strip()
     if not content:
         raise ValueError("Empty content in model output")
-    return json.loads(content)
-
-
-def generate_tool() -> None:
-    """Generates a tool with creative name, folder, and info file.
-
-    Creates:
-    - Folder: data/{sanitized_tool_name}/
-    - File: data/{sanitized_tool_name}/tool_info.json
+    return parse_tool_info(content)
+
+
+def pick_tool_plan() -> dict:
+    """Randomly picks the category, user base and document types of a new tool."""
+    dataset_config = get_dataset_config()
+    return {
+        "category": random.choice(dataset_config["categories"]),
+        "user_base": random.choice(dataset_config["user_bases"]),
+        "document_types": random.sample(
+            dataset_config["document_types"], dataset_config["docs_per_tool"]
+        ),
+    }
 
-    Args:
-        tool_index: Index for fallback naming if generation fails.
-    """
-    category = random.choice(CATEGORIES)
-    user_base = random.choice(USER_BASES)
-    document_types = random.sample(DOCUMENT_TYPES, DOCS_PER_TOOL)
 
-    description = generate_tool_info_with_name(category, user_base)
+def save_tool(description: dict, document_types: list[str]) -> Path:
+    """Creates ``data/{sanitized_tool_name}/tool_info.json`` and returns the tool folder."""
     tool_name = description["name"]
 
     # Sanitize the tool name for the folder
@@ -113,10 +156,67 @@ def generate_tool() -> None:
     tool_info_path.write_text(json.dumps(tool_info, indent=2), encoding="utf-8")
 
     print(f"✓ Created {tool_folder.name}/tool_info.json")
+    return tool_folder
 
 
-def generate_tools() -> None:
-    for i in range(NUMBER_OF_TOOLS):
+def generate_tool() -> None:
+    """Generates a tool with creative name, folder, and info file.
+
+    Creates:
+    - Folder: data/{sanitized_tool_name}/
+    - File: data/{sanitized_tool_name}/tool_info.json
+    """
+    plan = pick_tool_plan()
+    description = generate_tool_info_with_name(plan["category"], plan["user_base"])
+    save_tool(description, plan["document_types"])
+
+
+def generate_tools_batch() -> None:
+    """Generates all tools with one Batch API request per tool (see batch_client).
+
+    The random picks are stored next to the batch state, so a resumed run asks for
+    the same tools and reuses the batch already submitted.
+    """
+    from scripts.utils.batch_client import message_content, run_chat_batch
+
+    batch_config = get_pipeline_config()["batch"]
+    plan_path = Path(batch_config["dir"]) / "tools_plan.json"
+    if plan_path.exists():
+        plans = json.loads(plan_path.read_text(encoding="utf-8"))
+    else:
+        plans = [pick_tool_plan() for _ in range(get_dataset_config()["number_of_tools"])]
+        atomic_write_text(plan_path, json.dumps(plans, indent=2))
+
+    config = get_tool_info_config()
+    requests = {
+        f"tool-{i}": {
+            "model": config["model_name"],
+            "messages": build_tool_info_messages(plan["category"], plan["user_base"]),
+            "response_format": TOOL_INFO_RESPONSE_FORMAT,
+            "temperature": config["temperature"],
+        }
+        for i, plan in enumerate(plans)
+    }
+    print(f"Generating {len(requests)} tools in batch mode...")
+    outcome = run_chat_batch("tools", requests, batch_config)
+    for i, plan in enumerate(plans):
+        custom_id = f"tool-{i}"
+        try:
+            if custom_id in outcome.errors:
+                raise ValueError(outcome.errors[custom_id])
+            description = parse_tool_info(message_content(outcome.results[custom_id]))
+            save_tool(description, plan["document_types"])
+        except (ValueError, KeyError) as e:
+            print(f"✗ Failed to generate Tool {i}: {e}")
+    plan_path.unlink(missing_ok=True)
+
+
+def generate_tools(batch: bool | None = None) -> None:
+    """Generates ``dataset.num_tools`` tools, in batch mode when ``batch`` (default: pipeline.batch.enabled)."""
+    if batch if batch is not None else get_pipeline_config()["batch"]["enabled"]:
+        generate_tools_batch()
+        return
+    for i in range(get_dataset_config()["number_of_tools"]):
         try:
             print(f"Generating Tool {i + 1}...")
             generate_tool()
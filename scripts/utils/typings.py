@@ -14,3 +14,52 @@ class DatasetConfig(TypedDict):
     document_types: list[str]
     number_of_tools: int
     docs_per_tool: int
+
+
+class SectionContextConfig(TypedDict):
+    strategy: str
+    last_n: int
+    token_budget: int
+    digest_chars: int
+
+
+class SectionScheduleConfig(TypedDict):
+    mode: str
+    sibling_workers: int
+
+
+class CacheConfig(TypedDict):
+    enabled: bool
+    dir: str
+
+
+class BatchConfig(TypedDict):
+    enabled: bool
+    completion_window: str
+    poll_interval_seconds: float
+    max_attempts: int
+    dir: str
+
+
+class PipelineConfig(TypedDict):
+    max_workers: int
+    section_context: SectionContextConfig
+    section_schedule: SectionScheduleConfig
+    cache: CacheConfig
+    batch: BatchConfig
+
+
+class ModelRateLimit(TypedDict, total=False):
+    requests_per_minute: int
+    tokens_per_minute: int
+
+
+class RetryConfig(TypedDict):
+    max_retries: int
+    base_delay_seconds: float
+    max_delay_seconds: float
+
+
+class RateLimitConfig(TypedDict):
+    models: dict[str, ModelRateLimit]
+    retry: RetryConfig
@@ -0,0 +1,200 @@
+"""
+Semantic cache of chatbot answers.
+
+Answers are stored per scope (the tool a question names, or "" when it names none)
+together with the index version of that scope, the normalised question and its
+embedding. A question is answered from the cache when the same normalised text, or a
+question whose embedding is at least ``similarity_threshold`` similar, was answered
+before for the same scope and version. Re-indexing ``data/<Tool>`` changes the tool's
+version, so its old answers stop matching and are purged on the next lookup.
+"""
+
+import hashlib
+import re
+import sqlite3
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from rag.indexer import STATE_FILENAME, index_versions, resolve_store_dir
+
+EmbedFn = Callable[[str], list[float]]
+
+
+@dataclass
+class CacheKey:
+    scope: str
+    version: str
+    question: str
+    question_hash: str
+    vector: np.ndarray | None = None
+
+
+def normalize_question(question: str) -> str:
+    """Lowercases, collapses whitespace and strips trailing punctuation."""
+    return " ".join(question.lower().split()).rstrip(" ?!.")
+
+
+def _compact(text: str) -> str:
+    return re.sub(r"[^a-z0-9]", "", text.lower())
+
+
+def detect_tool(question: str, tools: list[str]) -> str:
+    """Returns the tool named in the question ("" if none), preferring the longest name."""
+    compact_question = _compact(question)
+    for tool in sorted(tools, key=len, reverse=True):
+        if _compact(tool) in compact_question:
+            return tool
+    return ""
+
+
+class AnswerCache:
+    """SQLite-backed answer cache with similarity lookup, TTL expiry and LRU eviction."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        embed_fn: EmbedFn,
+        similarity_threshold: float = 0.92,
+        max_entries: int = 1000,
+        ttl_seconds: float | None = None,
+        store_dir: str | Path | None = None,
+    ):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.embed_fn = embed_fn
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.state_path = resolve_store_dir(store_dir) / STATE_FILENAME
+        self._conn = sqlite3.connect(str(path))
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS answers ("
+            " id INTEGER PRIMARY KEY, scope TEXT NOT NULL, version TEXT NOT NULL,"
+            " question TEXT NOT NULL, question_hash TEXT NOT NULL, vector BLOB NOT NULL,"
+            " answer TEXT NOT NULL, created_at REAL NOT NULL, last_used_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS answers_scope ON answers (scope, version, question_hash)"
+        )
+        self._conn.commit()
+        self._versions: dict[str, str] = {}
+        self._versions_mtime: int | None = None
+        # (scope, version) -> (row ids, normalised vectors)
+        self._vectors: dict[tuple[str, str], tuple[list[int], np.ndarray]] = {}
+
+    def _current_versions(self) -> dict[str, str]:
+        mtime = self.state_path.stat().st_mtime_ns if self.state_path.exists() else None
+        if mtime != self._versions_mtime:
+            versions = index_versions(self.state_path.parent)
+            # Unscoped answers may draw on any tool, so they depend on every version.
+            versions[""] = hashlib.sha256(
+                "".join(f"{tool}:{version}" for tool, version in sorted(versions.items())).encode()
+            ).hexdigest()[:16]
+            self._versions, self._versions_mtime = versions, mtime
+            self._vectors.clear()
+        return self._versions
+
+    def _purge(self, scope: str, version: str) -> None:
+        """Drops answers for ``scope`` from other index versions or past their TTL."""
+        self._conn.execute("DELETE FROM answers WHERE scope = ? AND version != ?", (scope, version))
+        if self.ttl_seconds:
+            self._conn.execute(
+                "DELETE FROM answers WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+            )
+        self._conn.commit()
+
+    def _load_vectors(self, scope: str, version: str) -> tuple[list[int], np.ndarray]:
+        cached = self._vectors.get((scope, version))
+        if cached is None:
+            self._purge(scope, version)
+            rows = self._conn.execute(
+                "SELECT id, vector FROM answers WHERE scope = ? AND version = ?", (scope, version)
+            ).fetchall()
+            ids = [row[0] for row in rows]
+            matrix = (
+                np.stack([np.frombuffer(row[1], dtype=np.float32) for row in rows])
+                if rows
+                else np.empty((0, 0), dtype=np.float32)
+            )
+            cached = self._vectors[(scope, version)] = (ids, matrix)
+        return cached
+
+    def _hit(self, row_id: int) -> str | None:
+        row = self._conn.execute(
+            "SELECT answer, created_at FROM answers WHERE id = ?", (row_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        answer, created_at = row
+        if self.ttl_seconds and created_at < time.time() - self.ttl_seconds:
+            return None
+        self._conn.execute(
+            "UPDATE answers SET last_used_at = ? WHERE id = ?", (time.time(), row_id)
+        )
+        self._conn.commit()
+        return answer
+
+    def lookup(self, question: str, tools: list[str]) -> tuple[str | None, CacheKey]:
+        """Returns the cached answer (or None) and the key to store a fresh answer under."""
+        versions = self._current_versions()
+        scope = detect_tool(question, tools)
+        normalized = normalize_question(question)
+        key = CacheKey(
+            scope=scope,
+            version=versions.get(scope, ""),
+            question=normalized,
+            question_hash=hashlib.sha256(normalized.encode("utf-8")).hexdigest(),
+        )
+        ids, matrix = self._load_vectors(key.scope, key.version)
+
+        row = self._conn.execute(
+            "SELECT id FROM answers WHERE scope = ? AND version = ? AND question_hash = ?",
+            (key.scope, key.version, key.question_hash),
+        ).fetchone()
+        if row is not None:
+            return self._hit(row[0]), key
+
+        vector = np.asarray(self.embed_fn(normalized), dtype=np.float32)
+        key.vector = vector / (np.linalg.norm(vector) + 1e-12)
+        if ids:
+            scores = matrix @ key.vector
+            best = int(np.argmax(scores))
+            if scores[best] >= self.similarity_threshold:
+                return self._hit(ids[best]), key
+        return None, key
+
+    def store(self, key: CacheKey, answer: str) -> None:
+        """Caches ``answer`` under ``key`` and evicts the least recently used overflow."""
+        if key.vector is None:
+            vector = np.asarray(self.embed_fn(key.question), dtype=np.float32)
+            key.vector = vector / (np.linalg.norm(vector) + 1e-12)
+        now = time.time()
+        self._conn.execute(
+            "INSERT INTO answers (scope, version, question, question_hash, vector, answer,"
+            " created_at, last_used_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                key.scope,
+                key.version,
+                key.question,
+                key.question_hash,
+                key.vector.astype(np.float32).tobytes(),
+                answer,
+                now,
+                now,
+            ),
+        )
+        self._conn.execute(
+            "DELETE FROM answers WHERE id NOT IN "
+            "(SELECT id FROM answers ORDER BY last_used_at DESC LIMIT ?)",
+            (self.max_entries,),
+        )
+        self._conn.commit()
+        self._vectors.clear()
+
+    def close(self) -> None:
+        self._conn.close()
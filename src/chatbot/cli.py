@@ -1,80 +1,244 @@
-import json
+import argparse
+import sys
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
 
 from conversation import Conversation
 from utils.openai_client import get_openai_client
-from chatbot.config import load_prompts, load_chatbot_config
-from core.settings import settings
+from chatbot.config import ROOT, load_prompts, load_chatbot_config
+from core.settings import get_settings
 from tool_definitions import tools as all_tools
-from tools import get_current_date, add_days_to_date
+import tools as tool_functions
+from streaming import collect_stream
+from tool_executor import ToolExecutor, build_registry
+from session_store import SessionStore
+
+
+@dataclass
+class ChatOptions:
+    """Chatbot options from config/chatbot.yaml, with model defaults from the settings."""
+
+    model_name: str
+    temperature: float
+    max_tokens: int
+    stream_enabled: bool
+    answer_cache_enabled: bool
+    # Turns that called any other tool (e.g. date arithmetic) are time dependent and not cached.
+    cacheable_tools: set[str]
+    enabled_tools: list[dict[str, Any]]
+    # Upper bound on tool-call rounds per user turn; the final round is answered without tools.
+    max_tool_rounds: int
+
+
+@lru_cache(maxsize=1)
+def get_chatbot_config() -> dict[str, Any]:
+    return load_chatbot_config()
+
+
+@lru_cache(maxsize=1)
+def get_options() -> ChatOptions:
+    """Reads the chatbot options on first use; callers may override fields on the result."""
+    config = get_chatbot_config()
+    settings = get_settings()
+    model_cfg = config.get("model", {})
+    answer_cache_cfg = config.get("answer_cache", {})
+    tools_cfg = config.get("tools", {})
+
+    enabled_tool_names = set(tools_cfg.get("enabled_tools", []))
+    if not tools_cfg.get("enabled", True):
+        enabled_tools = []
+    elif enabled_tool_names:
+        enabled_tools = [
+            t for t in all_tools if t.get("function", {}).get("name") in enabled_tool_names
+        ]
+    else:
+        enabled_tools = list(all_tools)
+
+    return ChatOptions(
+        model_name=model_cfg.get("name", settings.default_model),
+        temperature=model_cfg.get("temperature", settings.temperature),
+        max_tokens=model_cfg.get("max_tokens", settings.max_tokens),
+        stream_enabled=model_cfg.get("stream", False),
+        answer_cache_enabled=answer_cache_cfg.get("enabled", False),
+        cacheable_tools=set(answer_cache_cfg.get("cacheable_tools", [])),
+        enabled_tools=enabled_tools,
+        max_tool_rounds=tools_cfg.get("max_rounds", 5),
+    )
 
-client = get_openai_client()
 
-chatbot_config = load_chatbot_config()
+@lru_cache(maxsize=1)
+def get_tool_executor() -> ToolExecutor:
+    return ToolExecutor(
+        build_registry(get_options().enabled_tools, tool_functions),
+        max_workers=get_chatbot_config().get("tools", {}).get("max_workers", 4),
+    )
 
-model_cfg = chatbot_config.get("model", {})
-model_name = model_cfg.get("name", settings.default_model)
-temperature = model_cfg.get("temperature", settings.temperature)
-max_tokens = model_cfg.get("max_tokens", settings.max_tokens)
 
-tools_cfg = chatbot_config.get("tools", {})
-tools_enabled = tools_cfg.get("enabled", True)
-enabled_tool_names = set(tools_cfg.get("enabled_tools", []))
+@lru_cache(maxsize=1)
+def get_session_store() -> SessionStore:
+    sessions_cfg = get_chatbot_config().get("sessions", {})
+    return SessionStore(ROOT / sessions_cfg.get("dir", ".chat_sessions"))
 
-if not tools_enabled:
-    enabled_tools = []
-elif enabled_tool_names:
-    enabled_tools = [
-        t for t in all_tools if t.get("function", {}).get("name") in enabled_tool_names
-    ]
-else:
-    enabled_tools = list(all_tools)
 
+@lru_cache(maxsize=1)
+def get_answer_cache():
+    """Opens the answer cache on first use (it pulls in numpy and the embedding client)."""
+    from answer_cache import AnswerCache
 
-conversation = Conversation(system_prompt=load_prompts()["system"])
+    from rag.embeddings import get_embedding_service
+
+    answer_cache_cfg = get_chatbot_config().get("answer_cache", {})
+    return AnswerCache(
+        ROOT / answer_cache_cfg.get("path", "rag_store/answer_cache.sqlite"),
+        embed_fn=lambda text: get_embedding_service().embed_query(text),
+        similarity_threshold=answer_cache_cfg.get("similarity_threshold", 0.92),
+        max_entries=answer_cache_cfg.get("max_entries", 1000),
+        ttl_seconds=answer_cache_cfg.get("ttl_seconds"),
+    )
 
-while True:
-    user_input = input("User: ")
-    conversation.user_message(user_input)
 
-    response = client.chat.completions.create(
-        model=model_name,
-        messages=conversation.get_messages(),
-        tools=enabled_tools,
-        tool_choice="auto",
-        temperature=temperature,
-        max_tokens=max_tokens,
+@lru_cache(maxsize=1)
+def get_corpus_tools() -> list[str]:
+    from rag.ingestion import resolve_data_dir
+
+    return sorted(p.name for p in resolve_data_dir().iterdir() if p.is_dir())
+
+
+def complete(
+    conversation: Conversation,
+    chat_client=None,
+    on_token: Callable[[str], None] | None = None,
+    allow_tools: bool = True,
+):
+    """Requests the next assistant message.
+
+    When streaming is enabled, content tokens are passed to ``on_token`` as they arrive
+    and streamed tool-call deltas are reassembled before the message is returned.
+    """
+    options = get_options()
+    chat_client = chat_client or get_openai_client()
+    request = {
+        "model": options.model_name,
+        "messages": conversation.get_messages(),
+        "temperature": options.temperature,
+        "max_tokens": options.max_tokens,
+    }
+    if options.enabled_tools and allow_tools:
+        request["tools"] = options.enabled_tools
+        request["tool_choice"] = "auto"
+
+    if options.stream_enabled:
+        stream = chat_client.chat.completions.create(stream=True, **request)
+        return collect_stream(stream, on_content=on_token)
+
+    response = chat_client.chat.completions.create(**request)
+    return response.choices[0].message
+
+
+def chat_turn(
+    conversation: Conversation,
+    user_input: str,
+    chat_client=None,
+    on_token: Callable[[str], None] | None = None,
+) -> str:
+    """Runs one user turn and returns the assistant reply.
+
+    Repeated questions are answered from the semantic answer cache when it is enabled.
+    The cache is keyed on the question alone, so it is only used for the first question of
+    a conversation; follow-ups depend on earlier turns. Otherwise tool calls are executed (concurrently when the model requests several) and
+    fed back until the model answers without tools or ``max_tool_rounds`` is reached.
+
+    Args:
+        conversation: Conversation the turn is appended to.
+        user_input: The user's message.
+        chat_client: OpenAI-compatible client (defaults to the module client).
+        on_token: Receives reply tokens as they stream in (streaming mode only).
+    """
+    options = get_options()
+    answer_cache = (
+        get_answer_cache()
+        if options.answer_cache_enabled and not conversation.has_history
+        else None
     )
+    cache_key = None
+    if answer_cache is not None:
+        cached_reply, cache_key = answer_cache.lookup(user_input, get_corpus_tools())
+        if cached_reply is not None:
+            conversation.user_message(user_input)
+            conversation.add_assistant_message(cached_reply)
+            if on_token is not None:
+                on_token(cached_reply)
+            return cached_reply
 
-    message = response.choices[0].message
+    conversation.user_message(user_input)
 
-    if message.tool_calls:
+    message = complete(conversation, chat_client, on_token)
+    rounds = 0
+    used_tools: set[str] = set()
+    while message.tool_calls:
+        used_tools.update(call.function.name for call in message.tool_calls)
         conversation.add_assistant_message_with_tool_calls(message)
-        for tool_call in message.tool_calls:
-            function_name = tool_call.function.name
-            arguments = json.loads(tool_call.function.arguments)
-
-            if function_name == "get_current_date":
-                tool_result = get_current_date()
-            elif function_name == "add_days_to_date":
-                tool_result = add_days_to_date(arguments["date_str"], arguments["days"])
-            else:
-                tool_result = f"Error: unknown tool {function_name}"
-
-            conversation.add_tool_result(tool_call.id, tool_result)
-
-        response = client.chat.completions.create(
-            model=model_name,
-            messages=conversation.get_messages(),
-            tools=enabled_tools,
-            tool_choice="auto",
-            temperature=temperature,
-            max_tokens=max_tokens,
+        for tool_call_id, tool_result in get_tool_executor().execute(message.tool_calls):
+            conversation.add_tool_result(tool_call_id, tool_result)
+        rounds += 1
+        message = complete(
+            conversation, chat_client, on_token, allow_tools=rounds < options.max_tool_rounds
         )
-        assistant_reply = response.choices[0].message.content
-        print(f"Assistant: {assistant_reply}")
-        conversation.add_assistant_message(assistant_reply)
 
+    assistant_reply = message.content
+    conversation.add_assistant_message(assistant_reply)
+    if cache_key is not None and assistant_reply and used_tools <= options.cacheable_tools:
+        answer_cache.store(cache_key, assistant_reply)
+    return assistant_reply
+
+
+def print_token(token: str) -> None:
+    sys.stdout.write(token)
+    sys.stdout.flush()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="AI Tool Verification Assistant chatbot")
+    parser.add_argument("--resume", metavar="SESSION_ID", help="Continue a saved session")
+    parser.add_argument("--list-sessions", action="store_true", help="List saved sessions")
+    args = parser.parse_args()
+
+    options = get_options()
+    session_store = get_session_store()
+    if args.list_sessions:
+        for info in session_store.list_sessions():
+            print(f"{info.session_id}  {info.updated_at}  {info.preview}")
+        return
+
+    history_cfg = get_chatbot_config().get("history", {})
+    conversation = Conversation(
+        system_prompt=load_prompts()["system"],
+        max_history_tokens=history_cfg.get("max_tokens"),
+        strategy=history_cfg.get("strategy", "drop"),
+        summary_max_tokens=history_cfg.get("summary_max_tokens", 400),
+    )
+    if args.resume:
+        if not session_store.exists(args.resume):
+            parser.error(f"Unknown session '{args.resume}'")
+        messages, conversation.log = session_store.load(args.resume)
+        conversation.restore(messages)
+        print(f"Resumed session {args.resume} ({len(messages)} messages)")
     else:
-        assistant_reply = message.content
-        print(f"Assistant: {assistant_reply}")
-        conversation.add_assistant_message(assistant_reply)
+        session_id, conversation.log = session_store.create(model=options.model_name)
+        print(f"Session {session_id} (resume with --resume {session_id})")
+
+    while True:
+        user_input = input("User: ")
+        if options.stream_enabled:
+            print("Assistant: ", end="", flush=True)
+            chat_turn(conversation, user_input, on_token=print_token)
+            print()
+        else:
+            assistant_reply = chat_turn(conversation, user_input)
+            print(f"Assistant: {assistant_reply}")
+
+
+if __name__ == "__main__":
+    main()
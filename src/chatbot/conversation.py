@@ -1,14 +1,57 @@
+from session_store import SessionLog
+
+from utils.tokens import estimate_message_tokens, estimate_tokens
+
+# Characters kept from each user/assistant message in the summary of dropped turns.
+SUMMARY_SNIPPET_CHARS = 200
+
+SUMMARY_HEADER = "Summary of earlier conversation (older turns were removed):"
+
+
 class Conversation:
-    def __init__(self, system_prompt: str):
+    """Chat history sent to the model on every turn.
+
+    With a ``max_history_tokens`` budget, the oldest complete turns (a user message and
+    every assistant/tool message that followed it) are removed once the history grows
+    past the budget, so tool-call/tool-result pairs are never split. The system prompt
+    and the current turn are always kept. With the ``summarize`` strategy the removed
+    turns are condensed into a short extractive summary kept after the system prompt.
+    With a ``log``, every added message is also appended to the on-disk session.
+    """
+
+    def __init__(
+        self,
+        system_prompt: str,
+        max_history_tokens: int | None = None,
+        strategy: str = "drop",
+        summary_max_tokens: int = 400,
+        log: SessionLog | None = None,
+    ):
+        if strategy not in ("drop", "summarize"):
+            raise ValueError(f"Unknown history strategy: {strategy}")
         self.messages = [
             {"role": "system", "content": system_prompt},
         ]
+        self.token_counts = [estimate_message_tokens(self.messages)]
+        self.max_history_tokens = max_history_tokens
+        self.strategy = strategy
+        self.summary_max_tokens = summary_max_tokens
+        self.summary_lines: list[str] = []
+        self.has_summary = False
+        self.dropped_turns = 0
+        self.log = log
+
+    def _append(self, message: dict):
+        self.messages.append(message)
+        self.token_counts.append(estimate_message_tokens([message]))
+        if self.log is not None:
+            self.log.append(message)
 
     def user_message(self, content: str):
-        self.messages.append({"role": "user", "content": content})
+        self._append({"role": "user", "content": content})
 
     def add_assistant_message(self, content: str):
-        self.messages.append({"role": "assistant", "content": content})
+        self._append({"role": "assistant", "content": content})
 
     def add_assistant_message_with_tool_calls(self, message):
         msg = {"role": "assistant", "content": message.content or ""}
@@ -21,12 +64,92 @@ class Conversation:
                 }
                 for tc in message.tool_calls
             ]
-        self.messages.append(msg)
+        self._append(msg)
 
     def add_tool_result(self, tool_call_id: str, content: str):
-        self.messages.append(
-            {"role": "tool", "tool_call_id": tool_call_id, "content": str(content)}
-        )
+        self._append({"role": "tool", "tool_call_id": tool_call_id, "content": str(content)})
+
+    @property
+    def has_history(self) -> bool:
+        """True once the conversation has an earlier user turn (kept, dropped or summarized)."""
+        return self.dropped_turns > 0 or any(m["role"] == "user" for m in self.messages)
+
+    @property
+    def total_tokens(self) -> int:
+        return sum(self.token_counts)
+
+    def _history_start(self) -> int:
+        """Index of the first message after the system prompt and the summary message."""
+        return 2 if self.has_summary else 1
+
+    def _turn_starts(self) -> list[int]:
+        return [
+            i
+            for i in range(self._history_start(), len(self.messages))
+            if self.messages[i]["role"] == "user"
+        ]
+
+    def _summarize(self, dropped: list[dict]):
+        lines = list(self.summary_lines)
+        for message in dropped:
+            content = (message.get("content") or "").strip()
+            if message["role"] in ("user", "assistant") and content:
+                snippet = " ".join(content.split())[:SUMMARY_SNIPPET_CHARS]
+                lines.append(f"- {message['role'].capitalize()}: {snippet}")
+        # Keep the most recent lines that fit the summary budget.
+        kept: list[str] = []
+        used = 0
+        for line in reversed(lines):
+            used += estimate_tokens(line) + 1
+            if kept and used > self.summary_max_tokens:
+                break
+            kept.append(line)
+        self.summary_lines = kept[::-1]
+
+    def _set_summary(self):
+        message = {
+            "role": "system",
+            "content": "\n".join([SUMMARY_HEADER, *self.summary_lines]),
+        }
+        tokens = estimate_message_tokens([message])
+        if self.has_summary:
+            self.messages[1] = message
+            self.token_counts[1] = tokens
+        else:
+            self.messages.insert(1, message)
+            self.token_counts.insert(1, tokens)
+            self.has_summary = True
+
+    def compact(self):
+        """Drops (or summarizes) the oldest complete turns until the history fits the budget."""
+        if self.max_history_tokens is None:
+            return
+        while (excess := self.total_tokens - self.max_history_tokens) > 0:
+            first = self._history_start()
+            starts = self._turn_starts()
+            if len(starts) < 2:
+                # Only the current turn is left; it is never cut.
+                return
+            end, removed = first, 0
+            for next_start in starts[1:]:
+                removed += sum(self.token_counts[end:next_start])
+                end = next_start
+                self.dropped_turns += 1
+                if removed >= excess:
+                    break
+            dropped = self.messages[first:end]
+            del self.messages[first:end]
+            del self.token_counts[first:end]
+            if self.strategy == "summarize":
+                self._summarize(dropped)
+                self._set_summary()
+
+    def restore(self, messages: list[dict]):
+        """Re-adds previously saved messages (without logging them again)."""
+        for message in messages:
+            self.messages.append(message)
+            self.token_counts.append(estimate_message_tokens([message]))
 
     def get_messages(self):
+        self.compact()
         return self.messages
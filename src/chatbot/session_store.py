@@ -0,0 +1,134 @@
+"""
+Append-only on-disk chat sessions.
+
+Every session is one JSONL file, ``<session_id>.jsonl``. The first line is a metadata
+record; each later line is one chat message, appended and flushed as it is added, so
+saving a message costs the same no matter how long the session is and a crash loses at
+most the message being written. Resuming reads the file once; a truncated last line
+(from a crash mid-write) is skipped.
+"""
+
+import json
+import uuid
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, TextIO
+
+SESSION_SUFFIX = ".jsonl"
+
+# Lines read from the start of a session file when listing (metadata + first messages).
+PREVIEW_LINES = 8
+
+
+@dataclass
+class SessionInfo:
+    session_id: str
+    created_at: str
+    updated_at: str
+    preview: str
+
+
+def new_session_id() -> str:
+    return datetime.now(UTC).strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:6]
+
+
+class SessionLog:
+    """Appends chat messages to a session file, one JSON record per line."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._file: TextIO | None = None
+
+    def _open(self) -> TextIO:
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+        return self._file
+
+    def write_record(self, record: dict[str, Any]):
+        f = self._open()
+        f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+        f.flush()
+
+    def append(self, message: dict[str, Any]):
+        self.write_record({"type": "message", "message": message})
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class SessionStore:
+    """Creates, resumes and lists chat sessions stored in ``directory``."""
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+
+    def path_for(self, session_id: str) -> Path:
+        return self.directory / f"{session_id}{SESSION_SUFFIX}"
+
+    def exists(self, session_id: str) -> bool:
+        return self.path_for(session_id).is_file()
+
+    def create(self, **metadata: Any) -> tuple[str, SessionLog]:
+        """Starts a new session and returns its ID and log."""
+        session_id = new_session_id()
+        log = SessionLog(self.path_for(session_id))
+        log.write_record(
+            {
+                "type": "meta",
+                "session_id": session_id,
+                "created_at": datetime.now(UTC).isoformat(timespec="seconds"),
+                **metadata,
+            }
+        )
+        return session_id, log
+
+    def load(self, session_id: str) -> tuple[list[dict[str, Any]], SessionLog]:
+        """Reads all messages of a session and returns them with a log for further appends.
+
+        Raises:
+            FileNotFoundError: If the session does not exist.
+        """
+        path = self.path_for(session_id)
+        messages = []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if record.get("type") == "message":
+                    messages.append(record["message"])
+        return messages, SessionLog(path)
+
+    def list_sessions(self) -> list[SessionInfo]:
+        """Returns past sessions, most recently updated first."""
+        sessions = []
+        for path in self.directory.glob(f"*{SESSION_SUFFIX}"):
+            meta: dict[str, Any] = {}
+            preview = ""
+            with open(path, encoding="utf-8") as f:
+                for _, line in zip(range(PREVIEW_LINES), f, strict=False):
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        break
+                    if record.get("type") == "meta":
+                        meta = record
+                    elif record.get("message", {}).get("role") == "user":
+                        preview = " ".join(str(record["message"].get("content", "")).split())
+                        break
+            updated_at = datetime.fromtimestamp(path.stat().st_mtime, UTC)
+            sessions.append(
+                SessionInfo(
+                    session_id=meta.get("session_id", path.stem),
+                    created_at=meta.get("created_at", ""),
+                    updated_at=updated_at.isoformat(timespec="seconds"),
+                    preview=preview[:80],
+                )
+            )
+        sessions.sort(key=lambda s: s.updated_at, reverse=True)
+        return sessions
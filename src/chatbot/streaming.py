@@ -0,0 +1,87 @@
+"""
+Reassembly of streamed chat completions.
+
+With ``stream=True`` the API sends content and tool calls as deltas: content arrives in
+pieces, and each tool call arrives as an ``index`` with its id/name first and the JSON
+arguments split over many chunks. collect_stream() forwards content pieces as they
+arrive and rebuilds a message with the same shape as a non-streamed one, so tool calls
+are only dispatched once their arguments are complete.
+"""
+
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass
+class StreamedFunction:
+    name: str = ""
+    arguments: str = ""
+
+
+@dataclass
+class StreamedToolCall:
+    id: str = ""
+    type: str = "function"
+    function: StreamedFunction = field(default_factory=StreamedFunction)
+
+
+@dataclass
+class StreamedMessage:
+    """Assistant message rebuilt from stream chunks (mirrors the SDK message attributes)."""
+
+    role: str = "assistant"
+    content: str | None = None
+    tool_calls: list[StreamedToolCall] | None = None
+    finish_reason: str | None = None
+
+
+def collect_stream(
+    stream: Iterable[Any], on_content: Callable[[str], None] | None = None
+) -> StreamedMessage:
+    """Consumes a chat completion stream and returns the reassembled message.
+
+    Args:
+        stream: Iterator of chat completion chunks.
+        on_content: Called with every content piece as soon as it arrives.
+
+    Returns:
+        StreamedMessage: Full content and complete tool calls, ordered by their index.
+    """
+    content_parts: list[str] = []
+    tool_calls: dict[int, StreamedToolCall] = {}
+    finish_reason = None
+
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        choice = chunk.choices[0]
+        delta = choice.delta
+        if choice.finish_reason:
+            finish_reason = choice.finish_reason
+        if delta is None:
+            continue
+
+        if delta.content:
+            content_parts.append(delta.content)
+            if on_content is not None:
+                on_content(delta.content)
+
+        for tool_delta in delta.tool_calls or []:
+            tool_call = tool_calls.setdefault(tool_delta.index, StreamedToolCall())
+            if tool_delta.id:
+                tool_call.id = tool_delta.id
+            if tool_delta.type:
+                tool_call.type = tool_delta.type
+            function = tool_delta.function
+            if function is not None:
+                if function.name:
+                    tool_call.function.name += function.name
+                if function.arguments:
+                    tool_call.function.arguments += function.arguments
+
+    return StreamedMessage(
+        content="".join(content_parts) if content_parts else None,
+        tool_calls=[tool_calls[i] for i in sorted(tool_calls)] or None,
+        finish_reason=finish_reason,
+    )
@@ -32,4 +32,48 @@ tools = [
             },
         },
     },
+    {
+        "type": "function",
+        "function": {
+            "name": "search_documents",
+            "description": (
+                "Search a tool's legal and compliance documents (privacy policy, terms of "
+                "service, DPA, SLA, security whitepaper, certifications). Returns the most "
+                "relevant passages, each tagged [Tool/doc_type#section_id] for citation."
+            ),
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "tool_name": {
+                        "type": "string",
+                        "description": "Name of the software tool, e.g. CollabVision",
+                    },
+                    "query": {
+                        "type": "string",
+                        "description": "What to look for, in natural language or keywords",
+                    },
+                    "doc_types": {
+                        "type": "array",
+                        "items": {
+                            "type": "string",
+                            "enum": [
+                                "privacy_policy",
+                                "terms_of_service",
+                                "data_processing_agreement",
+                                "service_level_agreement",
+                                "security_whitepaper",
+                                "compliance_and_certifications",
+                            ],
+                        },
+                        "description": "Only search these document types (default: all)",
+                    },
+                    "k": {
+                        "type": "integer",
+                        "description": "Number of passages to return (default 5)",
+                    },
+                },
+                "required": ["tool_name", "query"],
+            },
+        },
+    },
 ]
@@ -0,0 +1,81 @@
+"""
+Tool-call execution for the chatbot.
+
+Tools are dispatched through a registry built from ``tool_definitions.tools`` (each declared
+function name maps to the function of the same name in ``tools``). All calls requested in
+one assistant message are independent, so they run concurrently in a thread pool; results
+are returned in the order the model requested them.
+"""
+
+import json
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from types import ModuleType
+from typing import Any
+
+ToolFunction = Callable[..., Any]
+
+
+def build_registry(
+    definitions: list[dict[str, Any]], module: ModuleType
+) -> dict[str, ToolFunction]:
+    """Maps every declared tool name to its implementation in ``module``.
+
+    Raises:
+        ValueError: If a declared tool has no implementation.
+    """
+    registry: dict[str, ToolFunction] = {}
+    for definition in definitions:
+        name = definition["function"]["name"]
+        function = getattr(module, name, None)
+        if not callable(function):
+            raise ValueError(f"Tool '{name}' is declared but not implemented in {module.__name__}")
+        registry[name] = function
+    return registry
+
+
+class ToolExecutor:
+    """Runs the tool calls of an assistant message concurrently."""
+
+    def __init__(self, registry: dict[str, ToolFunction], max_workers: int = 4):
+        self.registry = registry
+        self.max_workers = max(1, max_workers)
+        self._pool: ThreadPoolExecutor | None = None
+
+    @property
+    def pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="tool")
+        return self._pool
+
+    def run_one(self, name: str, arguments_json: str) -> str:
+        """Executes a single tool call; failures are returned as text for the model to see."""
+        function = self.registry.get(name)
+        if function is None:
+            return f"Error: unknown tool {name}"
+        try:
+            arguments = json.loads(arguments_json) if arguments_json else {}
+        except json.JSONDecodeError as e:
+            return f"Error: invalid arguments for {name}: {e}"
+        try:
+            return str(function(**arguments))
+        except Exception as e:
+            return f"Error: {name} failed: {e}"
+
+    def execute(self, tool_calls: list[Any]) -> list[tuple[str, str]]:
+        """Runs all tool calls and returns ``(tool_call_id, result)`` in request order."""
+        if len(tool_calls) == 1:
+            call = tool_calls[0]
+            return [(call.id, self.run_one(call.function.name, call.function.arguments))]
+        futures = [
+            self.pool.submit(self.run_one, call.function.name, call.function.arguments)
+            for call in tool_calls
+        ]
+        return [
+            (call.id, future.result()) for call, future in zip(tool_calls, futures, strict=True)
+        ]
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
@@ -1,4 +1,10 @@
 import datetime
+import re
+from functools import lru_cache
+from typing import Any
+
+from chatbot.config import load_chatbot_config
+from utils.tokens import CHARS_PER_TOKEN, estimate_tokens
 
 
 def get_current_date():
@@ -9,3 +15,58 @@ def add_days_to_date(date_str, days):
     date_obj = datetime.datetime.strptime(date_str, "%Y-%m-%d")
     new_date = date_obj + datetime.timedelta(days=days)
     return new_date.strftime("%Y-%m-%d")
+
+
+@lru_cache(maxsize=1)
+def get_search_config() -> dict[str, Any]:
+    return load_chatbot_config().get("search", {})
+
+
+def _compact(name: str) -> str:
+    return re.sub(r"[^a-z0-9]", "", name.lower())
+
+
+def _truncate(text: str, max_tokens: int) -> str:
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars].rsplit(" ", 1)[0] + " …"
+
+
+def search_documents(tool_name, query, doc_types=None, k=None):
+    """Returns the document passages most relevant to ``query`` as citation-tagged snippets.
+
+    Each snippet starts with ``[Tool/doc_type#section_id]`` and the section path from the
+    TOC. Snippets are added best first until the configured token budget is used up, so
+    only the relevant passages reach the model.
+    """
+    from rag.retrieval import get_retriever
+
+    config = get_search_config()
+    retriever = get_retriever()
+    indexed_tools = sorted(set(retriever.keyword_index.tools.tolist()))
+    tool = next((t for t in indexed_tools if _compact(t) == _compact(tool_name)), None)
+    if tool is None:
+        return f"Error: unknown tool '{tool_name}'. Available tools: {', '.join(indexed_tools)}"
+
+    k = max(1, min(int(k or config.get("default_k", 5)), config.get("max_k", 10)))
+    results = retriever.search(query, k=k, tools=[tool], doc_types=doc_types or None)
+    if not results:
+        return f"No passages found in the {tool} documents for: {query}"
+
+    budget = config.get("max_tokens", 1500)
+    snippet_max_tokens = config.get("snippet_max_tokens", 300)
+    snippets: list[str] = []
+    used = 0
+    for result in results:
+        meta = result.metadata
+        snippet = (
+            f"[{meta['tool']}/{meta['doc_type']}#{meta['section_id']}] {meta['section_path']}\n"
+            f"{_truncate(result.text, snippet_max_tokens)}"
+        )
+        tokens = estimate_tokens(snippet)
+        if snippets and used + tokens > budget:
+            break
+        snippets.append(snippet)
+        used += tokens
+    return "\n\n".join(snippets)
@@ -5,7 +5,9 @@ This module handles all configuration loading from environment variables
 and provides a centralized configuration object.
 """
 
+from functools import lru_cache
 from pathlib import Path
+from typing import Any, Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -30,6 +32,21 @@ class Settings(BaseSettings):
         description="API base URL",
     )
 
+    # HTTP client (shared connection pool for all OpenAI clients)
+    openai_timeout_seconds: float = Field(default=60.0, gt=0, description="Request timeout")
+    openai_connect_timeout_seconds: float = Field(
+        default=10.0, gt=0, description="Connection timeout"
+    )
+    openai_max_retries: int = Field(default=2, ge=0, description="SDK-level retries per request")
+    openai_max_connections: int = Field(default=100, gt=0, description="Connection pool size")
+    openai_max_keepalive_connections: int = Field(
+        default=20, ge=0, description="Idle connections kept open for reuse"
+    )
+    openai_keepalive_expiry_seconds: float = Field(
+        default=30.0, ge=0, description="How long idle connections stay open"
+    )
+    openai_http2: bool = Field(default=True, description="Use HTTP/2 when h2 is installed")
+
     # Model Configuration
     default_model: str = Field(
         default="l2-gpt-4o-mini",
@@ -40,6 +57,23 @@ class Settings(BaseSettings):
         description="Embedding model for RAG",
     )
 
+    embedding_batch_size: int = Field(
+        default=256, gt=0, description="Texts sent per embeddings request"
+    )
+    embedding_concurrency: int = Field(
+        default=4, gt=0, description="Embedding requests in flight at once"
+    )
+    embedding_cache_path: str = Field(
+        default="./rag_store/embeddings_cache.sqlite",
+        description="SQLite cache of embeddings keyed by model and text hash",
+    )
+    embedding_requests_per_minute: int | None = Field(
+        default=None, gt=0, description="Client-side request limit for the embedding model"
+    )
+    embedding_tokens_per_minute: int | None = Field(
+        default=None, gt=0, description="Client-side token limit for the embedding model"
+    )
+
     # LLM Parameters
     temperature: float = Field(default=0.7, ge=0.0, le=2.0, description="LLM temperature")
     max_tokens: int = Field(default=2000, gt=0, description="Maximum tokens per request")
@@ -49,6 +83,17 @@ class Settings(BaseSettings):
         default="./rag_store",
         description="ChromaDB persistence directory",
     )
+    chroma_collection: str = Field(
+        default="legal_documents",
+        description="ChromaDB collection holding document chunks",
+    )
+    vector_store: Literal["chroma", "numpy"] = Field(
+        default="chroma",
+        description="Vector store backend: ChromaDB or memory-mapped NumPy files",
+    )
+    vector_store_dtype: Literal["float32", "float16", "int8"] = Field(
+        default="float32", description="Storage precision of the NumPy vector store"
+    )
     chunk_size: int = Field(default=1000, gt=0, description="Text chunk size for splitting")
     chunk_overlap: int = Field(default=200, ge=0, description="Chunk overlap size")
 
@@ -63,6 +108,17 @@ class Settings(BaseSettings):
     data_dir: str = Field(default="./data", description="Data directory path")
 
 
-# Loaded from environment/.env at runtime; type checker cannot detect it.
-# Suppress false-positive "unfilled parameter" warning.
-settings = Settings()  # type: ignore[call-arg]
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Returns the application settings, loading them from the environment on first use."""
+    # Loaded from environment/.env at runtime; type checker cannot detect it.
+    # Suppress false-positive "unfilled parameter" warning.
+    return Settings()  # type: ignore[call-arg]
+
+
+def __getattr__(name: str) -> Any:
+    # `from core.settings import settings` keeps working but only loads the settings when
+    # that import runs; library code calls get_settings() where the value is needed.
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
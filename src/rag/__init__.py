@@ -0,0 +1 @@
+"""Document ingestion, indexing and retrieval over the generated legal corpus."""
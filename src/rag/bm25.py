@@ -0,0 +1,184 @@
+"""
+In-process BM25 keyword index over document chunks.
+
+Dense embeddings blur exact legal terms ("SOC 2", "sub-processor", "EU"); BM25 matches
+them literally. The index is built once at indexing time and saved as JSON next to the
+vector store together with each chunk's text and metadata, so loading it needs no
+re-chunking and search results can be returned without touching the vector store.
+"""
+
+import json
+import math
+import os
+import re
+import tempfile
+from collections import Counter
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from rag.ingestion import Chunk
+
+BM25_FILENAME = "bm25_index.json"
+BM25_VERSION = 1
+
+# Standard Okapi BM25 parameters.
+DEFAULT_K1 = 1.5
+DEFAULT_B = 0.75
+
+# Words like "sub-processor" are indexed whole and as their parts.
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[-'][a-z0-9]+)*")
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to "
+    "was were will with we you your our their they any all not may can".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercases and splits text into terms, dropping stopwords."""
+    tokens: list[str] = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        tokens.append(token)
+        if "-" in token or "'" in token:
+            parts = [part for part in re.split(r"[-']", token) if part not in STOPWORDS]
+            tokens.extend(parts)
+            tokens.append("".join(parts))
+    return tokens
+
+
+class BM25Index:
+    """Inverted index with BM25 scoring and tool / document type filters."""
+
+    def __init__(
+        self,
+        docs: list[dict[str, Any]],
+        doc_lengths: list[int],
+        postings: dict[str, list[list[int]]],
+        k1: float = DEFAULT_K1,
+        b: float = DEFAULT_B,
+    ):
+        self.docs = docs
+        self.k1 = k1
+        self.b = b
+        self.doc_lengths = np.asarray(doc_lengths, dtype=np.float32)
+        self.avg_length = float(self.doc_lengths.mean()) if len(docs) else 0.0
+        self._postings = postings
+        # Postings are converted to arrays on first use, so loading stays cheap.
+        self._arrays: dict[str, tuple[np.ndarray, np.ndarray, float]] = {}
+        self.chunk_ids = [doc["chunk_id"] for doc in docs]
+        self.tools = np.asarray([doc["metadata"]["tool"] for doc in docs])
+        self.doc_types = np.asarray([doc["metadata"]["doc_type"] for doc in docs])
+
+    @classmethod
+    def build(
+        cls, chunks: Iterable[Chunk], k1: float = DEFAULT_K1, b: float = DEFAULT_B
+    ) -> "BM25Index":
+        docs: list[dict[str, Any]] = []
+        doc_lengths: list[int] = []
+        postings: dict[str, list[list[int]]] = {}
+        for doc_index, chunk in enumerate(chunks):
+            terms = tokenize(f"{chunk.section_title} {chunk.text}")
+            docs.append(
+                {"chunk_id": chunk.chunk_id, "text": chunk.text, "metadata": chunk.metadata()}
+            )
+            doc_lengths.append(len(terms))
+            for term, count in Counter(terms).items():
+                ids, tfs = postings.setdefault(term, [[], []])
+                ids.append(doc_index)
+                tfs.append(count)
+        return cls(docs, doc_lengths, postings, k1=k1, b=b)
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "version": BM25_VERSION,
+            "k1": self.k1,
+            "b": self.b,
+            "docs": self.docs,
+            "doc_lengths": self.doc_lengths.astype(int).tolist(),
+            "postings": self._postings,
+        }
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_name, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "BM25Index":
+        """Loads a saved index.
+
+        Raises:
+            FileNotFoundError: If the index has not been built yet.
+            ValueError: If the file was written by an incompatible version.
+        """
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        if payload.get("version") != BM25_VERSION:
+            raise ValueError(f"Unsupported BM25 index version in {path}; re-run the indexer")
+        return cls(
+            payload["docs"],
+            payload["doc_lengths"],
+            payload["postings"],
+            k1=payload["k1"],
+            b=payload["b"],
+        )
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def _term_arrays(self, term: str) -> tuple[np.ndarray, np.ndarray, float] | None:
+        arrays = self._arrays.get(term)
+        if arrays is None:
+            posting = self._postings.get(term)
+            if posting is None:
+                return None
+            ids = np.asarray(posting[0], dtype=np.int64)
+            tfs = np.asarray(posting[1], dtype=np.float32)
+            df = len(ids)
+            idf = math.log(1 + (len(self.docs) - df + 0.5) / (df + 0.5))
+            arrays = self._arrays[term] = (ids, tfs, idf)
+        return arrays
+
+    def filter_mask(
+        self, tools: Iterable[str] | None = None, doc_types: Iterable[str] | None = None
+    ) -> np.ndarray | None:
+        """Boolean mask of the chunks matching the filters (None when unfiltered)."""
+        mask = None
+        if tools:
+            mask = np.isin(self.tools, list(tools))
+        if doc_types:
+            doc_mask = np.isin(self.doc_types, list(doc_types))
+            mask = doc_mask if mask is None else mask & doc_mask
+        return mask
+
+    def search(
+        self,
+        query: str,
+        k: int = 10,
+        tools: Iterable[str] | None = None,
+        doc_types: Iterable[str] | None = None,
+    ) -> list[tuple[int, float]]:
+        """Returns up to ``k`` ``(doc_index, score)`` pairs, best first."""
+        if not self.docs:
+            return []
+        scores = np.zeros(len(self.docs), dtype=np.float32)
+        for term in set(tokenize(query)):
+            arrays = self._term_arrays(term)
+            if arrays is None:
+                continue
+            ids, tfs, idf = arrays
+            norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[ids] / self.avg_length)
+            scores[ids] += idf * tfs * (self.k1 + 1) / (tfs + norm)
+
+        mask = self.filter_mask(tools, doc_types)
+        if mask is not None:
+            scores[~mask] = 0.0
+        candidates = np.flatnonzero(scores)
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k)[:k]]
+        ranked = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(int(i), float(scores[i])) for i in ranked]
@@ -0,0 +1,238 @@
+"""
+Compiled corpus: the ``data/`` tree pre-parsed into one memory-mapped binary file.
+
+Parsing the HTML of every document with lxml costs far more than reading its text, and
+every consumer (indexing, BM25, evaluation, issue detection) needs the same sections.
+``compile_corpus`` parses the tree once and writes ``data/.corpus.bin``:
+
+- a fixed header: magic, format version, section count, source signature and the
+  offsets of the other parts;
+- a section table of fixed-size records (text offset, byte length, document index),
+  so any section is found with one ``struct.unpack_from``;
+- a JSON metadata block (documents with their raw TOC, ``tool_info.json`` contents,
+  TOC entry of every section), parsed only when metadata is first needed;
+- the UTF-8 text of all sections back to back.
+
+Opening a ``CompiledCorpus`` reads only the header; section text is sliced straight
+from the mmap. ``open_corpus`` compares the stored signature (path, mtime and size of
+every source file) with the data directory and recompiles when anything changed.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+from collections.abc import Iterator
+from functools import cached_property
+from pathlib import Path
+from typing import Any
+
+from rag.ingestion import TocEntry, iter_corpus_documents, iter_document_sections, resolve_data_dir
+
+CORPUS_FILENAME = ".corpus.bin"
+CORPUS_MAGIC = b"AVCORPUS"
+# Bump whenever the layout or the section parsing in rag.ingestion changes.
+CORPUS_VERSION = 1
+
+# magic, version, section count, source signature, metadata offset / length, text offset
+_HEADER = struct.Struct("<8sII32sQQQ")
+# text offset (relative to the text block), byte length, document index
+_SECTION = struct.Struct("<QII")
+
+
+class CorpusFormatError(ValueError):
+    """Raised when a compiled corpus file is truncated or written by another version."""
+
+
+def corpus_path(data_dir: str | Path | None = None) -> Path:
+    return resolve_data_dir(data_dir) / CORPUS_FILENAME
+
+
+def _source_files(root: Path) -> list[Path]:
+    files: list[Path] = []
+    for tool_folder in sorted(p for p in root.iterdir() if p.is_dir()):
+        files.extend(sorted(tool_folder.glob("tool_info.json")))
+        files.extend(sorted(tool_folder.glob("*.html")))
+        files.extend(sorted(tool_folder.glob("toc_*.json")))
+    return files
+
+
+def source_signature(data_dir: str | Path | None = None) -> bytes:
+    """SHA-256 of the relative path, mtime and size of every source file (stat calls only)."""
+    root = resolve_data_dir(data_dir)
+    digest = hashlib.sha256(f"v{CORPUS_VERSION}".encode())
+    for path in _source_files(root):
+        stat = path.stat()
+        digest.update(
+            f"{path.relative_to(root).as_posix()}\0{stat.st_mtime_ns}\0{stat.st_size}\n".encode()
+        )
+    return digest.digest()
+
+
+def compile_corpus(data_dir: str | Path | None = None, path: str | Path | None = None) -> Path:
+    """Parses every document of the data directory and writes the compiled corpus atomically.
+
+    Args:
+        data_dir: Corpus directory (defaults to ``settings.data_dir``).
+        path: Output file (defaults to ``<data_dir>/.corpus.bin``).
+
+    Returns:
+        Path: The written file.
+    """
+    root = resolve_data_dir(data_dir)
+    path = Path(path) if path is not None else corpus_path(root)
+    # Taken before parsing: a file edited mid-compile leaves the corpus stale, not wrong.
+    signature = source_signature(root)
+
+    documents: list[dict[str, Any]] = []
+    tools: dict[str, Any] = {}
+    sections: list[list[Any]] = []
+    table = bytearray()
+    texts: list[bytes] = []
+    offset = 0
+    for tool_folder, doc_type in iter_corpus_documents(root):
+        if tool_folder.name not in tools:
+            tools[tool_folder.name] = json.loads(
+                (tool_folder / "tool_info.json").read_text(encoding="utf-8")
+            )
+        toc_path = tool_folder / f"toc_{doc_type}.json"
+        document = {
+            "tool": tool_folder.name,
+            "doc_type": doc_type,
+            "source": (tool_folder / f"{doc_type}.html").relative_to(root).as_posix(),
+            "toc": json.loads(toc_path.read_text(encoding="utf-8")) if toc_path.exists() else None,
+            "first_section": len(sections),
+        }
+        for entry, text in iter_document_sections(tool_folder, doc_type):
+            encoded = text.encode("utf-8")
+            table += _SECTION.pack(offset, len(encoded), len(documents))
+            texts.append(encoded)
+            offset += len(encoded)
+            sections.append([entry.id, entry.title, entry.depth, list(entry.path)])
+        document["section_count"] = len(sections) - document["first_section"]
+        documents.append(document)
+
+    meta = json.dumps(
+        {"documents": documents, "tools": tools, "sections": sections},
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+    meta_offset = _HEADER.size + len(table)
+    text_offset = meta_offset + len(meta)
+    header = _HEADER.pack(
+        CORPUS_MAGIC, CORPUS_VERSION, len(sections), signature, meta_offset, len(meta), text_offset
+    )
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(header)
+        f.write(table)
+        f.write(meta)
+        f.writelines(texts)
+    os.replace(tmp_name, path)
+    return path
+
+
+class CompiledCorpus:
+    """Read-only view of a compiled corpus file."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < _HEADER.size:
+                raise CorpusFormatError(f"Truncated corpus file: {self.path}")
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count, signature, meta_offset, meta_length, text_offset = (
+            _HEADER.unpack_from(self._mmap, 0)
+        )
+        if magic != CORPUS_MAGIC or version != CORPUS_VERSION:
+            self._mmap.close()
+            raise CorpusFormatError(f"Unsupported corpus file (version {version}): {self.path}")
+        if text_offset > size or meta_offset + meta_length > size:
+            self._mmap.close()
+            raise CorpusFormatError(f"Truncated corpus file: {self.path}")
+        self.signature: bytes = signature
+        self._count = count
+        self._meta_offset = meta_offset
+        self._meta_length = meta_length
+        self._text_offset = text_offset
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __enter__(self) -> "CompiledCorpus":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._mmap.close()
+
+    @cached_property
+    def _meta(self) -> dict[str, Any]:
+        start = self._meta_offset
+        return json.loads(self._mmap[start : start + self._meta_length])
+
+    @property
+    def documents(self) -> list[tuple[str, str]]:
+        """``(tool, doc_type)`` of every document, in data directory order."""
+        return [(d["tool"], d["doc_type"]) for d in self._meta["documents"]]
+
+    @cached_property
+    def _document_index(self) -> dict[tuple[str, str], dict[str, Any]]:
+        return {(d["tool"], d["doc_type"]): d for d in self._meta["documents"]}
+
+    def tool_info(self, tool: str) -> dict[str, Any]:
+        return self._meta["tools"][tool]
+
+    def toc(self, tool: str, doc_type: str) -> dict[str, Any] | None:
+        return self._document_index[(tool, doc_type)]["toc"]
+
+    def section_bytes(self, index: int) -> memoryview:
+        """UTF-8 text of section ``index`` as a zero-copy view into the mapped file."""
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        offset, length, _ = _SECTION.unpack_from(self._mmap, _HEADER.size + index * _SECTION.size)
+        start = self._text_offset + offset
+        return memoryview(self._mmap)[start : start + length]
+
+    def section_text(self, index: int) -> str:
+        return str(self.section_bytes(index), "utf-8")
+
+    def section_entry(self, index: int) -> TocEntry:
+        section_id, title, depth, path = self._meta["sections"][index]
+        return TocEntry(id=section_id, title=title, depth=depth, path=tuple(path))
+
+    def iter_document_sections(self, tool: str, doc_type: str) -> Iterator[tuple[TocEntry, str]]:
+        """Same contract as ``rag.ingestion.iter_document_sections``, without HTML parsing."""
+        document = self._document_index[(tool, doc_type)]
+        first = document["first_section"]
+        for index in range(first, first + document["section_count"]):
+            yield self.section_entry(index), self.section_text(index)
+
+    def iter_sections(self) -> Iterator[tuple[str, str, TocEntry, str]]:
+        """Yields ``(tool, doc_type, entry, text)`` for every section of the corpus."""
+        for tool, doc_type in self.documents:
+            for entry, text in self.iter_document_sections(tool, doc_type):
+                yield tool, doc_type, entry, text
+
+
+def open_corpus(data_dir: str | Path | None = None) -> CompiledCorpus:
+    """Opens the compiled corpus of the data directory, recompiling it if sources changed."""
+    root = resolve_data_dir(data_dir)
+    path = corpus_path(root)
+    if path.exists():
+        try:
+            corpus = CompiledCorpus(path)
+        except CorpusFormatError:
+            pass
+        else:
+            if corpus.signature == source_signature(root):
+                return corpus
+            corpus.close()
+    return CompiledCorpus(compile_corpus(root, path))
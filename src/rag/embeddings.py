@@ -0,0 +1,158 @@
+"""
+Batched, cached embedding service.
+
+Texts are deduplicated, looked up in a persistent SQLite cache keyed by model name and
+text hash, and only the misses are sent to the API, in batches that run concurrently
+under the shared per-model rate limiter. Re-embedding an unchanged corpus therefore
+makes no API calls.
+"""
+
+import hashlib
+import sqlite3
+import threading
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+from core.settings import BASE_DIR, get_settings
+from utils.openai_client import get_rate_limited_openai_client
+from utils.rate_limiter import call_with_rate_limit, set_rate_limit
+from utils.tokens import estimate_tokens
+
+# SQLite caps the number of bound parameters per statement.
+_SQL_PARAM_BATCH = 500
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Persistent ``(model, text_hash) -> float32 vector`` store backed by SQLite."""
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " model TEXT NOT NULL, text_hash TEXT NOT NULL, vector BLOB NOT NULL,"
+            " PRIMARY KEY (model, text_hash))"
+        )
+        self._conn.commit()
+
+    def get_many(self, model: str, hashes: list[str]) -> dict[str, list[float]]:
+        found: dict[str, list[float]] = {}
+        with self._lock:
+            for start in range(0, len(hashes), _SQL_PARAM_BATCH):
+                batch = hashes[start : start + _SQL_PARAM_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings "
+                    f"WHERE model = ? AND text_hash IN ({placeholders})",
+                    [model, *batch],
+                )
+                for key, blob in rows:
+                    found[key] = array("f", blob).tolist()
+        return found
+
+    def put_many(self, model: str, items: dict[str, list[float]]) -> None:
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, vector) VALUES (?, ?, ?)",
+                [(model, key, array("f", vector).tobytes()) for key, vector in items.items()],
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class EmbeddingService:
+    """Embeds texts through the OpenAI-compatible API with batching, dedup and caching."""
+
+    def __init__(
+        self,
+        model: str | None = None,
+        batch_size: int | None = None,
+        concurrency: int | None = None,
+        cache: EmbeddingCache | None = None,
+        client=None,
+    ):
+        settings = get_settings()
+        self.model = model or settings.embedding_model
+        self.batch_size = batch_size or settings.embedding_batch_size
+        self.concurrency = concurrency or settings.embedding_concurrency
+        self.cache = cache
+        self._client = client
+        self.api_calls = 0
+        self._calls_lock = threading.Lock()
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = get_rate_limited_openai_client()
+        return self._client
+
+    def _embed_batch(self, texts: list[str]) -> list[list[float]]:
+        response = call_with_rate_limit(
+            lambda: self.client.embeddings.create(model=self.model, input=texts),
+            model=self.model,
+            estimated_tokens=sum(estimate_tokens(text) for text in texts),
+        )
+        with self._calls_lock:
+            self.api_calls += 1
+        return [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        """Returns one vector per input text, in input order."""
+        if not texts:
+            return []
+
+        unique: dict[str, str] = {}
+        for text in texts:
+            unique.setdefault(text_hash(text), text)
+
+        vectors = self.cache.get_many(self.model, list(unique)) if self.cache else {}
+        missing = [key for key in unique if key not in vectors]
+
+        if missing:
+            batches = [
+                missing[start : start + self.batch_size]
+                for start in range(0, len(missing), self.batch_size)
+            ]
+            workers = min(self.concurrency, len(batches))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = executor.map(
+                    lambda keys: self._embed_batch([unique[key] for key in keys]), batches
+                )
+                fresh: dict[str, list[float]] = {}
+                for keys, batch_vectors in zip(batches, results, strict=True):
+                    fresh.update(zip(keys, batch_vectors, strict=True))
+            if self.cache:
+                self.cache.put_many(self.model, fresh)
+            vectors.update(fresh)
+
+        return [vectors[text_hash(text)] for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.embed([text])[0]
+
+
+@lru_cache(maxsize=1)
+def get_embedding_service() -> EmbeddingService:
+    """Process-wide embedding service configured from settings."""
+    settings = get_settings()
+    if settings.embedding_requests_per_minute or settings.embedding_tokens_per_minute:
+        set_rate_limit(
+            settings.embedding_model,
+            settings.embedding_requests_per_minute,
+            settings.embedding_tokens_per_minute,
+        )
+    cache_path = Path(settings.embedding_cache_path)
+    if not cache_path.is_absolute():
+        cache_path = BASE_DIR / cache_path
+    return EmbeddingService(cache=EmbeddingCache(cache_path))
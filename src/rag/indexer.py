@@ -0,0 +1,323 @@
+"""
+Incremental indexing of document chunks into the vector store (Chroma or NumPy).
+
+A state file next to the store records a content hash per source document and per
+chunk. Each run only re-chunks documents whose sources changed, embeds and upserts
+the chunks that are new or different, and deletes chunks that no longer exist, so
+re-index time follows the size of the change rather than the size of the corpus.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from core.settings import BASE_DIR, get_settings
+from rag.bm25 import BM25_FILENAME, BM25Index
+from rag.corpus import CompiledCorpus, open_corpus
+from rag.embeddings import get_embedding_service
+from rag.ingestion import (
+    Chunk,
+    iter_corpus_chunks,
+    iter_corpus_documents,
+    iter_document_chunks,
+    resolve_data_dir,
+)
+
+STATE_FILENAME = "index_state.json"
+STATE_VERSION = 1
+# Chunks embedded per flush; the embedding service splits these into concurrent API batches.
+UPSERT_BATCH_SIZE = 1024
+
+EmbedFn = Callable[[list[str]], list[list[float]]]
+
+
+@dataclass
+class IndexStats:
+    """Counters reported by a single indexing run."""
+
+    files_scanned: int = 0
+    files_changed: int = 0
+    files_removed: int = 0
+    chunks_upserted: int = 0
+    chunks_deleted: int = 0
+    chunks_unchanged: int = 0
+    keyword_index_rebuilt: bool = False
+
+
+def resolve_store_dir(store_dir: str | Path | None = None) -> Path:
+    """Returns the vector store directory, resolving relative paths against the project root."""
+    path = Path(store_dir if store_dir is not None else get_settings().chroma_persist_directory)
+    return path if path.is_absolute() else BASE_DIR / path
+
+
+def hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def hash_chunk(chunk: Chunk) -> str:
+    payload = json.dumps([chunk.text, chunk.metadata()], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def index_versions(store_dir: str | Path | None = None) -> dict[str, str]:
+    """Returns a version per indexed tool that changes whenever its documents are re-indexed.
+
+    The version is derived from the source hashes recorded in the index state, so it is
+    stable across runs that change nothing and differs after any edit to ``data/<Tool>``.
+    """
+    state_path = resolve_store_dir(store_dir) / STATE_FILENAME
+    if not state_path.exists():
+        return {}
+    state = json.loads(state_path.read_text(encoding="utf-8"))
+    per_tool: dict[str, list[str]] = {}
+    for key, entry in sorted(state.get("files", {}).items()):
+        tool, _, doc_type = key.partition("/")
+        per_tool.setdefault(tool, []).append(f"{doc_type}:{entry['hash']}")
+    return {
+        tool: hashlib.sha256("\n".join(entries).encode("utf-8")).hexdigest()[:16]
+        for tool, entries in per_tool.items()
+    }
+
+
+def get_collection(store_dir: Path, name: str | None = None) -> Any:
+    """Opens (or creates) the Chroma collection holding document chunks."""
+    import chromadb
+
+    client = chromadb.PersistentClient(path=str(store_dir))
+    return client.get_or_create_collection(
+        name=name or get_settings().chroma_collection, metadata={"hnsw:space": "cosine"}
+    )
+
+
+def open_vector_store(store_dir: Path) -> Any:
+    """Opens the configured vector store: a Chroma collection or a ``NumpyVectorStore``."""
+    settings = get_settings()
+    if settings.vector_store == "numpy":
+        from rag.numpy_store import NumpyVectorStore
+
+        return NumpyVectorStore(store_dir, dtype=settings.vector_store_dtype)
+    return get_collection(store_dir)
+
+
+def reset_vector_store(store_dir: Path) -> Any:
+    """Removes every vector from the configured store and returns it reopened."""
+    settings = get_settings()
+    if settings.vector_store == "numpy":
+        store = open_vector_store(store_dir)
+        store.reset()
+        return store
+    import chromadb
+
+    get_collection(store_dir)
+    chromadb.PersistentClient(path=str(store_dir)).delete_collection(settings.chroma_collection)
+    return get_collection(store_dir)
+
+
+class IncrementalIndexer:
+    """Keeps a vector collection in sync with the ``data/`` corpus using content hashes."""
+
+    def __init__(
+        self,
+        collection: Any,
+        state_path: Path,
+        embed_fn: EmbedFn | None = None,
+        data_dir: str | Path | None = None,
+    ):
+        self.collection = collection
+        self.state_path = state_path
+        self.embed_fn = embed_fn or get_embedding_service().embed
+        self.data_dir = resolve_data_dir(data_dir)
+        self.state = self._load_state()
+        self._pending: list[Chunk] = []
+        # State entries of documents whose chunks are queued but not yet upserted.
+        self._pending_files: dict[str, dict[str, Any]] = {}
+        # Opened on the first changed document; unchanged runs never touch the sources.
+        self._corpus: CompiledCorpus | None = None
+
+    def _config_fingerprint(self) -> dict[str, Any]:
+        # Any change here alters every chunk or vector, so the index is rebuilt.
+        settings = get_settings()
+        return {
+            "version": STATE_VERSION,
+            "embedding_model": settings.embedding_model,
+            "chunk_size": settings.chunk_size,
+            "chunk_overlap": settings.chunk_overlap,
+            "vector_store": settings.vector_store,
+            "vector_store_dtype": settings.vector_store_dtype,
+            "collection": settings.chroma_collection,
+        }
+
+    def _load_state(self) -> dict[str, Any]:
+        if self.state_path.exists():
+            state = json.loads(self.state_path.read_text(encoding="utf-8"))
+            if state.get("config") == self._config_fingerprint():
+                return state
+        return {"config": self._config_fingerprint(), "files": {}}
+
+    def save_state(self) -> None:
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.state_path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(self.state, f)
+        os.replace(tmp_name, self.state_path)
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.state["files"]
+
+    @property
+    def chunk_count(self) -> int:
+        """Number of chunks the state records as indexed."""
+        return sum(len(entry["chunks"]) for entry in self.state["files"].values())
+
+    def _source_signature(self, tool_folder: Path, doc_type: str) -> dict[str, Any]:
+        """Cheap stat-based signature of a document's sources (HTML + TOC)."""
+        signature = {}
+        for path in (tool_folder / f"{doc_type}.html", tool_folder / f"toc_{doc_type}.json"):
+            if path.exists():
+                stat = path.stat()
+                signature[path.name] = [stat.st_size, stat.st_mtime_ns]
+        return signature
+
+    def _source_hash(self, tool_folder: Path, doc_type: str) -> str:
+        digest = hashlib.sha256()
+        for path in (tool_folder / f"{doc_type}.html", tool_folder / f"toc_{doc_type}.json"):
+            if path.exists():
+                digest.update(hash_file(path).encode("ascii"))
+        return digest.hexdigest()
+
+    def _flush(self, stats: IndexStats) -> None:
+        """Embeds and upserts queued chunks, then commits the state of finished documents.
+
+        Chunks are queued across documents so small edits to many files still share a
+        few embedding requests.
+        """
+        if self._pending:
+            batch, self._pending = self._pending, []
+            embeddings = self.embed_fn([chunk.text for chunk in batch])
+            self.collection.upsert(
+                ids=[chunk.chunk_id for chunk in batch],
+                embeddings=embeddings,
+                documents=[chunk.text for chunk in batch],
+                metadatas=[chunk.metadata() for chunk in batch],
+            )
+            stats.chunks_upserted += len(batch)
+        self.state["files"].update(self._pending_files)
+        self._pending_files.clear()
+
+    def _delete(self, chunk_ids: list[str], stats: IndexStats) -> None:
+        if chunk_ids:
+            self.collection.delete(ids=chunk_ids)
+            stats.chunks_deleted += len(chunk_ids)
+
+    def _index_document(self, tool_folder: Path, doc_type: str, stats: IndexStats) -> None:
+        key = f"{tool_folder.name}/{doc_type}"
+        previous = self.state["files"].get(key)
+        signature = self._source_signature(tool_folder, doc_type)
+
+        if previous and previous["signature"] == signature:
+            stats.chunks_unchanged += len(previous["chunks"])
+            return
+
+        source_hash = self._source_hash(tool_folder, doc_type)
+        if previous and previous["hash"] == source_hash:
+            # Touched but identical: refresh the signature only.
+            previous["signature"] = signature
+            stats.chunks_unchanged += len(previous["chunks"])
+            return
+
+        stats.files_changed += 1
+        old_chunks: dict[str, str] = previous["chunks"] if previous else {}
+        new_chunks: dict[str, str] = {}
+        if self._corpus is None:
+            self._corpus = open_corpus(self.data_dir)
+        sections = self._corpus.iter_document_sections(tool_folder.name, doc_type)
+        for chunk in iter_document_chunks(tool_folder, doc_type, sections=sections):
+            chunk_hash = hash_chunk(chunk)
+            new_chunks[chunk.chunk_id] = chunk_hash
+            if old_chunks.get(chunk.chunk_id) == chunk_hash:
+                stats.chunks_unchanged += 1
+                continue
+            self._pending.append(chunk)
+            if len(self._pending) >= UPSERT_BATCH_SIZE:
+                self._flush(stats)
+
+        self._delete([cid for cid in old_chunks if cid not in new_chunks], stats)
+        self._pending_files[key] = {
+            "signature": signature,
+            "hash": source_hash,
+            "chunks": new_chunks,
+        }
+
+    def run(self) -> IndexStats:
+        """Synchronises the collection with the corpus and persists the new state."""
+        stats = IndexStats()
+        seen: set[str] = set()
+        try:
+            for tool_folder, doc_type in iter_corpus_documents(self.data_dir):
+                stats.files_scanned += 1
+                seen.add(f"{tool_folder.name}/{doc_type}")
+                self._index_document(tool_folder, doc_type, stats)
+            self._flush(stats)
+
+            for key in [k for k in self.state["files"] if k not in seen]:
+                self._delete(list(self.state["files"].pop(key)["chunks"]), stats)
+                stats.files_removed += 1
+        finally:
+            # Stores that buffer writes (NumpyVectorStore) must be on disk before the state.
+            persist = getattr(self.collection, "persist", None)
+            if persist is not None:
+                persist()
+            self.save_state()
+            if self._corpus is not None:
+                self._corpus.close()
+                self._corpus = None
+        return stats
+
+
+def build_index(
+    rebuild: bool = False,
+    embed_fn: EmbedFn | None = None,
+    store_dir: str | Path | None = None,
+    data_dir: str | Path | None = None,
+) -> IndexStats:
+    """Incrementally indexes the corpus into the vector store and refreshes the BM25 index.
+
+    Args:
+        rebuild: Drop the vectors and state and index everything from scratch.
+        embed_fn: Function embedding a batch of texts (defaults to the cached embedding service).
+        store_dir: Vector store directory (defaults to ``settings.chroma_persist_directory``).
+        data_dir: Corpus directory (defaults to ``settings.data_dir``).
+
+    Returns:
+        IndexStats: What changed in this run.
+    """
+    store = resolve_store_dir(store_dir)
+    state_path = store / STATE_FILENAME
+    collection = open_vector_store(store)
+
+    indexer = IncrementalIndexer(collection, state_path, embed_fn=embed_fn, data_dir=data_dir)
+    if rebuild or collection.count() != indexer.chunk_count:
+        # The state does not describe the collection (e.g. the store dropped vectors written
+        # with another dtype, or the state is missing); its contents are unknown, start clean.
+        collection = reset_vector_store(store)
+        state_path.unlink(missing_ok=True)
+        indexer = IncrementalIndexer(collection, state_path, embed_fn=embed_fn, data_dir=data_dir)
+
+    stats = indexer.run()
+
+    # The keyword index is small and cheap to rebuild; refresh it whenever the corpus changed.
+    bm25_path = store / BM25_FILENAME
+    if rebuild or stats.files_changed or stats.files_removed or not bm25_path.exists():
+        BM25Index.build(iter_corpus_chunks(data_dir)).save(bm25_path)
+        stats.keyword_index_rebuilt = True
+    return stats
@@ -0,0 +1,258 @@
+"""
+Document ingestion pipeline.
+
+Streams every ``data/<Tool>/<document_type>.html`` through lxml once, splits the text on
+h2–h6 headings, aligns each heading with the matching entry of ``toc_<document_type>.json``
+and yields size-bounded chunks with tool/document/section metadata. Everything is a
+generator, so memory stays flat regardless of corpus size.
+
+Whole-corpus readers go through the compiled corpus (``rag.corpus``), which caches the
+parsed sections in a memory-mapped file and only re-parses when a source file changes.
+"""
+
+import json
+import re
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from core.settings import BASE_DIR, get_settings
+
+HEADING_TAGS = {"h2", "h3", "h4", "h5", "h6"}
+# Leaf-level text containers; their text is collected when the element closes.
+BLOCK_TAGS = {"p", "li", "td", "th", "dt", "dd", "pre", "blockquote", "caption"}
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+
+@dataclass(frozen=True)
+class TocEntry:
+    """A TOC section flattened in depth-first order."""
+
+    id: str
+    title: str
+    depth: int
+    path: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class Chunk:
+    """A piece of section text with the metadata needed for retrieval and citations."""
+
+    chunk_id: str
+    text: str
+    tool: str
+    doc_type: str
+    section_id: str
+    section_title: str
+    section_path: tuple[str, ...]
+    depth: int
+    chunk_index: int
+    source: str
+
+    def metadata(self) -> dict[str, Any]:
+        """Flat, scalar-only metadata (as required by vector stores)."""
+        return {
+            "tool": self.tool,
+            "doc_type": self.doc_type,
+            "section_id": self.section_id,
+            "section_title": self.section_title,
+            "section_path": " > ".join(self.section_path),
+            "depth": self.depth,
+            "chunk_index": self.chunk_index,
+            "source": self.source,
+        }
+
+
+def resolve_data_dir(data_dir: str | Path | None = None) -> Path:
+    """Returns the data directory, resolving relative paths against the project root."""
+    path = Path(data_dir if data_dir is not None else get_settings().data_dir)
+    return path if path.is_absolute() else BASE_DIR / path
+
+
+def normalize_text(text: str) -> str:
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+def slugify(title: str) -> str:
+    return _SLUG_RE.sub("-", title.lower()).strip("-")
+
+
+def flatten_toc(toc: dict[str, Any]) -> list[TocEntry]:
+    """Flattens a TOC JSON object into depth-first entries with their title path."""
+    entries: list[TocEntry] = []
+
+    def walk(sections: list[dict], depth: int, parents: tuple[str, ...]) -> None:
+        for section in sections:
+            path = (*parents, section["title"])
+            entries.append(
+                TocEntry(
+                    id=section.get("id") or slugify(section["title"]),
+                    title=section["title"],
+                    depth=depth,
+                    path=path,
+                )
+            )
+            walk(section.get("subsections") or [], depth + 1, path)
+
+    walk(toc.get("sections", []), 0, ())
+    return entries
+
+
+def iter_html_sections(html_path: Path) -> Iterator[tuple[str, int, str]]:
+    """Streams an HTML file and yields (heading_text, heading_level, section_text).
+
+    Parsing is incremental (lxml iterparse) and processed elements are cleared, so a
+    document is never held in memory as a full tree. Text before the first h2–h6 heading
+    (the document title) is skipped.
+    """
+    from lxml import etree
+
+    heading: tuple[str, int] | None = None
+    parts: list[str] = []
+    for _, element in etree.iterparse(str(html_path), events=("end",), html=True):
+        tag = element.tag if isinstance(element.tag, str) else ""
+        if tag in HEADING_TAGS:
+            if heading is not None:
+                yield heading[0], heading[1], normalize_text(" ".join(parts))
+            heading = (normalize_text("".join(element.itertext())), int(tag[1]))
+            parts = []
+            element.clear(keep_tail=True)
+        elif tag in BLOCK_TAGS:
+            if heading is not None:
+                text = "".join(element.itertext())
+                if text.strip():
+                    parts.append(text)
+            # Clearing after collection stops parent blocks (li > p) from repeating the text.
+            element.clear(keep_tail=True)
+
+    if heading is not None:
+        yield heading[0], heading[1], normalize_text(" ".join(parts))
+
+
+def split_text(text: str, chunk_size: int, chunk_overlap: int) -> list[str]:
+    """Splits text into windows of at most ``chunk_size`` characters on word boundaries.
+
+    Consecutive windows share roughly ``chunk_overlap`` characters.
+    """
+    if len(text) <= chunk_size:
+        return [text] if text else []
+
+    overlap = min(chunk_overlap, chunk_size // 2)
+    chunks: list[str] = []
+    start = 0
+    while start < len(text):
+        end = min(start + chunk_size, len(text))
+        if end < len(text):
+            boundary = text.rfind(" ", start + overlap + 1, end)
+            if boundary != -1:
+                end = boundary
+        chunks.append(text[start:end].strip())
+        if end >= len(text):
+            break
+        next_start = end - overlap
+        if overlap:
+            space = text.find(" ", next_start, end)
+            next_start = space + 1 if space != -1 else next_start
+        start = max(next_start, start + 1)
+    return [c for c in chunks if c]
+
+
+def _align_with_toc(
+    headings: Iterator[tuple[str, int, str]], toc_entries: list[TocEntry]
+) -> Iterator[tuple[TocEntry, str]]:
+    """Pairs streamed headings with TOC entries.
+
+    Headings normally appear in TOC order; when a title does not match the expected
+    entry, the next entry with the same title is used, and headings missing from the
+    TOC get a synthetic entry derived from the heading itself.
+    """
+    cursor = 0
+    for title, level, text in headings:
+        entry = None
+        if cursor < len(toc_entries) and toc_entries[cursor].title.strip() == title:
+            entry = toc_entries[cursor]
+            cursor += 1
+        else:
+            for i in range(cursor, len(toc_entries)):
+                if toc_entries[i].title.strip() == title:
+                    entry = toc_entries[i]
+                    cursor = i + 1
+                    break
+        if entry is None:
+            entry = TocEntry(id=slugify(title), title=title, depth=level - 2, path=(title,))
+        yield entry, text
+
+
+def iter_document_sections(tool_folder: Path, doc_type: str) -> Iterator[tuple[TocEntry, str]]:
+    """Yields every section of one document with its TOC entry and full text."""
+    html_path = tool_folder / f"{doc_type}.html"
+    toc_path = tool_folder / f"toc_{doc_type}.json"
+    toc_entries = (
+        flatten_toc(json.loads(toc_path.read_text(encoding="utf-8"))) if toc_path.exists() else []
+    )
+    yield from _align_with_toc(iter_html_sections(html_path), toc_entries)
+
+
+def iter_document_chunks(
+    tool_folder: Path,
+    doc_type: str,
+    chunk_size: int | None = None,
+    chunk_overlap: int | None = None,
+    sections: Iterable[tuple[TocEntry, str]] | None = None,
+) -> Iterator[Chunk]:
+    """Yields the chunks of one document (``<doc_type>.html`` aligned with ``toc_<doc_type>.json``).
+
+    ``sections`` are already parsed sections of the document (e.g. from the compiled
+    corpus); when omitted the HTML is parsed.
+    """
+    settings = get_settings()
+    chunk_size = chunk_size or settings.chunk_size
+    chunk_overlap = settings.chunk_overlap if chunk_overlap is None else chunk_overlap
+    html_path = tool_folder / f"{doc_type}.html"
+    if sections is None:
+        sections = iter_document_sections(tool_folder, doc_type)
+
+    for entry, text in sections:
+        for index, piece in enumerate(split_text(text, chunk_size, chunk_overlap)):
+            yield Chunk(
+                chunk_id=f"{tool_folder.name}/{doc_type}/{entry.id}/{index}",
+                text=piece,
+                tool=tool_folder.name,
+                doc_type=doc_type,
+                section_id=entry.id,
+                section_title=entry.title,
+                section_path=entry.path,
+                depth=entry.depth,
+                chunk_index=index,
+                source=str(html_path),
+            )
+
+
+def iter_corpus_documents(data_dir: str | Path | None = None) -> Iterator[tuple[Path, str]]:
+    """Yields (tool_folder, doc_type) for every generated HTML document in the data directory."""
+    root = resolve_data_dir(data_dir)
+    for tool_folder in sorted(root.iterdir()):
+        if not tool_folder.is_dir() or not (tool_folder / "tool_info.json").exists():
+            continue
+        for html_path in sorted(tool_folder.glob("*.html")):
+            yield tool_folder, html_path.stem
+
+
+def iter_corpus_chunks(
+    data_dir: str | Path | None = None,
+    chunk_size: int | None = None,
+    chunk_overlap: int | None = None,
+) -> Iterator[Chunk]:
+    """Yields chunks for the whole corpus, one document at a time, from the compiled corpus."""
+    from rag.corpus import open_corpus
+
+    root = resolve_data_dir(data_dir)
+    with open_corpus(root) as corpus:
+        for tool, doc_type in corpus.documents:
+            sections = corpus.iter_document_sections(tool, doc_type)
+            yield from iter_document_chunks(
+                root / tool, doc_type, chunk_size, chunk_overlap, sections=sections
+            )
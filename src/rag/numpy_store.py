@@ -0,0 +1,238 @@
+"""
+Flat vector store backed by memory-mapped NumPy files.
+
+For a corpus of tens of thousands of chunks a brute-force cosine scan is a few
+milliseconds, cheaper than starting a vector database client. Vectors are normalised
+and stored in ``vectors.npy`` as float32, float16 or int8 (symmetric per-row scale in
+``vectors.scales.npy``); chunk ids and the tool / document type of every row live in
+the ``vectors.meta.json`` sidecar. Files are opened with ``mmap_mode="r"``, so opening
+the store is near-instant and worker processes share the same pages from the OS cache.
+
+The store implements the part of the Chroma collection API the indexer uses
+(``upsert``, ``delete``, ``count``), buffering changes in memory until ``persist()``
+rewrites the files atomically. Chunk texts are not stored here; search results are
+hydrated from the BM25 sidecar.
+"""
+
+import json
+import os
+import tempfile
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+VECTORS_FILENAME = "vectors.npy"
+SCALES_FILENAME = "vectors.scales.npy"
+META_FILENAME = "vectors.meta.json"
+STORE_VERSION = 1
+
+DTYPES = ("float32", "float16", "int8")
+
+# Rows converted to float32 at a time when scoring quantised vectors (fits in L2 cache).
+_SCORE_BLOCK_ROWS = 512
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    return vectors / (np.linalg.norm(vectors, axis=-1, keepdims=True) + 1e-12)
+
+
+def _atomic_save(path: Path, array: np.ndarray) -> None:
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp.npy")
+    with os.fdopen(fd, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp_name, path)
+
+
+class NumpyVectorStore:
+    """Memory-mapped brute-force cosine vector store."""
+
+    def __init__(self, store_dir: str | Path, dtype: str = "float32"):
+        if dtype not in DTYPES:
+            raise ValueError(f"Unsupported vector dtype: {dtype} (expected one of {DTYPES})")
+        self.store_dir = Path(store_dir)
+        self.dtype = dtype
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        meta_path = self.store_dir / META_FILENAME
+        meta = json.loads(meta_path.read_text(encoding="utf-8")) if meta_path.exists() else None
+        if meta is None or meta.get("version") != STORE_VERSION or meta.get("dtype") != self.dtype:
+            # Missing or written with other settings: start empty (the indexer re-fills it).
+            self.ids: list[str] = []
+            self.tool_names: list[str] = []
+            self.doc_type_names: list[str] = []
+            self.tool_codes = np.empty(0, dtype=np.int32)
+            self.doc_type_codes = np.empty(0, dtype=np.int32)
+            self.vectors: np.ndarray = np.empty((0, 0), dtype=self.dtype)
+            self.scales: np.ndarray | None = None
+            return
+        self.ids = meta["ids"]
+        self.tool_names = meta["tools"]
+        self.doc_type_names = meta["doc_types"]
+        self.tool_codes = np.asarray(meta["tool_codes"], dtype=np.int32)
+        self.doc_type_codes = np.asarray(meta["doc_type_codes"], dtype=np.int32)
+        self.vectors = np.load(self.store_dir / VECTORS_FILENAME, mmap_mode="r")
+        self.scales = (
+            np.load(self.store_dir / SCALES_FILENAME, mmap_mode="r")
+            if self.dtype == "int8"
+            else None
+        )
+
+    def count(self) -> int:
+        return len(self.ids)
+
+    def _quantize(self, vectors: np.ndarray) -> tuple[np.ndarray, np.ndarray | None]:
+        if self.dtype == "float32":
+            return vectors, None
+        if self.dtype == "float16":
+            return vectors.astype(np.float16), None
+        scales = np.abs(vectors).max(axis=1) / 127.0 + 1e-12
+        return np.round(vectors / scales[:, None]).astype(np.int8), scales.astype(np.float32)
+
+    def _code(self, names: list[str], value: str) -> int:
+        try:
+            return names.index(value)
+        except ValueError:
+            names.append(value)
+            return len(names) - 1
+
+    def upsert(
+        self,
+        ids: list[str],
+        embeddings: list[list[float]],
+        documents: list[str] | None = None,
+        metadatas: list[dict[str, Any]] | None = None,
+    ) -> None:
+        """Inserts or replaces rows (``documents`` are accepted for API parity and ignored)."""
+        if not ids:
+            return
+        vectors, scales = self._quantize(_normalize(embeddings))
+        metadatas = metadatas or [{} for _ in ids]
+        tool_codes = np.asarray(
+            [self._code(self.tool_names, m.get("tool", "")) for m in metadatas], dtype=np.int32
+        )
+        doc_type_codes = np.asarray(
+            [self._code(self.doc_type_names, m.get("doc_type", "")) for m in metadatas],
+            dtype=np.int32,
+        )
+
+        positions = {chunk_id: i for i, chunk_id in enumerate(self.ids)}
+        existing = [(row, positions[cid]) for row, cid in enumerate(ids) if cid in positions]
+        new_rows = [row for row, cid in enumerate(ids) if cid not in positions]
+
+        if self.ids:
+            base = np.array(self.vectors)
+        else:
+            base = np.empty((0, vectors.shape[1]), dtype=vectors.dtype)
+        base_scales = np.array(self.scales) if self.scales is not None else None
+        tool_base, doc_base = self.tool_codes.copy(), self.doc_type_codes.copy()
+        for row, position in existing:
+            base[position] = vectors[row]
+            tool_base[position], doc_base[position] = tool_codes[row], doc_type_codes[row]
+            if scales is not None:
+                base_scales[position] = scales[row]
+
+        self.vectors = np.concatenate([base, vectors[new_rows]])
+        if scales is not None:
+            previous = base_scales if base_scales is not None else np.empty(0, np.float32)
+            self.scales = np.concatenate([previous, scales[new_rows]])
+        self.tool_codes = np.concatenate([tool_base, tool_codes[new_rows]])
+        self.doc_type_codes = np.concatenate([doc_base, doc_type_codes[new_rows]])
+        self.ids = [*self.ids, *(ids[row] for row in new_rows)]
+        self._dirty = True
+
+    def delete(self, ids: list[str]) -> None:
+        removed = set(ids)
+        keep = np.asarray([chunk_id not in removed for chunk_id in self.ids], dtype=bool)
+        if keep.all():
+            return
+        self.vectors = np.array(self.vectors[keep])
+        if self.scales is not None:
+            self.scales = np.array(self.scales[keep])
+        self.tool_codes = self.tool_codes[keep]
+        self.doc_type_codes = self.doc_type_codes[keep]
+        self.ids = [chunk_id for chunk_id, kept in zip(self.ids, keep, strict=True) if kept]
+        self._dirty = True
+
+    def persist(self) -> None:
+        """Writes buffered changes and re-opens the files memory-mapped."""
+        if not self._dirty:
+            return
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        _atomic_save(self.store_dir / VECTORS_FILENAME, np.ascontiguousarray(self.vectors))
+        if self.scales is not None:
+            _atomic_save(self.store_dir / SCALES_FILENAME, np.ascontiguousarray(self.scales))
+        meta = {
+            "version": STORE_VERSION,
+            "dtype": self.dtype,
+            "ids": self.ids,
+            "tools": self.tool_names,
+            "doc_types": self.doc_type_names,
+            "tool_codes": self.tool_codes.tolist(),
+            "doc_type_codes": self.doc_type_codes.tolist(),
+        }
+        # The sidecar is written last: readers never see metadata for vectors not on disk.
+        fd, tmp_name = tempfile.mkstemp(dir=self.store_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(meta, f, separators=(",", ":"))
+        os.replace(tmp_name, self.store_dir / META_FILENAME)
+        self._dirty = False
+        self._load()
+
+    def reset(self) -> None:
+        """Removes all vectors from disk and memory."""
+        for name in (VECTORS_FILENAME, SCALES_FILENAME, META_FILENAME):
+            (self.store_dir / name).unlink(missing_ok=True)
+        self._dirty = False
+        self._load()
+
+    def _filter_mask(
+        self, tools: Iterable[str] | None, doc_types: Iterable[str] | None
+    ) -> np.ndarray | None:
+        mask = None
+        if tools:
+            codes = [self.tool_names.index(t) for t in tools if t in self.tool_names]
+            mask = np.isin(self.tool_codes, codes)
+        if doc_types:
+            codes = [self.doc_type_names.index(d) for d in doc_types if d in self.doc_type_names]
+            doc_mask = np.isin(self.doc_type_codes, codes)
+            mask = doc_mask if mask is None else mask & doc_mask
+        return mask
+
+    def scores(self, vector: list[float]) -> np.ndarray:
+        """Cosine similarity of ``vector`` to every stored row."""
+        query = _normalize(vector)
+        if self.dtype == "float32":
+            return self.vectors @ query
+        scores = np.empty(len(self.ids), dtype=np.float32)
+        buffer = np.empty((_SCORE_BLOCK_ROWS, query.shape[0]), dtype=np.float32)
+        for start in range(0, len(self.ids), _SCORE_BLOCK_ROWS):
+            block = self.vectors[start : start + _SCORE_BLOCK_ROWS]
+            rows = len(block)
+            buffer[:rows] = block
+            scores[start : start + rows] = buffer[:rows] @ query
+        if self.scales is not None:
+            scores *= self.scales
+        return scores
+
+    def query(
+        self,
+        vector: list[float],
+        k: int,
+        tools: Iterable[str] | None = None,
+        doc_types: Iterable[str] | None = None,
+    ) -> list[tuple[str, float]]:
+        """Returns up to ``k`` ``(chunk_id, similarity)`` pairs, best first."""
+        if not self.ids:
+            return []
+        scores = self.scores(vector)
+        mask = self._filter_mask(tools, doc_types)
+        candidates = np.flatnonzero(mask) if mask is not None else np.arange(len(scores))
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k)[:k]]
+        ranked = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(self.ids[i], float(scores[i])) for i in ranked]
@@ -0,0 +1,187 @@
+"""
+Hybrid retrieval over the indexed corpus.
+
+A query runs against the BM25 keyword index and the vector store, and the two rankings
+are merged with reciprocal rank fusion (RRF), which needs no score calibration between
+the retrievers. Both indexes are built by the indexer and only loaded here, so the
+first query does not rebuild anything.
+"""
+
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Protocol
+
+from core.settings import get_settings
+from rag.bm25 import BM25_FILENAME, BM25Index
+from rag.indexer import open_vector_store, resolve_store_dir
+
+# Rank offset of reciprocal rank fusion; 60 is the value from the original RRF paper.
+DEFAULT_RRF_K = 60
+# Candidates taken from each retriever before fusion.
+DEFAULT_CANDIDATES = 50
+
+SEARCH_MODES = ("hybrid", "keyword", "vector")
+
+
+@dataclass
+class SearchResult:
+    chunk_id: str
+    text: str
+    metadata: dict[str, Any]
+    score: float
+    keyword_rank: int | None = None
+    vector_rank: int | None = None
+
+
+class VectorStore(Protocol):
+    def query(
+        self,
+        vector: list[float],
+        k: int,
+        tools: Iterable[str] | None = None,
+        doc_types: Iterable[str] | None = None,
+    ) -> list[tuple[str, float]]:
+        """Returns up to ``k`` ``(chunk_id, similarity)`` pairs, best first."""
+        ...
+
+
+def _in_filter(field: str, values: Iterable[str] | None) -> dict[str, Any] | None:
+    values = list(values or [])
+    if not values:
+        return None
+    return {field: values[0]} if len(values) == 1 else {field: {"$in": values}}
+
+
+class ChromaVectorStore:
+    """Vector search over the Chroma collection written by the indexer."""
+
+    def __init__(self, collection: Any):
+        self.collection = collection
+
+    def query(
+        self,
+        vector: list[float],
+        k: int,
+        tools: Iterable[str] | None = None,
+        doc_types: Iterable[str] | None = None,
+    ) -> list[tuple[str, float]]:
+        filters = [f for f in (_in_filter("tool", tools), _in_filter("doc_type", doc_types)) if f]
+        where = None if not filters else filters[0] if len(filters) == 1 else {"$and": filters}
+        result = self.collection.query(
+            query_embeddings=[vector], n_results=k, where=where, include=["distances"]
+        )
+        # Cosine space: distance = 1 - similarity.
+        return [
+            (chunk_id, 1.0 - distance)
+            for chunk_id, distance in zip(result["ids"][0], result["distances"][0], strict=True)
+        ]
+
+
+def reciprocal_rank_fusion(rankings: list[list[str]], k: int = DEFAULT_RRF_K) -> dict[str, float]:
+    """Fuses ranked id lists: each id scores ``sum(1 / (k + rank))`` over the lists it is in."""
+    scores: dict[str, float] = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, start=1):
+            scores[item] = scores.get(item, 0.0) + 1.0 / (k + rank)
+    return scores
+
+
+class HybridRetriever:
+    """Keyword + vector retrieval with reciprocal rank fusion and metadata filters."""
+
+    def __init__(
+        self,
+        keyword_index: BM25Index,
+        vector_store: VectorStore | None,
+        embed_fn: Callable[[str], list[float]] | None,
+        rrf_k: int = DEFAULT_RRF_K,
+        candidates: int = DEFAULT_CANDIDATES,
+    ):
+        self.keyword_index = keyword_index
+        self.vector_store = vector_store
+        self.embed_fn = embed_fn
+        self.rrf_k = rrf_k
+        self.candidates = candidates
+        self._positions = {chunk_id: i for i, chunk_id in enumerate(keyword_index.chunk_ids)}
+
+    def search(
+        self,
+        query: str,
+        k: int = 5,
+        tools: Iterable[str] | None = None,
+        doc_types: Iterable[str] | None = None,
+        mode: str = "hybrid",
+    ) -> list[SearchResult]:
+        """Returns the ``k`` best chunks for ``query``, optionally limited to tools / document types.
+
+        Args:
+            query: Natural-language question or keywords.
+            k: Number of results.
+            tools: Only return chunks of these tool folders.
+            doc_types: Only return chunks of these document types.
+            mode: ``hybrid`` (default), ``keyword`` or ``vector``.
+        """
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode: {mode}")
+        tools, doc_types = list(tools or []), list(doc_types or [])
+        depth = max(k, self.candidates)
+
+        keyword_ranking: list[str] = []
+        if mode in ("hybrid", "keyword"):
+            keyword_ranking = [
+                self.keyword_index.chunk_ids[i]
+                for i, _ in self.keyword_index.search(query, depth, tools, doc_types)
+            ]
+        vector_ranking: list[str] = []
+        if mode in ("hybrid", "vector") and self.vector_store is not None:
+            vector = self.embed_fn(query)
+            vector_ranking = [
+                chunk_id for chunk_id, _ in self.vector_store.query(vector, depth, tools, doc_types)
+            ]
+
+        fused = reciprocal_rank_fusion([keyword_ranking, vector_ranking], self.rrf_k)
+        keyword_ranks = {chunk_id: r for r, chunk_id in enumerate(keyword_ranking, start=1)}
+        vector_ranks = {chunk_id: r for r, chunk_id in enumerate(vector_ranking, start=1)}
+
+        results = []
+        for chunk_id in sorted(fused, key=fused.__getitem__, reverse=True):
+            position = self._positions.get(chunk_id)
+            if position is None:
+                # In the vector store but not in the keyword index: index is mid-rebuild.
+                continue
+            doc = self.keyword_index.docs[position]
+            results.append(
+                SearchResult(
+                    chunk_id=chunk_id,
+                    text=doc["text"],
+                    metadata=doc["metadata"],
+                    score=fused[chunk_id],
+                    keyword_rank=keyword_ranks.get(chunk_id),
+                    vector_rank=vector_ranks.get(chunk_id),
+                )
+            )
+            if len(results) == k:
+                break
+        return results
+
+
+def load_keyword_index(store_dir: str | Path | None = None) -> BM25Index:
+    return BM25Index.load(resolve_store_dir(store_dir) / BM25_FILENAME)
+
+
+@lru_cache(maxsize=1)
+def get_retriever() -> HybridRetriever:
+    """Process-wide retriever over the default store (indexes load on first use)."""
+    from rag.embeddings import get_embedding_service
+
+    store = resolve_store_dir()
+    vector_store = open_vector_store(store)
+    if get_settings().vector_store == "chroma":
+        vector_store = ChromaVectorStore(vector_store)
+    return HybridRetriever(
+        keyword_index=load_keyword_index(store),
+        vector_store=vector_store,
+        embed_fn=get_embedding_service().embed_query,
+    )
@@ -9,11 +9,13 @@ from pathlib import Path
 
 from loguru import logger
 
-from core.settings import settings
+from core.settings import get_settings
 
 
 def setup_logger() -> None:
     """Configure the application logger with appropriate handlers."""
+    settings = get_settings()
+
     # Remove default handler
     logger.remove()
 
@@ -1,23 +1,106 @@
-from dotenv import load_dotenv
-from openai import OpenAI
+"""
+Shared OpenAI clients.
 
-from core.settings import settings
+Clients are created once per process and reuse a pooled HTTP connection (keep-alive,
+HTTP/2 when the ``h2`` package is installed), so concurrent generators and chat
+sessions share TCP/TLS connections instead of paying for a handshake per client.
+The SDK itself is only imported when the first client is requested, so importing this
+module is cheap.
+"""
 
+from __future__ import annotations
 
-def get_openai_client():
-    """
-    Load environment variables and create an OpenAI client instance.
+import importlib.util
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
 
-    Returns:
-        OpenAI: Configured OpenAI client
+from core.settings import get_settings
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI, OpenAI
+
+
+def _client_options() -> dict[str, Any]:
+    """Returns the client arguments shared by the sync and async clients.
 
     Raises:
         ValueError: If OPENAI_API_KEY is not found in environment variables or .env
     """
+    import httpx
+    from dotenv import load_dotenv
+
     load_dotenv()
+    settings = get_settings()
     api_key = settings.openai_api_key
     if not api_key:
         raise ValueError("OPENAI_API_KEY not found in environment variables or .env file")
-    base_url = settings.openai_base_url
+    return {
+        "api_key": api_key,
+        "base_url": settings.openai_base_url,
+        "timeout": httpx.Timeout(
+            settings.openai_timeout_seconds, connect=settings.openai_connect_timeout_seconds
+        ),
+        "max_retries": settings.openai_max_retries,
+    }
+
+
+def _http_options() -> dict[str, Any]:
+    import httpx
+
+    settings = get_settings()
+    return {
+        "limits": httpx.Limits(
+            max_connections=settings.openai_max_connections,
+            max_keepalive_connections=settings.openai_max_keepalive_connections,
+            keepalive_expiry=settings.openai_keepalive_expiry_seconds,
+        ),
+        # HTTP/2 needs the optional h2 package (httpx[http2]); fall back to HTTP/1.1.
+        "http2": settings.openai_http2 and importlib.util.find_spec("h2") is not None,
+    }
+
+
+@lru_cache(maxsize=1)
+def get_openai_client() -> OpenAI:
+    """
+    Return the process-wide OpenAI client, creating it on first use.
+
+    Returns:
+        OpenAI: Configured OpenAI client with a pooled HTTP connection
+
+    Raises:
+        ValueError: If OPENAI_API_KEY is not found in environment variables or .env
+    """
+    from openai import DefaultHttpxClient, OpenAI
+
+    return OpenAI(**_client_options(), http_client=DefaultHttpxClient(**_http_options()))
+
+
+@lru_cache(maxsize=1)
+def get_rate_limited_openai_client() -> OpenAI:
+    """
+    Return the shared client with SDK retries disabled, for calls wrapped by
+    ``utils.rate_limiter.call_with_rate_limit``.
+
+    The limiter owns retries there: an SDK retry inside the wrapped call would bypass
+    the token bucket and the Retry-After handling and multiply the attempts. The copy
+    shares the pooled HTTP connection of ``get_openai_client``.
+    """
+    return get_openai_client().with_options(max_retries=0)
+
+
+@lru_cache(maxsize=1)
+def get_async_openai_client() -> AsyncOpenAI:
+    """
+    Return the process-wide AsyncOpenAI client, creating it on first use.
+
+    The underlying connection pool belongs to the event loop it is first used in.
+
+    Returns:
+        AsyncOpenAI: Configured async client with a pooled HTTP connection
+
+    Raises:
+        ValueError: If OPENAI_API_KEY is not found in environment variables or .env
+    """
+    from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 
-    return OpenAI(api_key=api_key, base_url=base_url)
+    return AsyncOpenAI(**_client_options(), http_client=DefaultAsyncHttpxClient(**_http_options()))
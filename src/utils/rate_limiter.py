@@ -0,0 +1,269 @@
+"""
+Client-side rate limiting for LLM API calls.
+
+Each model gets a pair of token buckets (requests per minute and tokens per minute)
+shared by every caller in the process, so concurrent generators stay under the
+LiteLLM quota without fixed sleeps. Rate-limit responses are retried with jittered
+exponential back-off, honouring the server's ``Retry-After`` header when present.
+"""
+
+import random
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_MODEL_KEY = "default"
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at ``capacity`` per minute."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.refill_per_second = self.capacity / 60.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.refill_per_second)
+
+    def acquire(self, amount: float = 1.0) -> float:
+        """Blocks until ``amount`` tokens are available and consumes them.
+
+        Requests larger than the bucket capacity are clamped to the capacity so they
+        can still proceed once the bucket is full.
+
+        Returns:
+            float: Seconds spent waiting.
+        """
+        amount = min(float(amount), self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return waited
+                delay = (amount - self._tokens) / self.refill_per_second
+            time.sleep(delay)
+            waited += delay
+
+    def debit(self, amount: float) -> None:
+        """Consumes tokens without waiting; the balance may go negative."""
+        with self._lock:
+            self._refill()
+            self._tokens -= amount
+
+    def credit(self, amount: float) -> None:
+        """Returns unused tokens to the bucket, up to its capacity."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute limits for a single model."""
+
+    def __init__(self, requests_per_minute: float | None, tokens_per_minute: float | None):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+
+    def acquire(self, estimated_tokens: int = 0) -> float:
+        """Waits for one request slot and ``estimated_tokens`` of token quota.
+
+        Returns:
+            float: Seconds spent waiting.
+        """
+        waited = 0.0
+        if self.requests:
+            waited += self.requests.acquire(1)
+        if self.tokens and estimated_tokens > 0:
+            waited += self.tokens.acquire(estimated_tokens)
+        return waited
+
+    def reconcile(self, estimated_tokens: int, actual_tokens: int | None) -> None:
+        """Settles the difference between actual and estimated usage once it is known.
+
+        Extra usage is charged; unused quota (estimates include ``max_tokens``) is refunded.
+        """
+        if not self.tokens or actual_tokens is None or estimated_tokens <= 0:
+            return
+        if actual_tokens > estimated_tokens:
+            self.tokens.debit(actual_tokens - estimated_tokens)
+        elif actual_tokens < estimated_tokens:
+            self.tokens.credit(estimated_tokens - actual_tokens)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Retry behaviour for rate-limited and transient API errors."""
+
+    max_retries: int = 6
+    base_delay_seconds: float = 1.0
+    max_delay_seconds: float = 60.0
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential back-off for a 0-based retry attempt."""
+        ceiling = min(self.max_delay_seconds, self.base_delay_seconds * (2**attempt))
+        return random.uniform(0, ceiling)
+
+
+_limits: dict[str, dict[str, Any]] = {}
+_limiters: dict[str, RateLimiter] = {}
+_registry_lock = threading.Lock()
+
+
+def configure_rate_limits(limits: dict[str, dict[str, Any]], replace: bool = False) -> None:
+    """Sets per-model limits; the ``default`` entry applies to unlisted models.
+
+    Limits are merged into the current table, so models configured earlier (for example
+    with ``set_rate_limit``) keep their limits unless ``limits`` names them too.
+
+    Args:
+        limits: Mapping of model name to ``{"requests_per_minute": ..., "tokens_per_minute": ...}``.
+        replace: Drop every existing limit first (e.g. to restore a ``get_rate_limits`` snapshot).
+    """
+    limits = limits or {}
+    with _registry_lock:
+        if replace:
+            _limits.clear()
+            _limiters.clear()
+        default_changed = DEFAULT_MODEL_KEY in limits
+        _limits.update(limits)
+        for model in list(_limiters):
+            if model in limits or (default_changed and model not in _limits):
+                del _limiters[model]
+
+
+def get_rate_limits() -> dict[str, dict[str, Any]]:
+    """Returns a copy of the configured per-model limits."""
+    with _registry_lock:
+        return {model: dict(limits) for model, limits in _limits.items()}
+
+
+def set_rate_limit(
+    model: str, requests_per_minute: float | None, tokens_per_minute: float | None
+) -> None:
+    """Sets the limits of a single model, keeping the other configured models untouched."""
+    with _registry_lock:
+        _limits[model] = {
+            "requests_per_minute": requests_per_minute,
+            "tokens_per_minute": tokens_per_minute,
+        }
+        _limiters.pop(model, None)
+
+
+def get_rate_limiter(model: str) -> RateLimiter:
+    """Returns the process-wide limiter for a model, creating it on first use."""
+    with _registry_lock:
+        limiter = _limiters.get(model)
+        if limiter is None:
+            limits = _limits.get(model) or _limits.get(DEFAULT_MODEL_KEY) or {}
+            limiter = RateLimiter(
+                requests_per_minute=limits.get("requests_per_minute"),
+                tokens_per_minute=limits.get("tokens_per_minute"),
+            )
+            _limiters[model] = limiter
+        return limiter
+
+
+def _status_code(error: Exception) -> int | None:
+    status = getattr(error, "status_code", None)
+    if status is None:
+        response = getattr(error, "response", None)
+        status = getattr(response, "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """True for HTTP 429 responses or errors whose message mentions a rate limit."""
+    return _status_code(error) == 429 or "rate limit" in str(error).lower()
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """True for rate limits and transient server-side (5xx) failures."""
+    status = _status_code(error)
+    return is_rate_limit_error(error) or (status is not None and 500 <= status < 600)
+
+
+def retry_after_seconds(error: Exception) -> float | None:
+    """Extracts the server-requested delay from ``Retry-After``/``retry-after-ms`` headers."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000.0
+        except ValueError:
+            pass
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            # HTTP-date form is rare for LLM gateways; fall back to back-off.
+            return None
+    return None
+
+
+def _usage_tokens(result: Any) -> int | None:
+    usage = getattr(result, "usage", None)
+    total = getattr(usage, "total_tokens", None)
+    return total if isinstance(total, int) else None
+
+
+def call_with_rate_limit(
+    fn: Callable[[], T],
+    model: str,
+    estimated_tokens: int = 0,
+    policy: RetryPolicy | None = None,
+    on_retry: Callable[[int, float, Exception], None] | None = None,
+) -> T:
+    """Runs an API call under the model's rate limiter, retrying transient failures.
+
+    Args:
+        fn: Zero-argument callable performing the request.
+        model: Model name used to select the limiter.
+        estimated_tokens: Expected prompt + completion tokens, charged before the call.
+        policy: Retry policy; defaults to ``RetryPolicy()``.
+        on_retry: Optional callback ``(attempt, delay_seconds, error)`` invoked before sleeping.
+
+    Returns:
+        The value returned by ``fn``.
+
+    Raises:
+        Exception: The last error when it is not retryable or retries are exhausted.
+    """
+    policy = policy or RetryPolicy()
+    limiter = get_rate_limiter(model)
+    attempt = 0
+    while True:
+        limiter.acquire(estimated_tokens)
+        try:
+            result = fn()
+        except Exception as e:
+            if not is_retryable_error(e) or attempt >= policy.max_retries:
+                raise
+            delay = retry_after_seconds(e)
+            if delay is None:
+                delay = policy.backoff(attempt)
+            else:
+                # Small jitter so workers released by the same header do not stampede.
+                delay += random.uniform(0, policy.base_delay_seconds)
+            if on_retry is not None:
+                on_retry(attempt + 1, delay, e)
+            time.sleep(delay)
+            attempt += 1
+            continue
+        limiter.reconcile(estimated_tokens, _usage_tokens(result))
+        return result
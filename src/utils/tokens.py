@@ -0,0 +1,33 @@
+"""
+Lightweight token estimation.
+
+Exact tokenizers are model specific and not a project dependency; for budgeting
+prompts and rate limits a character-based estimate is accurate enough.
+"""
+
+import math
+
+# Average characters per token for English prose with the OpenAI tokenizers.
+CHARS_PER_TOKEN = 4
+
+# Fixed per-message overhead of the chat format (role, separators).
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def estimate_tokens(text: str | None) -> int:
+    """Estimates the number of tokens in a string."""
+    if not text:
+        return 0
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def estimate_message_tokens(messages: list[dict]) -> int:
+    """Estimates the prompt tokens of a chat messages list."""
+    total = 0
+    for message in messages:
+        total += MESSAGE_OVERHEAD_TOKENS + estimate_tokens(str(message.get("content") or ""))
+        for tool_call in message.get("tool_calls") or []:
+            function = tool_call.get("function", {})
+            total += estimate_tokens(function.get("name", ""))
+            total += estimate_tokens(function.get("arguments", ""))
+    return total
@@ -5,11 +5,17 @@ This script tests both the chat completion API and embedding API
 to ensure the connection is working properly.
 """
 
+import sys
+from pathlib import Path
+
 from loguru import logger
 
-from src.core.settings import settings
-from src.utils.logger import setup_logger
-from src.utils.openai_client import get_openai_client
+# src on path first so "core" and "utils" resolve when run as script
+sys.path.insert(0, str(Path(__file__).resolve().parent / "src"))
+
+from core.settings import settings
+from utils.logger import setup_logger
+from utils.openai_client import get_openai_client
 
 
 def test_chat_completion() -> bool:
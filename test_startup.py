@@ -0,0 +1,133 @@
+"""
+Startup check for the command-line entry points.
+
+Runs each entry point in a fresh interpreter with ``python -X importtime`` and fails
+when it imports a module it should only load lazily (the OpenAI SDK, lxml, numpy, ...)
+or when its total import time exceeds the budget. The slowest imports are reported
+so a regression can be traced to the module that caused it.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from loguru import logger
+
+ROOT = Path(__file__).resolve().parent
+
+# Modules that open network clients or are slow to import; entry points load them lazily.
+HEAVY_MODULES = {"openai", "httpx", "lxml", "numpy", "chromadb"}
+
+
+@dataclass
+class EntryPoint:
+    name: str
+    args: list[str]
+    budget_ms: float
+    forbidden: set[str] = field(default_factory=lambda: set(HEAVY_MODULES))
+
+
+ENTRY_POINTS = [
+    EntryPoint(
+        "generate_dataset.py --help",
+        ["scripts/dataset/generate_dataset.py", "--help"],
+        budget_ms=150,
+        forbidden=HEAVY_MODULES | {"yaml", "pydantic", "pydantic_settings"},
+    ),
+    EntryPoint("main.py", ["-c", "import main"], budget_ms=600),
+    EntryPoint("chatbot cli.py --help", ["src/chatbot/cli.py", "--help"], budget_ms=600),
+    EntryPoint(
+        "section_generator import",
+        ["-c", "import scripts.utils.section_generator"],
+        budget_ms=600,
+    ),
+]
+
+
+def parse_importtime(stderr: str) -> tuple[float, dict[str, float]]:
+    """Returns the total import time and the cumulative time per nested import, in ms."""
+    total_us = 0
+    nested: dict[str, float] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|", 2)
+        if name.startswith("  "):
+            nested[name.strip()] = int(cumulative) / 1000
+        else:
+            # Outermost imports only: their cumulative times do not overlap.
+            total_us += int(cumulative)
+    return total_us / 1000, nested
+
+
+def imported_modules(stderr: str) -> set[str]:
+    return {
+        line.rsplit("|", 1)[1].strip().split(".")[0]
+        for line in stderr.splitlines()
+        if line.startswith("import time:") and "cumulative" not in line
+    }
+
+
+def check_entry_point(entry: EntryPoint, budget_scale: float, top: int) -> bool:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([str(ROOT), str(ROOT / "src")]))
+    # Without a key, an entry point that reads the settings at import time fails here.
+    env.pop("OPENAI_API_KEY", None)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *entry.args],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        logger.error(f"❌ {entry.name}: exited with {result.returncode}\n{result.stderr[-2000:]}")
+        return False
+
+    total_ms, nested = parse_importtime(result.stderr)
+    budget_ms = entry.budget_ms * budget_scale
+    eager = sorted(entry.forbidden & imported_modules(result.stderr))
+
+    slowest = sorted(nested.items(), key=lambda item: item[1], reverse=True)[:top]
+    logger.info(f"{entry.name}: {total_ms:.0f} ms imports (budget {budget_ms:.0f} ms)")
+    for module, ms in slowest:
+        logger.info(f"    {ms:8.1f} ms  {module}")
+
+    passed = True
+    if eager:
+        logger.error(f"❌ {entry.name}: imports {', '.join(eager)} at startup")
+        passed = False
+    if total_ms > budget_ms:
+        logger.error(f"❌ {entry.name}: import time {total_ms:.0f} ms exceeds {budget_ms:.0f} ms")
+        passed = False
+    if passed:
+        logger.success(f"✅ {entry.name}")
+    return passed
+
+
+def main() -> None:
+    """Run the startup check for every entry point."""
+    parser = argparse.ArgumentParser(description="Check import-time cost of the entry points")
+    parser.add_argument(
+        "--budget-scale", type=float, default=1.0, help="Multiply every time budget (slow CI)"
+    )
+    parser.add_argument("--top", type=int, default=5, help="Slowest imports shown per entry")
+    args = parser.parse_args()
+
+    results = {
+        entry.name: check_entry_point(entry, args.budget_scale, args.top) for entry in ENTRY_POINTS
+    }
+
+    logger.info("=" * 60)
+    for name, passed in results.items():
+        status = "✅ PASSED" if passed else "❌ FAILED"
+        logger.info(f"{name}: {status}")
+    logger.info("=" * 60)
+
+    exit(0 if all(results.values()) else 1)
+
+
+if __name__ == "__main__":
+    main()